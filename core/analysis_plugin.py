@@ -10,7 +10,7 @@ Version: 1.0
 Email: lbustio@gmail.com
 """
 
-from base_plugin import BasePlugin
+from .base_plugin import BasePlugin
 
 class AnalysisPlugin(BasePlugin):
     """
@@ -20,3 +20,24 @@ class AnalysisPlugin(BasePlugin):
     """
     def __init__(self):
         super().__init__()
+
+    def analyze_chunks(self, chunks):
+        """
+        Analyzes data delivered as an iterator of DataFrame chunks.
+
+        The default implementation concatenates all chunks into a single DataFrame
+        and delegates to `analyze`. Chunk-aware plugins override this method and set
+        `_supports_chunks` to True to keep memory bounded by the chunk size.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+
+        Returns:
+            object: The analysis results.
+        """
+        import pandas as pd
+        from .logging_config import logger
+
+        logger.warning(f"Plugin '{type(self).__name__}' is not chunk-aware. All chunks will be loaded into memory.")
+        dataframe = pd.concat(chunks, ignore_index=True)
+        return self.analyze(dataframe)
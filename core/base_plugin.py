@@ -20,6 +20,7 @@ class BasePlugin:
         author (str): Author of the plugin.
         date (str): Date of the plugin.
         config (dict): Configuration dictionary of the plugin.
+        supports_chunks (bool): Whether the plugin can consume data as a stream of chunks.
     """
     
     def __init__(self):
@@ -28,6 +29,7 @@ class BasePlugin:
         self._author = "Unknown"
         self._date = "Unknown"
         self._config = {}
+        self._supports_chunks = False
 
     @property
     def description(self):
@@ -78,3 +80,16 @@ class BasePlugin:
             dict: Configuration dictionary of the plugin.
         """
         return self._config
+
+    @property
+    def supports_chunks(self):
+        """
+        Returns whether the plugin can process data as a stream of DataFrame chunks.
+
+        Chunk-aware plugins receive an iterator of chunks instead of a fully loaded
+        DataFrame, which keeps peak memory bounded by the chunk size.
+
+        Returns:
+            bool: True if the plugin is chunk-aware, False otherwise.
+        """
+        return self._supports_chunks
@@ -0,0 +1,109 @@
+"""
+Module for running batch scripts of command lines in the DataSphere CLI.
+
+A batch script is a text file (or the standard input) with one command line per line, in
+the same `command=value` format as the command line. All the lines are executed one after
+the other in the same process, so they share the loaded datasets, the analysis results and
+the plugin instances: a file loaded by one line is not parsed again by the next ones, and
+lines without `load_data` operate on the data loaded before. Blank lines and lines starting
+with '#' are ignored. The execution time of every line is reported at the end.
+
+Example script:
+
+    load_data=data/raw/iris.csv
+    visualize=table_viewer max_row=10
+    visualize=table_viewer row_selection=random max_row=10
+    save=data/processed/iris.feather
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import sys
+import time
+from core.logging_config import logger
+
+# Value of the `run` command that reads the script from the standard input
+STDIN_SCRIPT = '-'
+
+
+def read_script(source):
+    """
+    Reads the command lines of a batch script.
+
+    Args:
+        source (str): The path to the script, or '-' to read it from the standard input.
+
+    Returns:
+        list: (line number, command line) tuples, without blank lines and comments.
+
+    Raises:
+        FileNotFoundError: If the script does not exist.
+    """
+    if source == STDIN_SCRIPT:
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    return [(number, line.strip()) for number, line in enumerate(lines, start=1) if line.strip() and not line.lstrip().startswith('#')]
+
+
+def run_script(commands):
+    """
+    Executes the batch script given by the `run` command.
+
+    The other commands of the invocation are executed first, as if they were the first
+    line of the script (e.g. `run=plots.txt load_data=data/raw/iris.csv`). Every line is
+    executed even if a previous one failed.
+
+    Args:
+        commands (dict): The parsed command-line arguments, including `run`.
+
+    Returns:
+        int: 0 if every line succeeded, 1 otherwise.
+
+    Raises:
+        ValueError: If several scripts are given or a script line contains `run`.
+    """
+    import core.cli_parser as cli_parser
+
+    sources = commands['run']
+    if len(sources) != 1:
+        raise ValueError("Only one batch script can be run at a time.")
+
+    lines = read_script(sources[0])
+    setup = {command: values for command, values in commands.items() if command != 'run'}
+
+    # Reuse the datasets of earlier loads so the lines share the data they load
+    cli_parser.resident_loads = True
+
+    timings = []
+    start = time.perf_counter()
+    if setup:
+        line_start = time.perf_counter()
+        exit_code = cli_parser.execute_commands(setup)
+        timings.append(('-', ' '.join(f"{command}={value}" for command, values in setup.items() for value in values), exit_code, time.perf_counter() - line_start))
+
+    logger.info(f"Running {len(lines)} command lines from '{sources[0]}'.")
+    for number, line in lines:
+        line_start = time.perf_counter()
+        line_commands = cli_parser.parse_command_string(line)
+        if 'run' in line_commands:
+            logger.error(f"Line {number}: nested batch scripts are not supported.")
+            exit_code = 1
+        elif not line_commands:
+            logger.error(f"Line {number}: no valid commands in '{line}'.")
+            exit_code = 1
+        else:
+            logger.info(f"Line {number}: {line}")
+            exit_code = cli_parser.execute_commands(line_commands)
+        timings.append((number, line, exit_code, time.perf_counter() - line_start))
+
+    logger.info(f"Batch script finished in {time.perf_counter() - start:.3f} s. Time per line:")
+    for number, line, exit_code, seconds in timings:
+        status = 'ok' if exit_code == 0 else 'FAILED'
+        logger.info(f"  line {number:>4}  {seconds * 1000:>10.1f} ms  {status:<6}  {line}")
+
+    return 1 if any(exit_code for _, _, exit_code, _ in timings) else 0
@@ -12,23 +12,63 @@ Version: 1.0
 Email: lbustio@gmail.com
 """
 
+import os
+import re
 import argparse
 from collections import defaultdict
+from functools import partial
 from .plugin_manager import PluginManager
+from .data_cache import DataCache
+from .session_store import SessionStore, format_size
+from .multi_loader import load_files_parallel, concat_frames, iter_files_chunks
+from .scheduler import TaskScheduler
 from .logging_config import logger
-from utils.strings_utils import get_file_extension
-from utils.file_utils import validate_file_path
+from utils.strings_utils import get_file_extension, get_compression
+from utils.file_utils import expand_data_paths, open_data_file
+
+# Heavy dependencies (pandas, numpy, plotting libraries) are imported by the functions and
+# plugins that use them, so commands that do not touch data (e.g. help) start quickly.
 
 # Instantiate the PluginManager
 plugin_manager = PluginManager()
 
+# Instantiate the cache of parsed datasets
+data_cache = DataCache()
+
+# Named datasets loaded in the session
+session_store = SessionStore()
+
 # Global variable to keep track of the state
 state = {
-    'data_loaded': False,
-    'data': None,
     'analysis_results': None
 }
 
+# Commands that only configure other commands and are read where they are needed
+OPTION_COMMANDS = {'sheet_name', 'chunksize', 'cache', 'cache_size', 'optimize_dtypes', 'dataset', 'workers', 'source_column', 'columns', 'where', 'sample', 'sample_frac', 'sample_seed', 'max_row', 'row_selection', 'class_column', 'class_value', 'save_target', 'jobs', 'memory_budget', 'approx', 'quantiles', 'quantile_error', 'distinct_error', 'frequency_error', 'correlation', 'downsample', 'max_points', 'aggregate', 'webgl_threshold', 'server', 'port'}
+
+# Options that change the data produced by a load
+LOAD_OPTIONS = ('sheet_name', 'chunksize', 'optimize_dtypes', 'columns', 'where', 'sample', 'sample_frac', 'sample_seed', 'source_column')
+
+# Whether loads of unchanged files reuse the datasets they produced earlier in the session
+# (enabled by the daemon and the batch mode, whose sessions outlive a command line)
+resident_loads = False
+
+# Commands that become steps of the dependency graph
+STEP_COMMANDS = {'load_data', 'analyze', 'visualize', 'save', 'help'}
+
+# Options passed to the visualization and analysis plugins that declare them in their configuration
+PLUGIN_OPTIONS = ('workers', 'approx', 'quantiles', 'quantile_error', 'distinct_error', 'frequency_error', 'correlation', 'downsample', 'max_points', 'aggregate', 'webgl_threshold', 'server', 'port')
+
+# Default values of the plugin options, keyed by plugin class and option
+plugin_option_defaults = {}
+
+# Values of the `save_target` option
+SAVE_TARGETS = ('auto', 'results', 'data')
+
+# A `load_data` value that names its dataset: `<name>:<path>` (names have at least two
+# characters, so Windows drive letters are not taken as names)
+NAMED_LOAD_PATTERN = re.compile(r"^([A-Za-z_][\w.-]+):(?!//)(.+)$")
+
 import argparse
 from collections import defaultdict
 import logging
@@ -36,6 +76,48 @@ import logging
 # Configurar el logger
 logger = logging.getLogger('DataSphere')
 
+# Help text of every command, shown by the `help` command
+HELP_TEXT = {
+    'load_data': "load_data=[<name>:]<path|directory|glob> [workers=<n>] [source_column=<name>] [columns=<c1,c2,...>] [where=<predicate>] [sample=<rows>|sample_frac=<fraction>] [sample_seed=<seed>] [sheet_name=<name>] [chunksize=<rows>] [cache=<on|off|refresh>] [cache_size=<MB>] [optimize_dtypes=<off|safe|aggressive>] - Load data from the specified file path, or from all the files matched by a directory or glob pattern (parsed in parallel and concatenated), as a dataset of the session named <name> (the file name by default). Later commands select a dataset with dataset=<name>. Only the given columns and the rows matching the predicate are kept while parsing, and a random sample of the rows can be drawn in a single streaming pass. Specify sheet name(s) for XLSX files ('*' or a comma-separated list loads several sheets as named datasets, selected with dataset=<name>), a chunk size to stream large files, how the parsed data cache is used and how data types are optimized after loading.",
+    'visualize': "visualize=<plugin>[,<plugin>...] [max_row=<number>] [row_selection=<top|bottom|random|by_class>] [class_column=<column>] [class_value=<value>] [approx=true] [correlation=<pearson|spearman>] [downsample=<true|false>] [max_points=<n>] [aggregate=<true|false>] [webgl_threshold=<n>] [server=<development|production>] [port=<n>] [workers=<n>] - Visualize data using the specified plugins. With approx=true, resume_viewer estimates quartiles, unique counts and top values with mergeable sketches in one pass. The heatmap of interactive_graph_viewer shows the correlation matrix of the numeric columns with the given method (pearson by default), and its scatter and line charts are downsampled to at most max_points points per trace (20000 by default), re-sampled when zooming. Its histogram, box and bar charts are aggregated on the server unless aggregate=false, and charts with at least webgl_threshold points (5000 by default) are drawn with WebGL. Its Dash app is served on 127.0.0.1:port (8050 by default); server=production serves it with workers processes (all CPU cores by default) sharing the data through memory-mapped files.",
+    'analyze': "analyze=<plugin> [workers=<n>] - Analyze data using the specified plugin. 'descriptive_stats' computes the count, mean, variance, standard deviation, minimum, maximum and skewness of the numeric columns in one pass (streamed chunks are summarized in up to n worker processes). 'approx_stats' [quantiles=<q1,q2,...>] [quantile_error=<e>] [distinct_error=<e>] [frequency_error=<e>] estimates quantiles, distinct counts and top values of every column with mergeable sketches.",
+    'save': "save=<path> [save_target=<auto|results|data>] - Save the analysis results (or the loaded dataset) to the specified file path. The format is chosen by the extension (csv, arff, xlsx, feather, txt) and a '.gz', '.bz2', '.xz' or '.zst' suffix compresses the output. By default the results are saved if an analysis was run, and the dataset otherwise.",
+    'memory_budget': "memory_budget=<MB> - Keep at most this much data in memory. The session measures the memory of every loaded dataset and, above the budget, writes the least recently used datasets to disk (data/processed/session) until they are used again.",
+    'jobs': "jobs=<n> - Run at most n steps in parallel. Loads, analyses, visualizations and saves form a dependency graph and independent steps run concurrently (all CPU cores by default, jobs=1 runs the steps one after the other).",
+    'run': "run=<script|-> - Execute the command lines of a script file ('-' reads them from the standard input) one after the other in the same process. The lines share the loaded data, the analysis results and the plugins, blank lines and lines starting with '#' are ignored, and the time taken by every line is shown at the end.",
+    'serve': "serve[=<socket>] [<commands>] - Start a persistent daemon that keeps the loaded datasets and plugins in memory and executes the command lines sent by clients over a Unix socket (data/processed/datasphere.sock by default). The given commands are executed first, e.g. to preload data.",
+    'client': "client[=<socket>] <commands> - Send the commands to a running daemon and show its output. 'client shutdown' stops the daemon.",
+    'help': "help [command] - Show this help message or help for a specific command.",
+}
+
+
+def show_help(topics=None):
+    """
+    Displays the help of the CLI commands.
+
+    This function does not import any heavy dependency, so `help` is served without
+    loading pandas or any plugin.
+
+    Args:
+        topics (list, optional): The commands to show help for. If empty, the help of every
+            command is shown.
+    """
+    logger.info("Displaying help information.")
+    topics = [topic for topic in (topics or []) if topic]
+    if topics:
+        for topic in topics:
+            logger.info(f"Showing help for command: {topic}")
+            if topic.lower() in HELP_TEXT:
+                logger.info(f"  {HELP_TEXT[topic.lower()]}")
+            else:
+                logger.warning(f"Unknown command '{topic}'. Available commands: {', '.join(HELP_TEXT)}.")
+    else:
+        logger.info("Showing general help information.")
+        logger.info("Available commands:")
+        for text in HELP_TEXT.values():
+            logger.info(f"  {text}")
+
+
 def parse_arguments():
     """
     Parses command-line arguments for the DataSphere CLI.
@@ -54,7 +136,23 @@ def parse_arguments():
         logger.error(f"Error parsing arguments: {e}", exc_info=True)
         return {}
 
-    command_list = args.commands.split()
+    return parse_command_string(args.commands)
+
+
+def parse_command_string(command_string):
+    """
+    Parses a string of space-separated `command=value` pairs.
+
+    This is the parser of the command line, also used for the command lines received by
+    the daemon.
+
+    Args:
+        command_string (str): The commands, e.g. "load_data=data/raw/iris.csv visualize=table_viewer".
+
+    Returns:
+        dict: The values of every command, keyed by lowercase command name.
+    """
+    command_list = command_string.split()
 
     parsed_commands = defaultdict(list)
     for command in command_list:
@@ -71,157 +169,697 @@ def parse_arguments():
 
 
 
-def execute_commands(commands):
+def prepare_loader(path, commands):
+    """
+    Loads and configures the data I/O plugin that matches the extension of a file.
+
+    Every load gets its own plugin instance, configured with the options of its command
+    line, so the chunks of a streamed dataset never depend on the options of later or
+    concurrent loads.
+
+    Args:
+        path (str): The path to the data file.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        tuple: The plugin name and the configured plugin instance (None if it was not found).
+    """
+    file_extension = get_file_extension(path)
+    plugin_name = f"{file_extension}_loader"
+    plugin_manager.load_plugin('data_io', plugin_name)
+    plugin = plugin_manager.get_plugin(plugin_name)
+    if plugin:
+        plugin = type(plugin)()
+        if file_extension == 'xlsx':
+            sheet_name = commands.get('sheet_name', [None])[0]
+            plugin._config['sheet_name'] = sheet_name or 0
+        optimize_dtypes = commands.get('optimize_dtypes', [None])[0]
+        if optimize_dtypes is not None:
+            plugin._config['optimize_dtypes'] = optimize_dtypes.lower()
+        columns = commands.get('columns', [None])[0]
+        plugin._config['columns'] = [column.strip() for column in columns.split(',') if column.strip()] if columns else None
+        plugin._config['where'] = commands.get('where', [None])[0]
+        chunksize = commands.get('chunksize', [None])[0]
+        if chunksize and not plugin.supports_chunks:
+            logger.warning(f"Plugin '{plugin_name}' does not support streaming. The file will be loaded as a single chunk.")
+        plugin._config['chunksize'] = int(chunksize) if chunksize else None
+    return plugin_name, plugin
+
+
+def load_many(paths, loaders, commands):
+    """
+    Loads several files in parallel and concatenates them into a single DataFrame.
+
+    Files already present in the data cache are served from it; the remaining files are
+    parsed concurrently in a process pool (limited by the `workers` command) and stored in
+    the cache. If the `source_column` command is given, a column with that name records the
+    file each row came from.
+
+    Args:
+        paths (list): The paths to the data files.
+        loaders (list): The (plugin_name, plugin) tuple of each file.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        pd.DataFrame: The concatenated data.
+
+    Raises:
+        ValueError: If the cache mode is invalid or a file cannot be combined with the others.
+    """
+    cache_mode = commands.get('cache', ['on'])[0].lower()
+    if cache_mode not in ('on', 'off', 'refresh'):
+        raise ValueError(f"Invalid cache mode '{cache_mode}'. Expected one of: on, off, refresh.")
+    workers = commands.get('workers', [None])[0]
+    source_column = commands.get('source_column', [None])[0]
+
+    frames = [None] * len(paths)
+    keys = [None] * len(paths)
+    tasks = []
+    pending = []
+    for index, (file_path, (plugin_name, plugin)) in enumerate(zip(paths, loaders)):
+        if cache_mode != 'off':
+            keys[index] = data_cache.make_key(file_path, plugin_name, plugin.config, plugin.version)
+            if cache_mode == 'on':
+                frames[index] = data_cache.get(keys[index])
+        if frames[index] is None:
+            tasks.append((plugin_name, dict(plugin.config), file_path))
+            pending.append(index)
+
+    for index, frame in zip(pending, load_files_parallel(tasks, int(workers) if workers else None)):
+        frames[index] = frame
+        if keys[index] is not None:
+            data_cache.put(keys[index], frame)
+
+    logger.info(f"Loaded {len(paths)} files ({len(paths) - len(pending)} from cache).")
+    return concat_frames(frames, paths, source_column)
+
+
+def load_sample(paths, loaders, commands):
+    """
+    Loads a random sample of the rows of one or several files in a single streaming pass.
+
+    The `sample` command draws a uniform sample of a fixed number of rows with a reservoir,
+    and the `sample_frac` command keeps every row with the given probability. The files are
+    read chunk by chunk, so memory is bounded by the chunk size plus the sample size. The
+    `sample_seed` command fixes the random generator, so the same sample is drawn every time.
+
+    Args:
+        paths (list): The paths to the data files.
+        loaders (list): The (plugin_name, plugin) tuple of each file.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        pd.DataFrame: The sampled rows, with their original row numbers as index.
+
+    Raises:
+        ValueError: If the sample size or fraction is invalid.
+    """
+    from utils.sampling_utils import reservoir_sample, bernoulli_sample, DEFAULT_SAMPLE_SEED, DEFAULT_SAMPLE_CHUNKSIZE
+
+    sample_size = commands.get('sample', [None])[0]
+    sample_frac = commands.get('sample_frac', [None])[0]
+    seed = int(commands.get('sample_seed', [DEFAULT_SAMPLE_SEED])[0])
+    source_column = commands.get('source_column', [None])[0]
+
+    for _, plugin in loaders:
+        plugin._config['chunksize'] = plugin._config.get('chunksize') or DEFAULT_SAMPLE_CHUNKSIZE
+    chunks = iter_files_chunks([(plugin, file_path) for (_, plugin), file_path in zip(loaders, paths)], source_column)
+
+    if sample_size:
+        sample, num_rows = reservoir_sample(chunks, int(sample_size), seed)
+    else:
+        sample, num_rows = bernoulli_sample(chunks, float(sample_frac), seed)
+
+    if sample is None:
+        return None
+    logger.info(f"Sampled {len(sample)} of {num_rows} rows in a single pass (seed {seed}).")
+    # Chunks are not categorized while streaming, so the final sample is optimized once more
+    return loaders[0][1].optimize_dtypes(sample)
+
+
+def load_with_cache(plugin, plugin_name, path, commands):
+    """
+    Loads a file with a data I/O plugin, serving it from the data cache when possible.
+
+    The cache behaviour is controlled by the `cache` command:
+        - on (default): Serve the data from the cache if present, otherwise parse and store it.
+        - refresh: Always parse the file and replace the cached entry.
+        - off: Bypass the cache completely.
+
+    Args:
+        plugin (DataIOPlugin): The configured data I/O plugin.
+        plugin_name (str): The name of the data I/O plugin.
+        path (str): The path to the data file.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+
+    Raises:
+        ValueError: If the cache mode or the cache size are invalid.
+    """
+    cache_mode = commands.get('cache', ['on'])[0].lower()
+    if cache_mode not in ('on', 'off', 'refresh'):
+        raise ValueError(f"Invalid cache mode '{cache_mode}'. Expected one of: on, off, refresh.")
+
+    cache_size = commands.get('cache_size', [None])[0]
+    if cache_size is not None:
+        data_cache.max_size_bytes = int(float(cache_size) * 1024 * 1024)
+
+    if cache_mode == 'off':
+        return plugin.load(path)
+
+    key = data_cache.make_key(path, plugin_name, plugin.config, plugin.version)
+    if cache_mode == 'on':
+        data = data_cache.get(key)
+        if data is not None:
+            return data
+
+    data = plugin.load(path)
+    if isinstance(data, dict):
+        logger.info("Data not cached: multi-sheet loads are not stored in the cache.")
+    elif data is not None:
+        data_cache.put(key, data)
+    return data
+
+
+def get_active_data(commands):
+    """
+    Returns the dataset that visualization and analysis commands operate on.
+
+    The `dataset` command selects a dataset of the session by name. Otherwise, the last
+    loaded dataset is used.
+
+    Args:
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        pd.DataFrame: The selected dataset, or None if it is streamed in chunks.
+
+    Raises:
+        ValueError: If the selected dataset does not exist.
+    """
+    return session_store.get(commands.get('dataset', [None])[0])
+
+
+def get_active_chunks(commands):
+    """
+    Returns the chunk source of the dataset that visualization and analysis commands operate on.
+
+    Args:
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        callable: A function returning an iterator over the chunks of the selected dataset,
+        or None if the dataset is not streamed.
+
+    Raises:
+        ValueError: If the selected dataset does not exist.
+    """
+    return session_store.get_chunks(commands.get('dataset', [None])[0])
+
+
+def results_to_frame(results):
+    """
+    Converts analysis results into a DataFrame so they can be written by a writer plugin.
+
+    Args:
+        results: The analysis results (DataFrame, Series, dictionary or list).
+
+    Returns:
+        pd.DataFrame: The results as a DataFrame, or None if they have no tabular form.
+    """
+    import pandas as pd
+
+    if isinstance(results, pd.DataFrame):
+        return results
+    if isinstance(results, pd.Series):
+        return results.to_frame()
+    try:
+        frame = pd.DataFrame(results)
+    except (ValueError, TypeError):
+        if isinstance(results, dict):
+            # Dictionaries of scalars become one row per key
+            return pd.Series(results, name='value').to_frame()
+        return None
+    return frame if not frame.empty or not results else None
+
+
+def save_output(path, commands):
     """
-    Executes commands in sequence, ensuring dependencies are met.
+    Saves the analysis results or the active dataset to a file.
+
+    The writer is the data I/O plugin that matches the extension of the output path, so the
+    output format (CSV, ARFF, XLSX, Feather) and its compression are chosen by the path, as
+    for `load_data`. In streaming mode the dataset is written chunk by chunk. Results without
+    a tabular form, or paths without a writer plugin, are written as text.
+
+    Args:
+        path (str): The output path.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Raises:
+        ValueError: If there is nothing to save or the save target is invalid.
+    """
+    target = commands.get('save_target', ['auto'])[0].lower()
+    if target not in SAVE_TARGETS:
+        raise ValueError(f"Invalid save target '{target}'. Valid values: {', '.join(SAVE_TARGETS)}.")
+    if target == 'auto':
+        target = 'results' if state.get('analysis_results') is not None else 'data'
+    if target == 'results' and state.get('analysis_results') is None:
+        raise ValueError("Results must be analyzed before saving.")
+    if target == 'data' and session_store.active is None:
+        raise ValueError("Data must be loaded before saving.")
+
+    file_extension = get_file_extension(path)
+    plugin_name = f"{file_extension}_loader"
+    plugin = None
+    if file_extension != 'txt':
+        plugin_manager.load_plugin('data_io', plugin_name)
+        plugin = plugin_manager.get_plugin(plugin_name)
+
+    if target == 'data':
+        if plugin is None:
+            raise ValueError(f"No writer plugin found for '{path}'.")
+        logger.info(f"Saving the dataset to '{path}' with plugin '{plugin_name}'.")
+        chunks = get_active_chunks(commands)
+        sheets = session_store.parts() if file_extension == 'xlsx' and commands.get('dataset') is None else {}
+        if chunks is not None:
+            # A streamed dataset is read from its files while it is written
+            source = session_store.get_source(commands.get('dataset', [None])[0])
+            source_files = [file_path for file_path, _, _ in source[1]] if source else []
+            if os.path.exists(path) and any(os.path.exists(file_path) and os.path.samefile(path, file_path) for file_path in source_files):
+                raise ValueError(f"Cannot save to '{path}': it is the file the dataset is streamed from.")
+            plugin.save_chunks(chunks(), path)
+        elif sheets:
+            # Several loaded sheets are written back as several sheets
+            plugin.save(sheets, path)
+        else:
+            plugin.save(get_active_data(commands), path)
+        return
+
+    results = state['analysis_results']
+    frame = results_to_frame(results) if plugin is not None else None
+    if frame is not None:
+        logger.info(f"Saving the analysis results to '{path}' with plugin '{plugin_name}'.")
+        plugin.save(frame, path)
+        return
+
+    if file_extension != 'txt':
+        logger.warning(f"The analysis results cannot be written with a writer plugin. They will be saved as text to '{path}'.")
+    with open_data_file(path, 'wt') as file:
+        file.write(str(results))
+    logger.info(f"Results saved to {path}.")
+
+
+def parse_load_value(value):
+    """
+    Splits a `load_data` value into the name of its dataset and its path.
+
+    Args:
+        value (str): The `load_data` value, e.g. 'iris:data/raw/iris.arff'.
+
+    Returns:
+        tuple: The dataset name (None if the value does not name it) and the path.
+    """
+    match = NAMED_LOAD_PATTERN.match(value)
+    if match:
+        return match.group(1), match.group(2)
+    return None, value
+
+
+def default_dataset_name(path):
+    """
+    Returns the dataset name of a load without an explicit name: the file name without its
+    extensions, e.g. 'iris' for 'data/raw/iris.csv.gz'.
+
+    Args:
+        path (str): The path loaded (a file, a directory or a glob pattern).
+
+    Returns:
+        str: The dataset name.
+    """
+    name = os.path.basename(os.path.normpath(path))
+    if get_compression(name):
+        name = os.path.splitext(name)[0]
+    return os.path.splitext(name)[0] or name
+
+
+def resident_key(path, paths, commands):
+    """
+    Builds the key of a load: the `load_data` path, the size and modification time of every
+    file and the options that change the loaded data.
+
+    Args:
+        path (str): The `load_data` path.
+        paths (list): The files the path expands to.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        tuple: The key.
+    """
+    files = tuple((file_path, os.stat(file_path).st_mtime_ns, os.stat(file_path).st_size) for file_path in paths)
+    options = tuple((option, tuple(commands.get(option, []))) for option in LOAD_OPTIONS)
+    return path, files, options
+
+
+def load_step(value, commands):
+    """
+    Loads the data of a `load_data` value without publishing it to the session.
+
+    When resident loads are enabled (in daemon and batch mode), a load of the same unchanged
+    files with the same options reuses the datasets it produced earlier in the session.
+
+    Args:
+        value (str): The `load_data` value: a file path, a directory or a glob pattern,
+            optionally preceded by the dataset name and a colon.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        dict: The dataset name ('name', None if not given), the loaded data ('data'), the
+        re-iterable source of chunks in streaming mode ('chunks'), the datasets of the
+        sheets of a workbook ('datasets') and the key of the load ('source').
+
+    Raises:
+        ValueError: If the path is invalid, no plugin handles a file or the load failed.
+    """
+    name, path = parse_load_value(value)
+    path = path.lower()
+    paths = expand_data_paths(path)
+    if not paths:
+        raise ValueError(f"File path '{path}' is invalid.")
+
+    key = resident_key(path, paths, commands)
+    result = session_store.find(key) if resident_loads else None
+    if result is not None:
+        logger.info(f"Reusing resident data loaded from '{path}'.")
+    else:
+        result = read_paths(paths, commands)
+    result.update({'name': name, 'source': key})
+    return result
+
+
+def read_paths(paths, commands):
+    """
+    Loads a list of files with the data I/O plugins that match their extensions.
+
+    Args:
+        paths (list): The paths to the data files.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        dict: The loaded data ('data'), the re-iterable source of chunks in streaming mode
+        ('chunks') and the named datasets ('datasets').
+
+    Raises:
+        ValueError: If no plugin handles a file or the load failed.
+    """
+    loaders = []
+    for file_path in paths:
+        plugin_name, plugin = prepare_loader(file_path, commands)
+        if not plugin:
+            raise ValueError(f"Plugin '{plugin_name}' not found.")
+        loaders.append((plugin_name, plugin))
+
+    chunksize = commands.get('chunksize', [None])[0]
+    source_column = commands.get('source_column', [None])[0]
+    if chunksize:
+        # Keep a re-iterable source of chunks so every consumer streams the files again
+        if len(paths) == 1:
+            chunks = partial(loaders[0][1].load_chunks, paths[0])
+        else:
+            chunks = partial(iter_files_chunks, [(plugin, file_path) for (_, plugin), file_path in zip(loaders, paths)], source_column)
+        logger.info(f"Data prepared for streaming from {len(paths)} file(s) in chunks of {chunksize} rows.")
+        return {'data': None, 'chunks': chunks, 'datasets': {}}
+
+    if commands.get('sample') or commands.get('sample_frac'):
+        data = load_sample(paths, loaders, commands)
+    elif len(paths) == 1:
+        data = load_with_cache(loaders[0][1], loaders[0][0], paths[0], commands)
+    else:
+        data = load_many(paths, loaders, commands)
+    datasets = {}
+    if isinstance(data, dict):
+        # Several sheets were loaded: keep them as named datasets
+        datasets = data
+        data = next(iter(data.values()), None)
+    if data is None:
+        raise ValueError("Failed to load data.")
+    return {'data': data, 'chunks': None, 'datasets': datasets}
+
+
+def publish_loads(results):
+    """
+    Publishes the results of the load steps to the session store, in command-line order.
+
+    A load of several sheets produces one dataset per sheet, named after the sheet (or
+    '<name>.<sheet>' if the load was named), and the first sheet becomes the active dataset.
+
+    Args:
+        results (list): The results of `load_step`, in the order of the `load_data` values.
+    """
+    for result in results:
+        name, source = result['name'], result['source']
+        if result['datasets']:
+            names = [f"{name}.{sheet}" if name else str(sheet) for sheet in result['datasets']]
+            for dataset_name, (sheet, data) in zip(names, result['datasets'].items()):
+                session_store.put(dataset_name, data=data, source=source, part=sheet)
+            # The first sheet is the active dataset
+            session_store.activate(names[0])
+            logger.info(f"Named datasets available: {', '.join(session_store.names())}.")
+        else:
+            session_store.put(name or default_dataset_name(source[0]), data=result['data'], chunks=result['chunks'], source=source)
+        if result['chunks'] is None:
+            logger.info(f"Data loaded successfully as dataset '{session_store.active}'.")
+
+    in_memory, spilled = session_store.usage()
+    budget = f" (budget {format_size(session_store.memory_budget)})" if session_store.memory_budget else ''
+    logger.info(f"Session datasets: {len(session_store)}, {format_size(in_memory)} in memory{budget}, {format_size(spilled)} spilled to disk.")
+
+
+def configure_plugin(plugin, commands):
+    """
+    Sets the plugin options given in the command line, for the options the plugin declares.
+
+    Plugin instances are reused across command lines (in batch and daemon mode), so options
+    that are not given are reset to the default of the plugin.
 
     Args:
+        plugin (BasePlugin): The visualization or analysis plugin.
+        commands (dict): The parsed command-line arguments as a dictionary.
+    """
+    for option in PLUGIN_OPTIONS:
+        if option not in plugin._config:
+            continue
+        default = plugin_option_defaults.setdefault((type(plugin), option), plugin._config[option])
+        plugin._config[option] = commands.get(option, [default])[0]
+
+
+def visualize_step(plugin_name, commands):
+    """
+    Visualizes the active data with a visualization plugin.
+
+    Args:
+        plugin_name (str): The name of the visualization plugin.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        int: An exit code (0 for success, 1 for error).
+    """
+    # Ensure data is loaded before visualization
+    if session_store.active is None:
+        logger.error("Data must be loaded before visualization.")
+        return 1
+
+    logger.info(f"Preparing to visualize data using plugin: '{plugin_name}'")
+
+    # Load and configure the visualization plugin
+    plugin_manager.load_plugin('visualization', plugin_name)
+    plugin = plugin_manager.get_plugin(plugin_name)
+    if not plugin:
+        logger.error(f"Plugin '{plugin_name}' not found.")
+        return 1
+
+    max_row = commands.get('max_row', [None])[0]
+    row_selection = commands.get('row_selection', ['top'])[0]
+    class_column = commands.get('class_column', [None])[0]
+    class_value = commands.get('class_value', [None])[0]
+    chunks = get_active_chunks(commands)
+    data = get_active_data(commands) if chunks is None else None
+    if max_row is not None:
+        plugin._config['max_rows'] = int(max_row)
+    elif chunks is None:
+        plugin._config['max_rows'] = len(data)
+    plugin._config['row_selection'] = row_selection
+    configure_plugin(plugin, commands)
+
+    # Call the visualize method, streaming the chunks if the data was not materialized
+    if chunks is not None:
+        plugin.visualize_chunks(chunks(), class_column=class_column, class_value=class_value)
+    else:
+        plugin.visualize(data, class_column=class_column, class_value=class_value)
+    logger.info(f"Data visualization completed using {plugin_name}.")
+    return 0
+
+
+def analyze_step(plugin_name, commands):
+    """
+    Analyzes the active data with an analysis plugin.
+
+    Args:
+        plugin_name (str): The name of the analysis plugin.
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        The analysis results.
+
+    Raises:
+        ValueError: If no data is loaded, the plugin is not found or the analysis failed.
+    """
+    # Ensure data is loaded before analysis
+    if session_store.active is None:
+        raise ValueError("Data must be loaded before analysis.")
+    if not plugin_name:
+        raise ValueError("An analysis plugin must be specified.")
+
+    logger.info(f"Preparing to analyze data using plugin: {plugin_name}")
+    plugin_manager.load_plugin('analysis', plugin_name)
+    plugin = plugin_manager.get_plugin(plugin_name)
+    if not plugin:
+        raise ValueError(f"Plugin '{plugin_name}' not found.")
+    configure_plugin(plugin, commands)
+
+    chunks = get_active_chunks(commands)
+    if chunks is not None:
+        results = plugin.analyze_chunks(chunks())
+    else:
+        results = plugin.analyze(get_active_data(commands))
+    if results is None:
+        raise ValueError("Analysis failed.")
+    logger.info("Data analysis completed.")
+    return results
+
+
+def save_step(path, commands):
+    """
+    Saves the analysis results or the active dataset to a path.
+
+    Args:
+        path (str): The output path.
         commands (dict): The parsed command-line arguments as a dictionary.
 
     Returns:
         int: An exit code (0 for success, 1 for error).
     """
+    if not path:
+        logger.error("Save path must be specified.")
+        return 1
+    logger.info(f"Preparing to save to path: {path}")
     try:
-        # Initialize command execution state
-        command_status = 0
+        save_output(path, commands)
+    except Exception as e:
+        logger.error(f"Failed to save: {e}")
+        return 1
+    return 0
+
+
+def build_command_graph(commands):
+    """
+    Builds the dependency graph of the steps requested on the command line.
+
+    Every `load_data` value is a step, and a publishing step that depends on all of them
+    updates the CLI state in command-line order. Every visualization and analysis plugin is
+    a step that depends on the published data, so they run concurrently with each other.
+    The analysis results are published in command-line order once all analyses finish, and
+    every `save` path is a step that depends on the published data and results.
+
+    Args:
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        tuple: The TaskScheduler with the steps and an exit code (1 if a command is unknown).
+    """
+    scheduler = TaskScheduler(commands.get('jobs', [None])[0])
+    command_status = 0
+    outputs = {}
+
+    def store(key, func):
+        # Run a step that produces a value and keep the value for its publishing step
+        def step():
+            outputs[key] = func()
+        return step
+
+    load_steps = []
+    for index, path in enumerate(commands.get('load_data', [])):
+        name = f"load_data={path}"
+        load_steps.append(scheduler.add_task(name, store(index, partial(load_step, path, commands))))
+    data_steps = []
+    if load_steps:
+        data_steps.append(scheduler.add_task('publish_data', lambda: publish_loads([outputs[index] for index in range(len(load_steps))]), load_steps))
+
+    analyze_steps = []
+    for index, plugin_name in enumerate(commands.get('analyze', [])):
+        key = ('analyze', index)
+        analyze_steps.append(scheduler.add_task(f"analyze={plugin_name}", store(key, partial(analyze_step, plugin_name, commands)), data_steps))
+    results_steps = []
+    if analyze_steps:
+        def publish_results():
+            # As with sequential execution, the last analysis provides the results
+            state['analysis_results'] = outputs[('analyze', len(analyze_steps) - 1)]
+        results_steps.append(scheduler.add_task('publish_results', publish_results, analyze_steps))
+
+    for values in commands.get('visualize', []):
+        for plugin_name in values.split(','):
+            plugin_name = plugin_name.strip().lower()
+            scheduler.add_task(f"visualize={plugin_name}", partial(visualize_step, plugin_name, commands), data_steps)
+
+    for path in commands.get('save', []):
+        scheduler.add_task(f"save={path}", partial(save_step, path, commands), data_steps + results_steps)
+
+    if 'help' in commands:
+        scheduler.add_task('help', partial(show_help, commands['help']))
+
+    for command in commands:
+        if command not in STEP_COMMANDS and command not in OPTION_COMMANDS:
+            logger.error(f"Unknown command: {command}")
+            command_status = 1
+
+    return scheduler, command_status
+
 
+def execute_commands(commands):
+    """
+    Executes commands as a dependency graph of steps, ensuring dependencies are met.
+
+    Independent steps (e.g. several loads, or several visualizations of the loaded data) run
+    concurrently, up to the number of parallel steps given by the `jobs` command.
+
+    Args:
+        commands (dict): The parsed command-line arguments as a dictionary.
+
+    Returns:
+        int: An exit code (0 for success, 1 for error).
+    """
+    try:
         # Initialize the state dictionary if not already defined
         if 'state' not in globals():
             global state
             state = {
-                'data': None,
-                'data_loaded': False,
                 'analysis_results': None
             }
 
-        # Iterate over each command and execute
-        for command, values in commands.items():
-            if command == 'load_data':
-                # Handle data loading
-                for path in values:
-                    path = path.lower()
-                    if not validate_file_path(path):
-                        logger.error(f"File path '{path}' is invalid.")
-                        return 1
-                    file_extension = get_file_extension(path)
-                    plugin_name = f"{file_extension}_loader"
-                    plugin_manager.load_plugin('data_io', plugin_name)
-                    plugin = plugin_manager.get_plugin(plugin_name)
-                    if plugin:
-                        if file_extension == 'xlsx':
-                            sheet_name = commands.get('sheet_name', [None])[0]
-                            plugin._config['sheet_name'] = sheet_name or 0
-                        state['data'] = plugin.load(path)
-                        if state['data'] is None:
-                            logger.error("Failed to load data.")
-                            command_status = 1
-                        else:
-                            state['data_loaded'] = True
-                            logger.info("Data loaded successfully.")
-                    else:
-                        logger.error(f"Plugin '{plugin_name}' not found.")
-                        command_status = 1
-
-            elif command == 'visualize':
-                # Ensure data is loaded before visualization
-                if not state.get('data_loaded', False):
-                    logger.error("Data must be loaded before visualization.")
-                    return 1
-
-                # Handle multiple visualization plugins
-                for plugin_names in values:
-                    plugin_names = plugin_names.split(',')
-                    for plugin_name in plugin_names:
-                        plugin_name = plugin_name.strip().lower()
-                        logger.info(f"Preparing to visualize data using plugin: '{plugin_name}'")
-
-                        # Load and configure the visualization plugin
-                        plugin_manager.load_plugin('visualization', plugin_name)
-                        plugin = plugin_manager.get_plugin(plugin_name)
-                        if plugin:
-                            max_row = int(commands.get('max_row', [len(state['data'])])[0])
-                            row_selection = commands.get('row_selection', ['top'])[0]
-                            class_column = commands.get('class_column', [None])[0]
-                            class_value = commands.get('class_value', [None])[0]
-                            plugin._config['max_rows'] = max_row
-                            plugin._config['row_selection'] = row_selection
-
-                            # Call the visualize method
-                            plugin.visualize(state['data'], class_column, class_value)
-                            logger.info(f"Data visualization completed using {plugin_name}.")
-                        else:
-                            logger.error(f"Plugin '{plugin_name}' not found.")
-                            command_status = 1
-
-            elif command == 'analyze':
-                # Ensure data is loaded before analysis
-                if not state.get('data_loaded', False):
-                    logger.error("Data must be loaded before analysis.")
-                    return 1
-
-                # Handle analysis
-                for plugin_name in values:
-                    if not plugin_name:
-                        logger.error("An analysis plugin must be specified.")
-                        command_status = 1
-                    else:
-                        logger.info(f"Preparing to analyze data using plugin: {plugin_name}")
-
-                        plugin_manager.load_plugin('analysis', plugin_name)
-                        plugin = plugin_manager.get_plugin(plugin_name)
-                        if plugin:
-                            state['analysis_results'] = plugin.analyze(state['data'])
-                            if state['analysis_results'] is None:
-                                logger.error("Analysis failed.")
-                                command_status = 1
-                            else:
-                                logger.info("Data analysis completed.")
-                        else:
-                            logger.error(f"Plugin '{plugin_name}' not found.")
-                            command_status = 1
-
-            elif command == 'save':
-                # Ensure analysis results are available before saving
-                if state.get('analysis_results') is None:
-                    logger.error("Results must be analyzed before saving.")
-                    return 1
-
-                # Handle saving results
-                for path in values:
-                    if not path:
-                        logger.error("Save path must be specified.")
-                        command_status = 1
-                    else:
-                        logger.info(f"Preparing to save results to path: {path}")
-                        try:
-                            with open(path, 'w') as file:
-                                file.write(str(state['analysis_results']))
-                            logger.info(f"Results saved to {path}.")
-                        except Exception as e:
-                            logger.error(f"Failed to save results: {e}")
-                            command_status = 1
-
-            elif command == 'help':
-                # Display help information
-                logger.info("Displaying help information.")
-                if len(values) > 0:
-                    for sub_command in values:
-                        logger.info(f"Showing help for command: {sub_command}")
-                        # Add specific help details for each command
-                else:
-                    logger.info("Showing general help information.")
-                    logger.info("Available commands:")
-                    logger.info("  load_data=<path> [sheet_name=<name>] - Load data from the specified file path. Specify sheet name for XLSX files.")
-                    logger.info("  visualize=<plugin>[,<plugin>...] [max_row=<number>] [row_selection=<top|bottom|random|by_class>] [class_column=<column>] [class_value=<value>] - Visualize data using the specified plugins.")
-                    logger.info("  analyze=<plugin> - Analyze data using the specified plugin.")
-                    logger.info("  save=<path> - Save analysis results to the specified file path.")
-                    logger.info("  help [command] - Show this help message or help for a specific command.")
+        memory_budget = commands.get('memory_budget', [None])[0]
+        if memory_budget is not None:
+            # The budget applies to the rest of the session (e.g. later lines of a batch script)
+            session_store.memory_budget = int(float(memory_budget) * 1024 * 1024) if float(memory_budget) > 0 else None
 
-            else:
-                logger.error(f"Unknown command: {command}")
-                command_status = 1
+        # A batch script executes its command lines one after the other with this state
+        if 'run' in commands:
+            from .batch_runner import run_script
+            return run_script(commands)
 
-        return command_status
+        scheduler, command_status = build_command_graph(commands)
+        return scheduler.run() or command_status
 
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
@@ -232,4 +870,3 @@ def execute_commands(commands):
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         return 1
-
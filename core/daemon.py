@@ -0,0 +1,281 @@
+"""
+Module for running the DataSphere CLI as a persistent daemon.
+
+Every CLI invocation normally starts a new interpreter, rebuilds the plugin manager and the
+CLI state and loads the data again. In daemon mode (`python main.py serve`) a single process
+keeps the loaded datasets, the plugin instances and the imported libraries in memory and
+executes the command lines it receives over a local Unix socket. The thin client
+(`python main.py client <commands>`) forwards a command line to the daemon and prints the
+log messages produced while it is executed, so repeated command lines on the same data are
+answered in milliseconds instead of paying for the interpreter startup and the data load.
+
+The protocol is line-oriented JSON: the client sends `{"commands": "<command line>"}` and the
+daemon answers with one `{"level": <int>, "message": <str>}` line per log message followed
+by `{"exit_code": <int>}`. The command line `shutdown` stops the daemon.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from core.logging_config import logger
+
+# Default location of the daemon socket
+DEFAULT_SOCKET_PATH = os.path.join('data', 'processed', 'datasphere.sock')
+
+# Command line that stops the daemon
+SHUTDOWN_COMMAND = 'shutdown'
+
+
+class _ConnectionLogHandler(logging.Handler):
+    """
+    Logging handler that forwards the log records to a client connection.
+    """
+
+    def __init__(self, stream):
+        """
+        Initializes the handler.
+
+        Args:
+            stream (io.TextIOBase): The writable text stream of the client connection.
+        """
+        super().__init__(logging.DEBUG)
+        self._stream = stream
+
+    def emit(self, record):
+        """
+        Sends a log record to the client as a JSON line.
+
+        Args:
+            record (logging.LogRecord): The log record.
+        """
+        try:
+            self._stream.write(json.dumps({'level': record.levelno, 'message': record.getMessage()}) + '\n')
+            self._stream.flush()
+        except (OSError, ValueError):
+            # The client went away; the command keeps running and is logged locally
+            pass
+
+
+def _check_unix_sockets():
+    """
+    Raises an error if the platform does not support Unix sockets.
+
+    Raises:
+        ValueError: If Unix domain sockets are not available.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ValueError("Daemon mode requires Unix domain sockets, which are not available on this platform.")
+
+
+class DataSphereDaemon:
+    """
+    Server that executes CLI command lines in a persistent process.
+
+    Connections are accepted concurrently, but command lines are executed one at a time,
+    since they share the CLI state and the log messages of each one are sent to its client.
+
+    Attributes:
+        socket_path (str): The path of the Unix socket.
+
+    Methods:
+        serve(): Listens for command lines until the daemon is shut down.
+        shutdown(): Stops the daemon.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH):
+        """
+        Initializes the DataSphereDaemon.
+
+        Args:
+            socket_path (str): The path of the Unix socket.
+        """
+        _check_unix_sockets()
+        self.socket_path = socket_path
+        self._server = None
+        self._running = threading.Event()
+        self._execution_lock = threading.Lock()
+
+    def _remove_stale_socket(self):
+        """
+        Removes a socket file left by a daemon that is no longer running.
+
+        Raises:
+            ValueError: If another daemon is listening on the socket.
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise ValueError(f"A DataSphere daemon is already listening on '{self.socket_path}'.")
+
+    def _execute(self, command_string):
+        """
+        Executes a command line with the CLI state of the daemon.
+
+        Args:
+            command_string (str): The command line.
+
+        Returns:
+            int: The exit code of the command line.
+        """
+        from core.cli_parser import parse_command_string, execute_commands
+
+        commands = parse_command_string(command_string)
+        if not commands:
+            logger.error("No commands received.")
+            return 1
+        return execute_commands(commands)
+
+    def _handle(self, connection):
+        """
+        Serves a client connection: reads a command line, executes it and sends back the log
+        messages and the exit code.
+
+        Args:
+            connection (socket.socket): The client connection.
+        """
+        with connection, connection.makefile('r', encoding='utf-8') as reader, connection.makefile('w', encoding='utf-8') as writer:
+            try:
+                request = json.loads(reader.readline() or '{}')
+                command_string = str(request.get('commands', '')).strip()
+            except ValueError:
+                writer.write(json.dumps({'level': logging.ERROR, 'message': 'Malformed request.'}) + '\n')
+                writer.write(json.dumps({'exit_code': 1}) + '\n')
+                return
+
+            if command_string == SHUTDOWN_COMMAND:
+                writer.write(json.dumps({'level': logging.INFO, 'message': 'DataSphere daemon shutting down.'}) + '\n')
+                writer.write(json.dumps({'exit_code': 0}) + '\n')
+                self.shutdown()
+                return
+
+            with self._execution_lock:
+                handler = _ConnectionLogHandler(writer)
+                logger.addHandler(handler)
+                start = time.perf_counter()
+                try:
+                    exit_code = self._execute(command_string)
+                except Exception as e:
+                    logger.error(f"An unexpected error occurred: {e}")
+                    exit_code = 1
+                finally:
+                    logger.removeHandler(handler)
+                logger.info(f"Command line executed in {(time.perf_counter() - start) * 1000:.1f} ms: {command_string}")
+            try:
+                writer.write(json.dumps({'exit_code': exit_code}) + '\n')
+            except OSError:
+                pass
+
+    def serve(self, initial_commands=None):
+        """
+        Listens for command lines on the Unix socket until the daemon is shut down.
+
+        Args:
+            initial_commands (str, optional): A command line executed before listening,
+                e.g. to preload the datasets.
+
+        Returns:
+            int: 0 when the daemon is shut down, or the exit code of the initial commands if
+            they failed.
+
+        Raises:
+            ValueError: If another daemon is listening on the socket.
+        """
+        import core.cli_parser as cli_parser
+
+        # Reuse the datasets of previous loads of unchanged files instead of parsing them again
+        cli_parser.resident_loads = True
+
+        self._remove_stale_socket()
+        if initial_commands:
+            exit_code = self._execute(initial_commands)
+            if exit_code:
+                return exit_code
+
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)  # Only the owner can send commands
+        self._server.listen()
+        self._running.set()
+        logger.info(f"DataSphere daemon listening on '{self.socket_path}'. Send 'shutdown' to stop it.")
+
+        try:
+            while self._running.is_set():
+                try:
+                    connection, _ = self._server.accept()
+                except OSError:
+                    break  # The server socket was closed by shutdown()
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            self._close()
+        return 0
+
+    def shutdown(self):
+        """
+        Stops the daemon and unblocks the accept loop.
+        """
+        self._running.clear()
+        if self._server is not None:
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+
+    def _close(self):
+        """
+        Closes the server socket and removes the socket file.
+        """
+        if self._server is not None:
+            self._server.close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        logger.info("DataSphere daemon stopped.")
+
+
+def send_commands(command_string, socket_path=DEFAULT_SOCKET_PATH):
+    """
+    Forwards a command line to the daemon and logs the messages it sends back.
+
+    Args:
+        command_string (str): The command line.
+        socket_path (str): The path of the daemon socket.
+
+    Returns:
+        int: The exit code of the command line, or 1 if the daemon cannot be reached.
+    """
+    _check_unix_sockets()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError as e:
+        client.close()
+        logger.error(f"No DataSphere daemon is listening on '{socket_path}' ({e}). Start one with 'python main.py serve'.")
+        return 1
+
+    exit_code = 1
+    with client, client.makefile('r', encoding='utf-8') as reader, client.makefile('w', encoding='utf-8') as writer:
+        writer.write(json.dumps({'commands': command_string}) + '\n')
+        writer.flush()
+        for line in reader:
+            message = json.loads(line)
+            if 'exit_code' in message:
+                exit_code = message['exit_code']
+                break
+            logger.log(message['level'], message['message'])
+    return exit_code
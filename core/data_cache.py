@@ -0,0 +1,252 @@
+"""
+Module for caching parsed datasets in the DataSphere CLI.
+
+This module defines the DataCache class, which stores DataFrames produced by the data I/O
+plugins in a binary columnar format (Feather/Arrow IPC) under `data/processed/cache`. Each
+cache entry is addressed by a key derived from the source file path, size and modification
+time together with the loader name, version and the options that change the parsed data,
+and the version of the cache format, so any change to the source file or to the way it is
+parsed results in a different entry. Subsequent loads of an unchanged file
+are served from the cache instead of re-parsing the raw CSV, XLSX or ARFF file.
+
+The cache is bounded in size: when the total size of the stored entries exceeds the
+configured limit, the least recently used entries are evicted.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import TYPE_CHECKING
+from core.logging_config import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Default location and size limit of the cache
+DEFAULT_CACHE_DIR = os.path.join('data', 'processed', 'cache')
+DEFAULT_MAX_SIZE_MB = 2048
+
+# Extension used for cache entries
+CACHE_EXTENSION = '.feather'
+
+# Version of the cached data; increasing it invalidates every entry (e.g. when a parser
+# changes the data it produces without a change of its configuration)
+CACHE_FORMAT_VERSION = 2
+
+# Loader options that do not change the parsed data (writer options, parallelism and
+# streaming, which is never cached), left out of the cache key
+NON_LOAD_OPTIONS = frozenset({'relation', 'write_chunksize', 'compression', 'workers', 'chunksize'})
+
+
+class DataCache:
+    """
+    Content-addressed cache of parsed DataFrames stored in a binary columnar format.
+
+    Attributes:
+        cache_dir (str): Directory where the cache entries are stored.
+        max_size_bytes (int): Maximum total size of the cache entries, in bytes.
+        enabled (bool): Whether the cache is usable (False if the columnar backend is missing).
+
+    Methods:
+        make_key(path, loader_name, config, loader_version): Builds the cache key of a file loaded with a given loader.
+        get(key): Returns the cached DataFrame for a key, or None on a cache miss.
+        put(key, dataframe): Stores a DataFrame in the cache and evicts old entries if needed.
+        invalidate(key): Removes the entry of a key from the cache.
+        evict(): Removes least recently used entries until the cache fits its size limit.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        """
+        Initializes the DataCache.
+
+        Args:
+            cache_dir (str): Directory where the cache entries are stored.
+            max_size_mb (float): Maximum total size of the cache entries, in megabytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = True
+
+    def make_key(self, path: str, loader_name: str, config: dict, loader_version: str = None) -> str:
+        """
+        Builds the cache key of a file loaded with a given loader and configuration.
+
+        The key is the SHA-256 digest of the absolute file path, its size and modification
+        time, the loader name and version, the options of its configuration that change the
+        parsed data and the version of the cache format, so a modified file, a different
+        loader configuration or a new parser never hits a stale entry, while writer-only
+        options do not cause misses.
+
+        Args:
+            path (str): The path to the source data file.
+            loader_name (str): The name of the data I/O plugin used to parse the file.
+            config (dict): The configuration of the data I/O plugin.
+            loader_version (str, optional): The version of the data I/O plugin.
+
+        Returns:
+            str: The hexadecimal cache key.
+
+        Raises:
+            FileNotFoundError: If the source file does not exist.
+        """
+        file_stat = os.stat(path)
+        fingerprint = {
+            'path': os.path.abspath(path),
+            'size': file_stat.st_size,
+            'mtime': file_stat.st_mtime_ns,
+            'loader': loader_name,
+            'loader_version': loader_version,
+            'format': CACHE_FORMAT_VERSION,
+            'config': {option: value for option, value in config.items() if option not in NON_LOAD_OPTIONS},
+        }
+        serialized = json.dumps(fingerprint, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns the cached DataFrame for a key.
+
+        A hit refreshes the access time of the entry, which is used for LRU eviction.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            pd.DataFrame: The cached DataFrame, or None on a cache miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        if not os.path.isfile(entry_path):
+            logger.info(f"Cache miss for key '{key[:12]}'.")
+            return None
+
+        try:
+            import pandas as pd
+            dataframe = pd.read_feather(entry_path)
+            os.utime(entry_path)  # Mark the entry as recently used
+            logger.info(f"Cache hit for key '{key[:12]}'. Data served from '{entry_path}'.")
+            return dataframe
+        except ImportError as e:
+            self._disable(e)
+            return None
+        except Exception as e:
+            logger.warning(f"Cache entry '{entry_path}' could not be read and will be removed: {e}")
+            self.invalidate(key)
+            return None
+
+    def put(self, key: str, dataframe: "pd.DataFrame") -> bool:
+        """
+        Stores a DataFrame in the cache and evicts old entries if the size limit is exceeded.
+
+        Only DataFrames with string column names and a default index can be stored in the
+        columnar format; other DataFrames are not cached.
+
+        Args:
+            key (str): The cache key.
+            dataframe (pd.DataFrame): The DataFrame to store.
+
+        Returns:
+            bool: True if the DataFrame was stored, False otherwise.
+        """
+        if not self.enabled:
+            return False
+
+        import pandas as pd
+        if not all(isinstance(column, str) for column in dataframe.columns):
+            logger.info("Data not cached: the columnar cache requires string column names.")
+            return False
+        if not isinstance(dataframe.index, pd.RangeIndex) or dataframe.index.start != 0 or dataframe.index.step != 1:
+            logger.info("Data not cached: the columnar cache requires a default index.")
+            return False
+
+        entry_path = self._entry_path(key)
+        # Concurrent writers of the same entry use distinct temporary files
+        temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            dataframe.to_feather(temp_path)
+            os.replace(temp_path, entry_path)
+            logger.info(f"Data cached at '{entry_path}'.")
+        except ImportError as e:
+            self._disable(e)
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to cache data at '{entry_path}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def invalidate(self, key: str):
+        """
+        Removes the entry of a key from the cache, if it exists.
+
+        Args:
+            key (str): The cache key.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            if os.path.exists(entry_path):
+                os.remove(entry_path)
+                logger.info(f"Cache entry '{entry_path}' removed.")
+        except OSError as e:
+            logger.error(f"Error removing cache entry '{entry_path}': {e}")
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits its size limit.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(CACHE_EXTENSION):
+                entry_path = os.path.join(self.cache_dir, file_name)
+                entry_stat = os.stat(entry_path)
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        # Oldest access first
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                total_size -= size
+                logger.info(f"Evicted cache entry '{entry_path}' ({size / (1024 * 1024):.1f} MB).")
+            except OSError as e:
+                logger.error(f"Error evicting cache entry '{entry_path}': {e}")
+
+    def _entry_path(self, key: str) -> str:
+        """
+        Returns the file path of the entry of a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The path of the cache entry.
+        """
+        return os.path.join(self.cache_dir, f"{key}{CACHE_EXTENSION}")
+
+    def _disable(self, error: Exception):
+        """
+        Disables the cache when the columnar backend (pyarrow) is not available.
+
+        Args:
+            error (Exception): The import error raised by pandas.
+        """
+        self.enabled = False
+        logger.warning(f"Data cache disabled because the columnar backend is not available: {error}")
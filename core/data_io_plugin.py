@@ -12,6 +12,18 @@ Email: lbustio@gmail.com
 """
 
 from .base_plugin import BasePlugin
+from .logging_config import logger
+from utils.filter_utils import ColumnSelector, apply_filters, DEFAULT_FILTER_CHUNKSIZE
+
+# Modes accepted by the `optimize_dtypes` setting and their aliases
+OPTIMIZE_DTYPES_MODES = ('off', 'safe', 'aggressive')
+OPTIMIZE_DTYPES_ALIASES = {'false': 'off', 'no': 'off', 'true': 'safe', 'yes': 'safe', 'on': 'safe'}
+
+# Number of rows written at a time by the writers
+DEFAULT_WRITE_CHUNKSIZE = 100000
+
+# Maximum ratio of distinct values to rows for a string column to be converted to 'category'
+DEFAULT_CATEGORY_THRESHOLD = 0.5
 
 class DataIOPlugin(BasePlugin):
     """
@@ -23,6 +35,14 @@ class DataIOPlugin(BasePlugin):
 
     Attributes:
         None
+
+    Methods:
+        load_chunks(path): Loads the data from a path as a stream of DataFrame chunks.
+        optimize_dtypes(dataframe, categorize): Reduces the memory footprint of a loaded DataFrame.
+        column_selector(): Returns the callable that decides which columns have to be parsed.
+        apply_filters(dataframe): Applies the configured row predicate and column projection.
+        save(data, path): Writes a DataFrame to a path in the format of the plugin.
+        save_chunks(chunks, path): Writes a stream of DataFrame chunks to a path.
     """
     
     def __init__(self):
@@ -32,3 +52,172 @@ class DataIOPlugin(BasePlugin):
         Calls the initializer of the parent class, BasePlugin.
         """
         super().__init__()
+
+    def load_chunks(self, path: str):
+        """
+        Loads the data from the specified path as a stream of DataFrame chunks.
+
+        The default implementation is not streaming: it loads the whole file with
+        `load` and yields it as a single chunk. Loaders that can parse their format
+        incrementally override this method so that peak memory is bounded by the
+        chunk size instead of the file size.
+
+        Args:
+            path (str): The path to the data file.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the loaded data.
+        """
+        yield self.load(path)
+
+    def save(self, data, path: str):
+        """
+        Writes a DataFrame to the specified path in the format handled by the plugin.
+
+        Writers are selected by the extension of the output path, like loaders. Plugins
+        that can write their format override this method.
+
+        Args:
+            data (pd.DataFrame): The data to write.
+            path (str): The output path. A compression suffix ('.gz', '.bz2', '.xz', '.zst')
+                compresses the output as it is written.
+
+        Raises:
+            NotImplementedError: If the plugin cannot write its format.
+        """
+        raise NotImplementedError(f"Plugin '{type(self).__name__}' does not support saving data.")
+
+    def save_chunks(self, chunks, path: str):
+        """
+        Writes a stream of DataFrame chunks to the specified path.
+
+        The default implementation concatenates the chunks and calls `save`. Writers whose
+        format can be appended to override this method to keep memory bounded by the chunk size.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+            path (str): The output path.
+        """
+        import pandas as pd
+
+        logger.warning(f"Plugin '{type(self).__name__}' cannot write chunks incrementally. All chunks will be loaded into memory.")
+        self.save(pd.concat(chunks), path)
+
+    def column_selector(self):
+        """
+        Returns the callable that decides which columns have to be parsed.
+
+        The selection is driven by the `columns` configuration setting (a list of column
+        names). Columns referenced by the `where` predicate are parsed as well, so the
+        predicate can be evaluated before the projection is applied.
+
+        Returns:
+            ColumnSelector: The column selector, or None if every column has to be parsed.
+        """
+        if not self._config.get("columns"):
+            return None
+        return ColumnSelector(self._config.get("columns"), self._config.get("where"))
+
+    def has_filters(self) -> bool:
+        """
+        Returns whether a row predicate or a column projection is configured.
+
+        Returns:
+            bool: True if the `where` or `columns` configuration settings are set.
+        """
+        return bool(self._config.get("where") or self._config.get("columns"))
+
+    def apply_filters(self, dataframe):
+        """
+        Applies the configured row predicate (`where`) and column projection (`columns`).
+
+        Loaders call this method on every parsed chunk, so rows and columns that are not
+        needed never accumulate in memory.
+
+        Args:
+            dataframe (pd.DataFrame): The parsed data or chunk.
+
+        Returns:
+            pd.DataFrame: The filtered data.
+
+        Raises:
+            ValueError: If a requested column does not exist or the predicate is invalid.
+        """
+        return apply_filters(dataframe, self._config.get("columns"), self._config.get("where"))
+
+    def load_filtered(self, chunks):
+        """
+        Builds a DataFrame from parsed chunks, filtering each chunk as soon as it is parsed.
+
+        Args:
+            chunks (iterable): The parsed chunks of a file.
+
+        Returns:
+            pd.DataFrame: The concatenation of the filtered chunks, with a default index.
+        """
+        import pandas as pd
+
+        return pd.concat([self.apply_filters(chunk) for chunk in chunks], ignore_index=True)
+
+    def optimize_dtypes(self, dataframe, categorize: bool = True):
+        """
+        Reduces the memory footprint of a loaded DataFrame by optimizing its data types.
+
+        This is the shared post-load stage of all loaders. Its behaviour is controlled by the
+        `optimize_dtypes` configuration setting:
+            - off: The DataFrame is returned unchanged.
+            - safe (default): Integers are downcast to the smallest type that holds their range,
+              floats are downcast to float32 only when no precision is lost, byte strings are
+              decoded to text and low-cardinality string columns are converted to 'category'.
+            - aggressive: Like safe, but floats are always downcast to float32.
+
+        The memory usage before and after the optimization is logged.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to optimize. It is modified in place.
+            categorize (bool): Whether string columns may be converted to 'category'. Loaders
+                disable it for chunks, whose categories would not match across chunks.
+
+        Returns:
+            pd.DataFrame: The optimized DataFrame.
+
+        Raises:
+            ValueError: If the `optimize_dtypes` setting is not a valid mode.
+        """
+        import pandas as pd
+
+        mode = str(self._config.get("optimize_dtypes", "safe")).lower()
+        mode = OPTIMIZE_DTYPES_ALIASES.get(mode, mode)
+        if mode not in OPTIMIZE_DTYPES_MODES:
+            raise ValueError(f"Invalid optimize_dtypes mode '{mode}'. Expected one of: {', '.join(OPTIMIZE_DTYPES_MODES)}.")
+        if mode == "off" or dataframe is None or dataframe.empty:
+            return dataframe
+
+        category_threshold = float(self._config.get("category_threshold", DEFAULT_CATEGORY_THRESHOLD))
+        memory_before = dataframe.memory_usage(deep=True).sum()
+
+        for column in dataframe.columns:
+            series = dataframe[column]
+            if pd.api.types.is_bool_dtype(series):
+                continue
+            elif pd.api.types.is_integer_dtype(series):
+                downcast = "unsigned" if series.min() >= 0 else "integer"
+                dataframe[column] = pd.to_numeric(series, downcast=downcast)
+            elif pd.api.types.is_float_dtype(series):
+                downcast = pd.to_numeric(series, downcast="float")
+                # In safe mode, keep the original type unless every value survives the round trip
+                if mode == "aggressive" or ((downcast.astype(series.dtype) == series) | series.isna()).all():
+                    dataframe[column] = downcast
+            elif pd.api.types.is_object_dtype(series):
+                non_null = series.dropna()
+                if not non_null.empty and isinstance(non_null.iloc[0], bytes):
+                    # Nominal values of some formats (e.g. ARFF) are read as raw bytes
+                    series = series.str.decode("utf-8")
+                    dataframe[column] = series
+                if categorize and series.nunique(dropna=True) <= category_threshold * len(series):
+                    dataframe[column] = series.astype("category")
+
+        memory_after = dataframe.memory_usage(deep=True).sum()
+        reduction = 100 * (1 - memory_after / memory_before) if memory_before else 0
+        logger.info(f"Data types optimized ('{mode}'): memory usage reduced from {memory_before / 1024:.1f} KB to {memory_after / 1024:.1f} KB ({reduction:.1f}% reduction).")
+        return dataframe
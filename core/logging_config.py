@@ -48,7 +48,7 @@ class ColoredFormatter(logging.Formatter):
 
         try:
             # Split the log message into timestamp, levelname, and message
-            parts = log_message.split(' - ')
+            parts = log_message.split(' - ', 2)
             timestamp = parts[0]
             levelname = parts[1]
             message = parts[2]
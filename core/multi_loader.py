@@ -0,0 +1,149 @@
+"""
+Module for loading several data files as a single dataset in the DataSphere CLI.
+
+This module supports `load_data` values that expand to several files (glob patterns and
+directories). The files are parsed concurrently in a process pool, each worker using its own
+instance of the data I/O plugin that matches the file extension, and the resulting DataFrames
+are concatenated in file order. Categorical columns are aligned across files so they keep
+their categorical type, and an optional source column records the file each row came from.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import os
+from core.logging_config import logger
+from core.plugin_manager import PluginManager
+
+
+def _load_file(plugin_name, config, path):
+    """
+    Loads a single file in a worker process.
+
+    The worker creates its own data I/O plugin instance, applies the configuration of the
+    plugin in the parent process and loads the file.
+
+    Args:
+        plugin_name (str): The name of the data I/O plugin.
+        config (dict): The configuration of the data I/O plugin.
+        path (str): The path to the data file.
+
+    Returns:
+        pd.DataFrame: The loaded data.
+
+    Raises:
+        ValueError: If the plugin cannot be loaded or the file yields several datasets.
+    """
+    manager = PluginManager()
+    manager.load_plugin('data_io', plugin_name)
+    plugin = manager.get_plugin(plugin_name)
+    if plugin is None:
+        raise ValueError(f"Plugin '{plugin_name}' not found.")
+    plugin._config.update(config)
+    data = plugin.load(path)
+    if isinstance(data, dict):
+        raise ValueError(f"File '{path}' produced several datasets, which cannot be combined in a multi-file load.")
+    return data
+
+
+def load_files_parallel(tasks, workers=None):
+    """
+    Loads several files concurrently in a process pool.
+
+    Args:
+        tasks (list): A list of (plugin_name, config, path) tuples, one per file.
+        workers (int, optional): The maximum number of worker processes. Defaults to the
+            number of CPU cores.
+
+    Returns:
+        list: The loaded DataFrames, in the same order as the tasks.
+    """
+    if not tasks:
+        return []
+    if len(tasks) == 1:
+        return [_load_file(*tasks[0])]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from utils.parallel_utils import process_pool_context
+
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    logger.info(f"Loading {len(tasks)} files using {workers} worker processes.")
+    plugin_names, configs, paths = zip(*tasks)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context()) as executor:
+        return list(executor.map(_load_file, plugin_names, configs, paths))
+
+
+def _add_source_column(frame, source_column, source_index, sources):
+    """
+    Adds a categorical column with the source file of every row.
+
+    Args:
+        frame (pd.DataFrame): The data loaded from one file.
+        source_column (str): The name of the source column.
+        source_index (int): The position of the file in `sources`.
+        sources (list): The paths of all the files.
+
+    Returns:
+        pd.DataFrame: The DataFrame with the source column.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes = np.full(len(frame), source_index, dtype=np.int32)
+    frame[source_column] = pd.Categorical.from_codes(codes, categories=sources)
+    return frame
+
+
+def concat_frames(frames, sources=None, source_column=None):
+    """
+    Concatenates the DataFrames loaded from several files.
+
+    Columns that are categorical in every DataFrame are converted to the union of their
+    categories first, so the concatenated column remains categorical instead of falling back
+    to object strings.
+
+    Args:
+        frames (list): The DataFrames to concatenate.
+        sources (list, optional): The paths of the files the DataFrames were loaded from.
+        source_column (str, optional): If given, the name of a column added with the source
+            file of every row.
+
+    Returns:
+        pd.DataFrame: The concatenated data.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if source_column:
+        frames = [_add_source_column(frame, source_column, index, list(sources)) for index, frame in enumerate(frames)]
+
+    for column in frames[0].columns:
+        if all(column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = pd.Index(pd.unique(np.concatenate([frame[column].cat.categories.to_numpy() for frame in frames])))
+            for frame in frames:
+                frame[column] = frame[column].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def iter_files_chunks(loaders, source_column=None):
+    """
+    Streams several files one after the other as a single sequence of chunks.
+
+    Args:
+        loaders (list): A list of (plugin, path) tuples with the configured data I/O plugin of
+            each file.
+        source_column (str, optional): If given, the name of a column added to every chunk
+            with the path of the file it came from.
+
+    Yields:
+        pd.DataFrame: The chunks of all the files, in file order.
+    """
+    sources = [path for _, path in loaders]
+    for index, (plugin, path) in enumerate(loaders):
+        for chunk in plugin.load_chunks(path):
+            if source_column:
+                chunk = _add_source_column(chunk, source_column, index, sources)
+            yield chunk
@@ -1,14 +1,35 @@
 """
 Module for managing plugins in the ClearData CLI.
 
+Plugins are discovered by scanning the type directories under `plugins/` (`data_io`,
+`visualization`, `analysis`, ...) once. The result is persisted in a manifest file with the
+name, type, module path and modification time of every plugin, so later runs do not walk the
+plugin tree: the manifest is only rebuilt when a type directory changes (a plugin is added
+or removed). Plugin modules are registered in `sys.modules` and reused while their source
+file is unchanged, and plugin instances are reused across commands.
+
 Author: Lázaro Bustio Martínez
 Date: 2024-08-01
-Version: 1.0
+Version: 1.1
 Email: lbustio@gmail.com
 """
 
-from core.logging_config import logger
+import os
+import sys
+import json
+import threading
 import importlib.util
+from core.logging_config import logger
+
+# Directory scanned for plugins, one subdirectory per plugin type
+DEFAULT_PLUGINS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'plugins')
+
+# Location of the plugin manifest cache
+DEFAULT_MANIFEST_PATH = os.path.join('data', 'processed', 'plugin_manifest.json')
+
+# Version of the manifest format; manifests with another version are rebuilt
+MANIFEST_VERSION = 1
+
 
 class PluginManager:
     """
@@ -16,27 +37,218 @@ class PluginManager:
 
     Attributes:
         plugins (dict): A dictionary to store instances of loaded plugins by name.
+        plugins_dir (str): The directory scanned for plugins.
+        manifest_path (str): The path of the plugin manifest cache.
 
     Methods:
         __init__(): Initializes the PluginManager with an empty dictionary of plugins.
+        discover(refresh): Returns the plugin registry, reading the manifest or scanning the plugin tree.
+        list_plugins(plugin_type): Returns the names of the available plugins.
         load_plugin(plugin_type, plugin_name): Dynamically loads a plugin of a specific type and name.
         remove_plugin(plugin_name): Removes a loaded plugin by its name.
         get_plugin(plugin_name): Retrieves a loaded plugin instance by its name.
     """
 
-    def __init__(self):
+    def __init__(self, plugins_dir: str = DEFAULT_PLUGINS_DIR, manifest_path: str = DEFAULT_MANIFEST_PATH):
         """
         Initializes the PluginManager class.
 
-        Sets up an empty dictionary to store loaded plugins. This dictionary 
+        Sets up an empty dictionary to store loaded plugins. This dictionary
         allows for efficient management and retrieval of plugin instances.
+        The plugin registry is read lazily, the first time a plugin is requested.
+
+        Args:
+            plugins_dir (str): The directory scanned for plugins.
+            manifest_path (str): The path of the plugin manifest cache.
         """
         self.plugins = {}
+        self.plugins_dir = plugins_dir
+        self.manifest_path = manifest_path
+        self._registry = None
+        self._plugin_types = {}
+        # Steps running in parallel threads may load plugins at the same time
+        self._lock = threading.RLock()
+
+    def _directory_mtimes(self):
+        """
+        Returns the modification time of every plugin type directory.
+
+        Adding, removing or renaming a plugin file changes the modification time of its
+        directory, so these times are enough to know whether the manifest is still valid.
+
+        Returns:
+            dict: The modification time of each type directory, keyed by plugin type.
+        """
+        mtimes = {}
+        for entry in os.scandir(self.plugins_dir):
+            if entry.is_dir() and not entry.name.startswith(('_', '.')):
+                mtimes[entry.name] = entry.stat().st_mtime
+        return mtimes
+
+    def _scan(self, directories):
+        """
+        Walks the plugin type directories and builds the plugin registry.
+
+        Args:
+            directories (dict): The modification time of each type directory.
+
+        Returns:
+            dict: The plugin entries (module, path and mtime), keyed by type and name.
+        """
+        registry = {}
+        for plugin_type in directories:
+            entries = {}
+            for entry in os.scandir(os.path.join(self.plugins_dir, plugin_type)):
+                name, extension = os.path.splitext(entry.name)
+                if extension == '.py' and entry.is_file() and not name.startswith('_'):
+                    entries[name] = {
+                        'module': f"plugins.{plugin_type}.{name}",
+                        'path': entry.path,
+                        'mtime': entry.stat().st_mtime,
+                    }
+            registry[plugin_type] = entries
+        return registry
+
+    def _write_manifest(self, directories):
+        """
+        Persists the plugin registry in the manifest file.
+
+        The manifest is written to a temporary file that replaces the previous one, so
+        concurrent processes never read a partially written manifest. Failures are logged
+        and ignored, since the manifest is only a cache.
+
+        Args:
+            directories (dict): The modification time of each type directory.
+        """
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'plugins_dir': self.plugins_dir,
+            'directories': directories,
+            'plugins': self._registry,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+            temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(manifest, file, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write the plugin manifest '{self.manifest_path}': {e}")
+
+    def _read_manifest(self, directories):
+        """
+        Reads the plugin registry from the manifest file if it is still valid.
+
+        Args:
+            directories (dict): The current modification time of each type directory.
+
+        Returns:
+            dict: The plugin registry, or None if the manifest is missing or outdated.
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if (manifest.get('version') != MANIFEST_VERSION or manifest.get('plugins_dir') != self.plugins_dir
+                or manifest.get('directories') != directories):
+            return None
+        return manifest.get('plugins')
+
+    def discover(self, refresh=False):
+        """
+        Returns the plugin registry, reading the manifest or scanning the plugin tree.
+
+        Args:
+            refresh (bool): Whether to scan the plugin tree even if the manifest is valid.
+
+        Returns:
+            dict: The plugin entries (module, path and mtime), keyed by type and name.
+        """
+        if self._registry is not None and not refresh:
+            return self._registry
+
+        directories = self._directory_mtimes()
+        registry = None if refresh else self._read_manifest(directories)
+        if registry is None:
+            self._registry = self._scan(directories)
+            self._write_manifest(directories)
+            logger.info(f"Plugin manifest rebuilt with {sum(len(entries) for entries in self._registry.values())} plugins.")
+        else:
+            self._registry = registry
+        return self._registry
+
+    def list_plugins(self, plugin_type=None):
+        """
+        Returns the names of the available plugins.
+
+        Args:
+            plugin_type (str, optional): The type of the plugins to list. If None, the
+                plugins of every type are listed.
+
+        Returns:
+            list: The sorted plugin names.
+        """
+        registry = self.discover()
+        types = [plugin_type] if plugin_type else list(registry)
+        return sorted(name for current_type in types for name in registry.get(current_type, {}))
+
+    def _import_module(self, plugin_type, plugin_name):
+        """
+        Imports the module of a plugin, reusing it if it was already imported.
+
+        The module is registered in `sys.modules` under its package name, so it is shared by
+        every PluginManager of the process and its classes can be pickled. A module whose
+        source file changed since it was imported is executed again.
+
+        Args:
+            plugin_type (str): The type of the plugin.
+            plugin_name (str): The name of the plugin.
+
+        Returns:
+            module: The plugin module.
+
+        Raises:
+            ModuleNotFoundError: If the plugin module cannot be found.
+        """
+        entry = self.discover().get(plugin_type, {}).get(plugin_name)
+        if entry is None or not os.path.exists(entry['path']):
+            # Plugins may have been added or removed since the registry was read
+            self._registry = None
+            entry = self.discover().get(plugin_type, {}).get(plugin_name)
+            if entry is None:
+                raise ModuleNotFoundError(f"Module 'plugins.{plugin_type}.{plugin_name}' not found.")
+
+        module_name = entry['module']
+        mtime = os.stat(entry['path']).st_mtime
+        module = sys.modules.get(module_name)
+        if module is not None and getattr(module, '__plugin_mtime__', None) == mtime:
+            logger.info(f"Reusing imported module '{module_name}'.")
+            return module
+
+        if mtime != entry['mtime']:
+            entry['mtime'] = mtime
+            self._write_manifest(self._directory_mtimes())
+
+        logger.info(f"Plugin {plugin_name} located at: '{entry['path']}'")
+        spec = importlib.util.spec_from_file_location(module_name, entry['path'])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+        module.__plugin_mtime__ = mtime
+        return module
 
     def load_plugin(self, plugin_type, plugin_name):
         """
         Dynamically loads a plugin of a specific type and name.
 
+        A plugin that is already loaded is reused, unless its module changed since it
+        was instantiated.
+
         Args:
             plugin_type (str): The type of the plugin (e.g., 'data_io').
             plugin_name (str): The name of the plugin to load.
@@ -48,31 +260,42 @@ class PluginManager:
         """
 
         module_path = f"plugins.{plugin_type}.{plugin_name}"
-        
+
+        with self._lock:
+            self._load_plugin(plugin_type, plugin_name, module_path)
+
+    def _load_plugin(self, plugin_type, plugin_name, module_path):
+        """
+        Loads a plugin while holding the lock of the manager.
+
+        Args:
+            plugin_type (str): The type of the plugin (e.g., 'data_io').
+            plugin_name (str): The name of the plugin to load.
+            module_path (str): The package path of the plugin module.
+        """
         try:
             # Log the attempt to load the plugin
             logger.info(f"Attempting to load plugin '{plugin_name}' of type '{plugin_type}' from '{module_path}'.")
 
-            # Dynamically import the plugin module
-            spec = importlib.util.find_spec(module_path)
-            if spec is None:
-                raise ModuleNotFoundError(f"Module '{module_path}' not found.")
+            # Import the plugin module, or reuse it if it is already imported
+            module = self._import_module(plugin_type, plugin_name)
 
-            # Get the file location of the module (for debugging)
-            file_location = spec.origin if spec.origin else f"Unknown location for plugin '{module_path}'"
-            logger.info(f"Plugin {plugin_name} located at: '{file_location}'")
+            # Reuse the plugin instance if it was created from the same module
+            current_plugin = self.plugins.get(plugin_name)
+            if current_plugin is not None and self._plugin_types.get(plugin_name) == plugin_type \
+                    and type(current_plugin) is getattr(module, plugin_name, None):
+                logger.info(f"Plugin '{plugin_name}' of type '{plugin_type}' is already loaded.")
+                return
 
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
             # Retrieve the plugin class from the module
             plugin_class = getattr(module, plugin_name)
 
             # Instantiate the plugin class and store it
             current_plugin = plugin_class()
-            self.plugins[plugin_name] = current_plugin 
+            self.plugins[plugin_name] = current_plugin
+            self._plugin_types[plugin_name] = plugin_type
             logger.info(f"Plugin '{plugin_name}' of type '{plugin_type}' loaded successfully.")
-            
+
         except ModuleNotFoundError as e:
             logger.error(f"Error loading the plugin '{plugin_name}' of type '{plugin_type}': {str(e)}")
         except AttributeError as e:
@@ -93,6 +316,7 @@ class PluginManager:
 
         if plugin_name in self.plugins:
             del self.plugins[plugin_name]
+            self._plugin_types.pop(plugin_name, None)
             logger.info(f"Plugin '{plugin_name}' removed successfully.")
         else:
             logger.error(f"Error: Plugin '{plugin_name}' is not loaded.")
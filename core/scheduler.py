@@ -0,0 +1,207 @@
+"""
+Module for scheduling the steps of a DataSphere CLI invocation as a dependency graph.
+
+This module defines the TaskScheduler class, which runs a directed acyclic graph (DAG) of
+steps (loading, analyzing, visualizing and saving data). Every step declares the steps it
+depends on; a step is started as soon as all its dependencies have finished successfully,
+so independent steps (e.g. several loads, or several visualizations of the same data) run
+concurrently on a thread pool. The steps share the in-memory state of the CLI, which is why
+threads are used: the heavy work of the steps (parsing, pandas operations, rendering)
+releases the GIL or runs in the process pools of the loaders. When a step fails, the steps
+that depend on it are skipped.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from core.logging_config import logger
+
+
+class Task:
+    """
+    A step of the dependency graph.
+
+    Attributes:
+        name (str): The unique name of the step.
+        func (callable): The function executed by the step. It receives no arguments and
+            returns an exit code (0 for success, any other value for failure).
+        depends_on (tuple): The names of the steps that must succeed before this one starts.
+        status (str): 'pending', 'done', 'failed' or 'skipped'.
+    """
+
+    def __init__(self, name, func, depends_on=()):
+        """
+        Initializes the Task.
+
+        Args:
+            name (str): The unique name of the step.
+            func (callable): The function executed by the step.
+            depends_on (iterable): The names of the steps this step depends on.
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.status = 'pending'
+
+
+class TaskScheduler:
+    """
+    Executes a DAG of steps, running independent steps concurrently.
+
+    Steps can only depend on steps added before them, so the graph cannot contain cycles.
+
+    Attributes:
+        jobs (int): The maximum number of steps executed at the same time.
+        tasks (dict): The steps, keyed by name, in the order they were added.
+
+    Methods:
+        add_task(name, func, depends_on): Adds a step to the graph and returns its unique name.
+        run(): Executes the graph and returns an exit code.
+
+    Example:
+        >>> scheduler = TaskScheduler(jobs=4)
+        >>> load = scheduler.add_task('load_data', load_function)
+        >>> scheduler.add_task('visualize=table_viewer', table_function, depends_on=[load])
+        >>> scheduler.add_task('visualize=resume_viewer', resume_function, depends_on=[load])
+        >>> exit_code = scheduler.run()
+    """
+
+    def __init__(self, jobs=None):
+        """
+        Initializes the TaskScheduler.
+
+        Args:
+            jobs (int, optional): The maximum number of concurrent steps. Defaults to the
+                number of CPU cores.
+
+        Raises:
+            ValueError: If `jobs` is smaller than 1.
+        """
+        jobs = int(jobs) if jobs else (os.cpu_count() or 1)
+        if jobs < 1:
+            raise ValueError(f"The number of jobs must be at least 1, got {jobs}.")
+        self.jobs = jobs
+        self.tasks = {}
+
+    def add_task(self, name, func, depends_on=()):
+        """
+        Adds a step to the graph.
+
+        Args:
+            name (str): The name of the step. A suffix is added if the name is already used.
+            func (callable): The function executed by the step. It returns 0 on success.
+            depends_on (iterable): The names of the steps this step depends on.
+
+        Returns:
+            str: The unique name of the step, to be used in the dependencies of other steps.
+
+        Raises:
+            ValueError: If a dependency is not a step of the graph.
+        """
+        unique_name = name
+        suffix = 1
+        while unique_name in self.tasks:
+            suffix += 1
+            unique_name = f"{name}#{suffix}"
+
+        depends_on = tuple(depends_on)
+        missing = [dependency for dependency in depends_on if dependency not in self.tasks]
+        if missing:
+            raise ValueError(f"Step '{unique_name}' depends on unknown steps: {', '.join(missing)}.")
+
+        self.tasks[unique_name] = Task(unique_name, func, depends_on)
+        return unique_name
+
+    def _execute(self, task):
+        """
+        Executes a step and returns its exit code. Exceptions are logged and turned into a failure.
+
+        Args:
+            task (Task): The step to execute.
+
+        Returns:
+            int: The exit code of the step.
+        """
+        logger.info(f"Starting step '{task.name}'.")
+        try:
+            status = task.func()
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e}")
+            return 1
+        except ValueError as e:
+            logger.error(f"Value error: {e}")
+            return 1
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in step '{task.name}': {e}")
+            return 1
+        return status or 0
+
+    def _skip_dependents(self, failed_task):
+        """
+        Marks every step that depends, directly or not, on a failed step as skipped.
+
+        Args:
+            failed_task (Task): The failed step.
+        """
+        failed = {failed_task.name}
+        for task in self.tasks.values():
+            if task.status == 'pending' and failed.intersection(task.depends_on):
+                task.status = 'skipped'
+                failed.add(task.name)
+                logger.error(f"Skipping step '{task.name}' because step '{failed_task.name}' failed.")
+
+    def _finish(self, task, status):
+        """
+        Records the exit code of a step and returns the steps that became ready.
+
+        Args:
+            task (Task): The finished step.
+            status (int): The exit code of the step.
+
+        Returns:
+            list: The steps whose dependencies have all succeeded, in insertion order.
+        """
+        if status == 0:
+            task.status = 'done'
+        else:
+            task.status = 'failed'
+            self._skip_dependents(task)
+        return [
+            candidate for candidate in self.tasks.values()
+            if candidate.status == 'pending' and task.name in candidate.depends_on
+            and all(self.tasks[dependency].status == 'done' for dependency in candidate.depends_on)
+        ]
+
+    def run(self):
+        """
+        Executes the graph. With a single job the steps run one after the other in the calling
+        thread, in dependency order; otherwise ready steps are submitted to a thread pool.
+
+        Returns:
+            int: 0 if every step succeeded, 1 otherwise.
+        """
+        start = time.perf_counter()
+        ready = [task for task in self.tasks.values() if not task.depends_on]
+
+        if self.jobs == 1 or len(self.tasks) <= 1:
+            while ready:
+                task = ready.pop(0)
+                ready.extend(self._finish(task, self._execute(task)))
+        else:
+            with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='step') as executor:
+                running = {executor.submit(self._execute, task): task for task in ready}
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        task = running.pop(future)
+                        for next_task in self._finish(task, future.result()):
+                            running[executor.submit(self._execute, next_task)] = next_task
+
+        failed = [task.name for task in self.tasks.values() if task.status != 'done']
+        logger.info(f"Executed {len(self.tasks) - len(failed)} of {len(self.tasks)} steps with up to {self.jobs} parallel jobs in {time.perf_counter() - start:.2f} s.")
+        return 1 if failed else 0
@@ -0,0 +1,463 @@
+"""
+Module for keeping the named datasets of a DataSphere CLI session.
+
+This module defines the SessionStore class, which holds every dataset loaded in a session
+under a name (`load_data=iris:data/raw/iris.arff`, or a name derived from the file when none
+is given), so later commands select the dataset they work on with `dataset=<name>` instead
+of each load replacing the previous one. The store measures the deep memory footprint of
+every DataFrame (including the Python strings of object columns) and, when a memory budget
+is configured, spills the least recently used datasets to disk until the datasets in memory
+fit the budget. Spilled datasets are read back transparently the next time they are used.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+"""
+
+import os
+import atexit
+import threading
+from collections import OrderedDict
+from core.logging_config import logger
+
+# Location of the files of spilled datasets
+DEFAULT_SPILL_DIR = os.path.join('data', 'processed', 'session')
+
+# Extension of the files of spilled datasets
+SPILL_EXTENSION = '.pkl'
+
+
+def deep_memory_usage(data):
+    """
+    Returns the memory used by a dataset, including the objects referenced by its columns.
+
+    Args:
+        data (pd.DataFrame): The dataset.
+
+    Returns:
+        int: The memory usage in bytes.
+    """
+    if hasattr(data, 'memory_usage'):
+        usage = data.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    import sys
+    return sys.getsizeof(data)
+
+
+def format_size(size):
+    """
+    Formats a size in bytes as kilobytes or megabytes.
+
+    Args:
+        size (int): The size in bytes.
+
+    Returns:
+        str: The formatted size.
+    """
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class _Dataset:
+    """
+    A dataset of the session.
+
+    Attributes:
+        name (str): The name of the dataset.
+        data (pd.DataFrame): The data, or None if it is spilled to disk or streamed.
+        chunks (callable): A function returning an iterator over the chunks of a streamed dataset.
+        source (tuple): The key of the load that produced the dataset.
+        part (str): The sheet of the load the dataset comes from, if the load produced several datasets.
+        nbytes (int): The deep memory footprint of the data.
+        spill_path (str): The file holding the data while it is spilled to disk.
+        sequence (int): The order in which the dataset was stored in the session.
+    """
+
+    def __init__(self, name, data=None, chunks=None, source=None, part=None, sequence=0):
+        """
+        Initializes the dataset and measures the memory footprint of its data.
+        """
+        self.name = name
+        self.data = data
+        self.chunks = chunks
+        self.source = source
+        self.part = part
+        self.nbytes = deep_memory_usage(data) if data is not None else 0
+        self.spill_path = None
+        self.sequence = sequence
+
+
+class SessionStore:
+    """
+    Named datasets of a session with memory accounting and spilling to disk.
+
+    The datasets are kept in least recently used order. Streamed datasets (loaded with
+    `chunksize`) only hold the function that reads their chunks and use no memory.
+
+    Attributes:
+        memory_budget (int): The maximum memory of the datasets kept in memory, in bytes,
+            or None for no limit.
+        spill_dir (str): The directory where spilled datasets are written.
+        active (str): The name of the dataset used when no dataset is selected, i.e. the
+            last one loaded.
+
+    Methods:
+        put(name, data, chunks, source, part): Stores a dataset under a name.
+        activate(name): Makes a dataset the active dataset.
+        get(name): Returns the data of a dataset, reading it back if it was spilled.
+        get_chunks(name): Returns the chunk source of a streamed dataset.
+        get_source(name): Returns the key of the load that produced a dataset.
+        parts(name): Returns the datasets produced by the same load as a dataset.
+        find(source): Returns a load result rebuilt from the datasets of a previous load.
+        remove(name): Removes a dataset.
+        clear(): Removes every dataset.
+        names(): Returns the names of the datasets.
+        usage(): Returns the memory used by the datasets in memory and spilled.
+
+    Example:
+        >>> store = SessionStore(memory_budget=512 * 1024 * 1024)
+        >>> store.put('iris', iris_frame)
+        >>> store.put('titanic', titanic_frame)
+        >>> frame = store.get('iris')
+    """
+
+    def __init__(self, memory_budget=None, spill_dir=DEFAULT_SPILL_DIR):
+        """
+        Initializes the SessionStore.
+
+        Args:
+            memory_budget (int, optional): The maximum memory of the datasets kept in
+                memory, in bytes. Defaults to no limit.
+            spill_dir (str): The directory where spilled datasets are written.
+        """
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.active = None
+        self._datasets = OrderedDict()
+        self._spill_count = 0
+        self._sequence = 0
+        self._cleanup_registered = False
+        # Steps running in parallel threads may read and spill datasets at the same time
+        self._lock = threading.RLock()
+
+    def __contains__(self, name):
+        """
+        Returns whether a dataset with the given name exists.
+        """
+        return name in self._datasets
+
+    def __len__(self):
+        """
+        Returns the number of datasets.
+        """
+        return len(self._datasets)
+
+    def names(self):
+        """
+        Returns the names of the datasets, in load order of their last update.
+
+        Returns:
+            list: The dataset names.
+        """
+        return list(self._datasets)
+
+    def usage(self):
+        """
+        Returns the memory used by the datasets.
+
+        Returns:
+            tuple: The bytes of the datasets in memory and the bytes of the spilled datasets.
+        """
+        with self._lock:
+            # A DataFrame shared by several datasets (e.g. a reused load stored under another name) is counted once
+            in_memory = sum({id(dataset.data): dataset.nbytes for dataset in self._datasets.values() if dataset.data is not None}.values())
+            spilled = sum(dataset.nbytes for dataset in self._datasets.values() if dataset.data is None and dataset.spill_path is not None)
+        return in_memory, spilled
+
+    def put(self, name, data=None, chunks=None, source=None, part=None):
+        """
+        Stores a dataset under a name, replacing the dataset with that name, and makes it
+        the active dataset.
+
+        Args:
+            name (str): The name of the dataset.
+            data (pd.DataFrame, optional): The data of a materialized dataset.
+            chunks (callable, optional): The chunk source of a streamed dataset.
+            source (tuple, optional): The key of the load that produced the dataset.
+            part (str, optional): The sheet the dataset comes from, for loads that produce
+                several datasets.
+        """
+        with self._lock:
+            current = self._datasets.get(name)
+            if current is not None and data is not None and current.data is data:
+                # The same data is published again (e.g. a reused load): only refresh it
+                current.source, current.part = source, part
+            else:
+                if current is not None:
+                    logger.info(f"Replacing dataset '{name}'.")
+                    self._drop_spill(current)
+                self._sequence += 1
+                current = _Dataset(name, data, chunks, source, part, self._sequence)
+                self._datasets[name] = current
+                if data is not None:
+                    logger.info(f"Dataset '{name}' stored ({format_size(current.nbytes)}).")
+            self._datasets.move_to_end(name)
+            self.active = name
+            self._enforce_budget(keep=name)
+
+    def activate(self, name):
+        """
+        Makes a dataset the active dataset.
+
+        Args:
+            name (str): The name of the dataset.
+
+        Raises:
+            ValueError: If the dataset does not exist.
+        """
+        with self._lock:
+            self.active = self._resolve(name).name
+
+    def _resolve(self, name):
+        """
+        Returns a dataset by name, or the active dataset.
+
+        Args:
+            name (str): The name of the dataset, or None for the active dataset.
+
+        Returns:
+            _Dataset: The dataset.
+
+        Raises:
+            ValueError: If no dataset is loaded or the dataset does not exist.
+        """
+        if name is None:
+            if self.active is None:
+                raise ValueError("No dataset is loaded.")
+            name = self.active
+        dataset = self._datasets.get(name)
+        if dataset is None:
+            raise ValueError(f"Dataset '{name}' not found. Available datasets: {', '.join(self._datasets) or 'none'}.")
+        return dataset
+
+    def get(self, name=None):
+        """
+        Returns the data of a dataset, reading it back from disk if it was spilled.
+
+        Args:
+            name (str, optional): The name of the dataset. Defaults to the active dataset.
+
+        Returns:
+            pd.DataFrame: The data, or None for a streamed dataset.
+
+        Raises:
+            ValueError: If the dataset does not exist.
+        """
+        with self._lock:
+            dataset = self._resolve(name)
+            self._datasets.move_to_end(dataset.name)
+            if dataset.data is None and dataset.spill_path is not None:
+                self._unspill(dataset)
+                self._enforce_budget(keep=dataset.name)
+            return dataset.data
+
+    def get_chunks(self, name=None):
+        """
+        Returns the chunk source of a streamed dataset.
+
+        Args:
+            name (str, optional): The name of the dataset. Defaults to the active dataset.
+
+        Returns:
+            callable: A function returning an iterator over the chunks, or None if the
+            dataset is materialized.
+
+        Raises:
+            ValueError: If the dataset does not exist.
+        """
+        with self._lock:
+            return self._resolve(name).chunks
+
+    def get_source(self, name=None):
+        """
+        Returns the key of the load that produced a dataset.
+
+        Args:
+            name (str, optional): The name of the dataset. Defaults to the active dataset.
+
+        Returns:
+            tuple: The key of the load, or None if it is unknown.
+
+        Raises:
+            ValueError: If the dataset does not exist.
+        """
+        with self._lock:
+            return self._resolve(name).source
+
+    def parts(self, name=None):
+        """
+        Returns the datasets produced by the same load as a dataset, keyed by sheet.
+
+        Args:
+            name (str, optional): The name of the dataset. Defaults to the active dataset.
+
+        Returns:
+            dict: The data of every sheet of the load, or an empty dictionary if the load
+            produced a single dataset.
+        """
+        with self._lock:
+            dataset = self._resolve(name)
+            if dataset.part is None or dataset.source is None:
+                return {}
+            return {other.part: self.get(other.name) for other in self._from_source(dataset.source) if other.part is not None}
+
+    def find(self, source):
+        """
+        Rebuilds the result of a previous load from the datasets it produced.
+
+        Args:
+            source (tuple): The key of the load.
+
+        Returns:
+            dict: The load result ('data', 'chunks' and 'datasets'), or None if no dataset
+            of the session was produced by that load.
+        """
+        with self._lock:
+            datasets = self._from_source(source)
+            if not datasets:
+                return None
+            first = datasets[0]
+            if first.chunks is not None:
+                return {'data': None, 'chunks': first.chunks, 'datasets': {}}
+            if first.part is None:
+                return {'data': self.get(first.name), 'chunks': None, 'datasets': {}}
+            parts = {dataset.part: self.get(dataset.name) for dataset in datasets}
+            return {'data': next(iter(parts.values())), 'chunks': None, 'datasets': parts}
+
+    def _from_source(self, source):
+        """
+        Returns the datasets produced by a load, in the order they were stored.
+
+        Args:
+            source (tuple): The key of the load.
+
+        Returns:
+            list: The datasets.
+        """
+        return sorted((dataset for dataset in self._datasets.values() if dataset.source == source), key=lambda dataset: dataset.sequence)
+
+    def remove(self, name):
+        """
+        Removes a dataset and its spill file.
+
+        Args:
+            name (str): The name of the dataset.
+        """
+        with self._lock:
+            dataset = self._datasets.pop(name, None)
+            if dataset is None:
+                return
+            self._drop_spill(dataset)
+            if self.active == name:
+                self.active = next(reversed(self._datasets), None)
+            logger.info(f"Dataset '{name}' removed.")
+
+    def clear(self):
+        """
+        Removes every dataset and its spill file.
+        """
+        with self._lock:
+            for dataset in self._datasets.values():
+                self._drop_spill(dataset)
+            self._datasets.clear()
+            self.active = None
+
+    def _enforce_budget(self, keep=None):
+        """
+        Spills the least recently used datasets until the datasets in memory fit the budget.
+
+        A DataFrame shared by several datasets is only released (and its memory counted as
+        freed) when all of them are spilled, and datasets sharing the DataFrame of `keep`
+        are not spilled.
+
+        Args:
+            keep (str, optional): A dataset that must stay in memory (the one being used).
+        """
+        if self.memory_budget is None:
+            return
+        in_memory, _ = self.usage()
+        kept = self._datasets.get(keep)
+        kept_id = id(kept.data) if kept is not None and kept.data is not None else None
+        for dataset in list(self._datasets.values()):
+            if in_memory <= self.memory_budget:
+                break
+            if dataset.data is None or id(dataset.data) == kept_id:
+                continue
+            data_id = id(dataset.data)
+            if self._spill(dataset) and not any(id(other.data) == data_id for other in self._datasets.values() if other.data is not None):
+                in_memory -= dataset.nbytes
+        if in_memory > self.memory_budget:
+            logger.warning(f"The datasets in memory ({format_size(in_memory)}) exceed the memory budget ({format_size(self.memory_budget)}).")
+
+    def _spill(self, dataset):
+        """
+        Writes the data of a dataset to disk and releases it from memory.
+
+        The data is pickled, so any DataFrame (with its index, column names and data types)
+        is read back unchanged.
+
+        Args:
+            dataset (_Dataset): The dataset to spill.
+
+        Returns:
+            bool: True if the dataset was spilled, False if it could not be written.
+        """
+        if dataset.spill_path is None:
+            self._spill_count += 1
+            spill_path = os.path.join(self.spill_dir, f"{os.getpid()}-{self._spill_count}{SPILL_EXTENSION}")
+            try:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                dataset.data.to_pickle(spill_path)
+            except Exception as e:
+                logger.warning(f"Dataset '{dataset.name}' could not be spilled to '{spill_path}': {e}")
+                if os.path.exists(spill_path):
+                    os.remove(spill_path)
+                return False
+            dataset.spill_path = spill_path
+            if not self._cleanup_registered:
+                atexit.register(self.clear)
+                self._cleanup_registered = True
+        dataset.data = None
+        logger.info(f"Dataset '{dataset.name}' spilled to '{dataset.spill_path}' ({format_size(dataset.nbytes)}).")
+        return True
+
+    def _unspill(self, dataset):
+        """
+        Reads the data of a spilled dataset back into memory.
+
+        The spill file is kept, so the dataset can be released again without writing it.
+
+        Args:
+            dataset (_Dataset): The spilled dataset.
+        """
+        import pandas as pd
+
+        dataset.data = pd.read_pickle(dataset.spill_path)
+        logger.info(f"Dataset '{dataset.name}' read back from '{dataset.spill_path}'.")
+
+    def _drop_spill(self, dataset):
+        """
+        Removes the spill file of a dataset, if it has one.
+
+        Args:
+            dataset (_Dataset): The dataset.
+        """
+        if dataset.spill_path is None:
+            return
+        try:
+            os.remove(dataset.spill_path)
+        except OSError as e:
+            logger.warning(f"Error removing spill file '{dataset.spill_path}': {e}")
+        dataset.spill_path = None
@@ -26,6 +26,7 @@ class VisualizationPlugin(BasePlugin):
 
     Methods:
         __init__(): Initializes the VisualizationPlugin with base plugin settings.
+        visualize_chunks(chunks, class_column, class_value): Visualizes data delivered as a stream of chunks.
     """
     
     def __init__(self):
@@ -38,3 +39,27 @@ class VisualizationPlugin(BasePlugin):
         """
         super().__init__()
         # Additional initialization code for VisualizationPlugin can be added here
+
+    def visualize_chunks(self, chunks, class_column: str = None, class_value: str = None):
+        """
+        Visualizes data delivered as an iterator of DataFrame chunks.
+
+        The default implementation concatenates all chunks into a single DataFrame
+        and delegates to `visualize`, so every plugin works in streaming mode.
+        Chunk-aware plugins override this method and set `_supports_chunks` to True
+        to keep memory bounded by the chunk size.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+            class_column (str, optional): The column used for filtering by class.
+            class_value (str, optional): The value of the class to filter by.
+
+        Returns:
+            None
+        """
+        import pandas as pd
+        from .logging_config import logger
+
+        logger.warning(f"Plugin '{type(self).__name__}' is not chunk-aware. All chunks will be loaded into memory.")
+        dataframe = pd.concat(chunks, ignore_index=True)
+        return self.visualize(dataframe, class_column=class_column, class_value=class_value)
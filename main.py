@@ -10,18 +10,91 @@ Email: lbustio@gmail.com
 
 import sys
 import os
-from core.cli_parser import execute_commands, parse_arguments
+from core.cli_parser import execute_commands, parse_arguments, show_help
 from utils.file_utils import verify_folder_structure
 
+# Arguments that request help; they are served without the regular startup
+HELP_COMMANDS = ('help', '--help', '-h')
+
+# Modes that run the persistent daemon or forward the commands to it
+DAEMON_MODES = ('serve', 'client')
+
+def get_help_topics(arguments):
+    """
+    Returns the requested help topics if the command line only asks for help.
+
+    Args:
+        arguments (list): The command-line arguments, without the program name.
+
+    Returns:
+        list: The help topics (empty for the general help), or None if other commands were given.
+    """
+    tokens = ' '.join(arguments).split()
+    if not tokens:
+        return None
+    topics = []
+    for token in tokens:
+        name, _, value = token.partition('=')
+        if name.lower() not in HELP_COMMANDS:
+            return None
+        if value:
+            topics.append(value)
+    return topics
+
+def get_daemon_mode(arguments):
+    """
+    Returns the daemon mode requested on the command line, if any.
+
+    The first token selects the mode: `serve[=<socket>]` starts the daemon (the remaining
+    commands are executed once before it starts listening, e.g. to preload data) and
+    `client[=<socket>]` forwards the remaining commands to a running daemon.
+
+    Args:
+        arguments (list): The command-line arguments, without the program name.
+
+    Returns:
+        tuple: The mode, the socket path (None for the default one) and the remaining command
+        line, or None if no daemon mode was requested.
+    """
+    tokens = ' '.join(arguments).split()
+    if not tokens:
+        return None
+    name, _, value = tokens[0].partition('=')
+    if name.lower() not in DAEMON_MODES:
+        return None
+    return name.lower(), value or None, ' '.join(tokens[1:])
+
 def main():
     """
     Main function to parse command-line arguments and execute the corresponding actions.
     It exits with the code returned by `execute_commands`.
     If no command is provided, it defaults to loading data and visualizing it.
     """
+    # Fast path: help does not need the folder structure, the plugins or any data library
+    help_topics = get_help_topics(sys.argv[1:])
+    if help_topics is not None:
+        show_help(help_topics)
+        sys.exit(0)
+
+    # Thin client: forward the commands to the daemon without any other startup work
+    daemon_mode = get_daemon_mode(sys.argv[1:])
+    if daemon_mode is not None and daemon_mode[0] == 'client':
+        from core.daemon import send_commands, DEFAULT_SOCKET_PATH
+        sys.exit(send_commands(daemon_mode[2], daemon_mode[1] or DEFAULT_SOCKET_PATH))
+
     # Ensure the directory structure is in place before executing any commands
     verify_folder_structure()
 
+    if daemon_mode is not None:
+        # Daemon: keep the data and the plugins in memory and serve command lines
+        from core.daemon import DataSphereDaemon, DEFAULT_SOCKET_PATH
+        try:
+            exit_code = DataSphereDaemon(daemon_mode[1] or DEFAULT_SOCKET_PATH).serve(daemon_mode[2])
+        except Exception as e:
+            print(f"An error occurred: {e}", file=sys.stderr)
+            exit_code = 1
+        sys.exit(exit_code)
+
     # Check if any command-line arguments are provided
     if len(sys.argv) == 1:
         # Default action if no command is provided: load data and visualize it
@@ -0,0 +1,154 @@
+"""
+Plugin for computing approximate quantiles, distinct counts and top values of a dataset with mergeable sketches.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0.0
+Email: lbustio@gmail.com
+"""
+
+from functools import partial
+import pandas as pd
+from core.logging_config import logger
+from core.analysis_plugin import AnalysisPlugin
+from utils.parallel_utils import reduce_chunks
+from utils.sketches import DatasetSketch, DEFAULT_QUANTILE_ERROR, DEFAULT_DISTINCT_ERROR, DEFAULT_FREQUENCY_ERROR
+
+# Number of rows summarized at a time when the data is analyzed in memory
+DEFAULT_BLOCK_ROWS = 1000000
+
+
+def parse_quantiles(quantiles):
+    """
+    Parses the quantiles to report.
+
+    Args:
+        quantiles (Union[str, Iterable[float]]): The probabilities of the quantiles, as a list
+            or as a comma-separated string (e.g. '0.25,0.5,0.75').
+
+    Returns:
+        list: The probabilities.
+
+    Raises:
+        ValueError: If a probability is not between 0 and 1.
+    """
+    if isinstance(quantiles, str):
+        quantiles = [value for value in quantiles.split(',') if value.strip()]
+    probabilities = [float(value) for value in quantiles]
+    invalid = [probability for probability in probabilities if not 0 <= probability <= 1]
+    if invalid:
+        raise ValueError(f"Quantiles must be between 0 and 1, got {invalid}.")
+    return probabilities
+
+
+class approx_stats(AnalysisPlugin):
+    """
+    Plugin for summarizing every column of a large dataset with mergeable sketches.
+
+    Exact medians, percentiles and distinct counts need the whole column in memory (or a
+    sort of it). This plugin estimates them in one pass with bounded memory: quantiles with
+    KLL sketches, distinct counts with HyperLogLog and the most frequent values with the
+    Misra-Gries heavy hitters algorithm, each with a configurable error bound. Streamed
+    datasets (loaded with `chunksize`) are summarized chunk by chunk in a pool of worker
+    processes, and the partial sketches are merged. The results are a DataFrame with one row
+    per column, which can be written with `save`.
+
+    Attributes:
+        _description (str): A brief description of the plugin's functionality.
+        _version (str): The version of the plugin.
+        _author (str): The author of the plugin.
+        _date (str): The date when the plugin was created or last modified.
+        _config (dict): Configuration settings for the plugin, including the error bounds.
+
+    Methods:
+        analyze(dataframe: pd.DataFrame) -> pd.DataFrame:
+            Summarizes the columns of a DataFrame.
+        analyze_chunks(chunks) -> pd.DataFrame:
+            Summarizes the columns of a stream of DataFrame chunks.
+        sketch_chunks(chunks) -> DatasetSketch:
+            Returns the merged sketches of a stream of DataFrame chunks.
+    """
+
+    def __init__(self):
+        """
+        Initializes the approx_stats plugin with default configuration settings.
+        """
+        super().__init__()
+        self._description = "Plugin for computing approximate quantiles, distinct counts and top values with mergeable sketches."
+        self._version = "1.0.0"
+        self._author = "Lázaro Bustio Martínez"
+        self._date = "2026.10.17"
+        self._config = {
+            "quantiles": "0.25,0.5,0.75",                   # Probabilities of the reported quantiles
+            "quantile_error": DEFAULT_QUANTILE_ERROR,       # Rank error of the quantiles (fraction of the values)
+            "distinct_error": DEFAULT_DISTINCT_ERROR,       # Relative error of the distinct counts
+            "frequency_error": DEFAULT_FREQUENCY_ERROR,     # Error of the top value frequencies (fraction of the values)
+            "workers": None,                                # Worker processes summarizing the chunks (None uses all CPU cores)
+            "block_rows": DEFAULT_BLOCK_ROWS,               # Rows summarized at a time when the data is in memory
+        }
+        self._supports_chunks = True
+
+    def sketch_chunks(self, chunks) -> DatasetSketch:
+        """
+        Returns the merged sketches of a stream of chunks.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+
+        Returns:
+            DatasetSketch: The sketches of every column (empty if no chunk was received).
+        """
+        errors = {
+            'quantile_error': float(self._config["quantile_error"]),
+            'distinct_error': float(self._config["distinct_error"]),
+            'frequency_error': float(self._config["frequency_error"]),
+        }
+        sketch, num_chunks = reduce_chunks(chunks, partial(DatasetSketch.from_frame, **errors), self._config.get("workers"))
+        if sketch is None:
+            return DatasetSketch(**errors)
+        logger.info(f"Sketches computed for {len(sketch.columns)} columns over {sketch.rows} rows in {num_chunks} chunk(s) "
+                    f"(quantile error {errors['quantile_error']:g}, distinct error {errors['distinct_error']:g}, frequency error {errors['frequency_error']:g}).")
+        return sketch
+
+    def analyze(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Summarizes the columns of a DataFrame.
+
+        Large DataFrames are summarized in blocks of `block_rows` rows, in parallel.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to analyze.
+
+        Returns:
+            pd.DataFrame: The summary, with one row per column.
+
+        Raises:
+            ValueError: If the input is not a pandas DataFrame.
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            logger.error("Input is not a pandas DataFrame.")
+            raise ValueError("Input must be a pandas DataFrame.")
+
+        block_rows = int(self._config.get("block_rows") or DEFAULT_BLOCK_ROWS)
+        blocks = (dataframe.iloc[start:start + block_rows] for start in range(0, max(len(dataframe), 1), block_rows))
+        return self.analyze_chunks(blocks)
+
+    def analyze_chunks(self, chunks) -> pd.DataFrame:
+        """
+        Summarizes the columns of a stream of chunks.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+
+        Returns:
+            pd.DataFrame: The column name and data type, the number of values, the
+            approximate number of distinct values, the approximate most frequent value and
+            its frequency (non-numeric columns), and the mean, standard deviation, minimum,
+            approximate quantiles and maximum (numeric columns).
+        """
+        try:
+            quantiles = parse_quantiles(self._config["quantiles"])
+            return self.sketch_chunks(chunks).to_frame(quantiles)
+        except Exception as e:
+            logger.error(f"An error occurred while computing the sketches: {str(e)}")
+            raise
@@ -0,0 +1,108 @@
+"""
+Plugin for computing descriptive statistics of the numeric columns of a dataset in one pass.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0.0
+Email: lbustio@gmail.com
+"""
+
+import pandas as pd
+from core.logging_config import logger
+from core.analysis_plugin import AnalysisPlugin
+from utils.moments import MomentAccumulator
+from utils.parallel_utils import reduce_chunks
+
+# Number of rows summarized at a time when the data is analyzed in memory
+DEFAULT_BLOCK_ROWS = 1000000
+
+
+class descriptive_stats(AnalysisPlugin):
+    """
+    Plugin for computing the count, mean, variance, standard deviation, minimum, maximum and
+    skewness of every numeric column of a dataset.
+
+    The data is summarized chunk by chunk with mergeable moment accumulators, so streamed
+    datasets (loaded with `chunksize`) are analyzed in a single pass with memory bounded by
+    the chunk size. The chunks are summarized in a pool of worker processes and the partial
+    statistics are merged in chunk order. The results are a DataFrame with one row per
+    column, which can be written with `save`.
+
+    Attributes:
+        _description (str): A brief description of the plugin's functionality.
+        _version (str): The version of the plugin.
+        _author (str): The author of the plugin.
+        _date (str): The date when the plugin was created or last modified.
+        _config (dict): Configuration settings for the plugin, including the number of workers.
+
+    Methods:
+        analyze(dataframe: pd.DataFrame) -> pd.DataFrame:
+            Computes the descriptive statistics of a DataFrame.
+        analyze_chunks(chunks) -> pd.DataFrame:
+            Computes the descriptive statistics of a stream of DataFrame chunks.
+    """
+
+    def __init__(self):
+        """
+        Initializes the descriptive_stats plugin with default configuration settings.
+        """
+        super().__init__()
+        self._description = "Plugin for computing one-pass descriptive statistics of the numeric columns of a dataset."
+        self._version = "1.0.0"
+        self._author = "Lázaro Bustio Martínez"
+        self._date = "2026.10.17"
+        self._config = {
+            "workers": None,                    # Worker processes summarizing the chunks (None uses all CPU cores)
+            "block_rows": DEFAULT_BLOCK_ROWS,   # Rows summarized at a time when the data is in memory
+        }
+        self._supports_chunks = True
+
+    def analyze(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the descriptive statistics of the numeric columns of a DataFrame.
+
+        Large DataFrames are summarized in blocks of `block_rows` rows, so the temporary
+        arrays of the computation stay small, and the blocks are summarized in parallel.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to analyze.
+
+        Returns:
+            pd.DataFrame: The statistics, with one row per numeric column.
+
+        Raises:
+            ValueError: If the input is not a pandas DataFrame.
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            logger.error("Input is not a pandas DataFrame.")
+            raise ValueError("Input must be a pandas DataFrame.")
+
+        block_rows = int(self._config.get("block_rows") or DEFAULT_BLOCK_ROWS)
+        blocks = (dataframe.iloc[start:start + block_rows] for start in range(0, max(len(dataframe), 1), block_rows))
+        return self.analyze_chunks(blocks)
+
+    def analyze_chunks(self, chunks) -> pd.DataFrame:
+        """
+        Computes the descriptive statistics of the numeric columns of a stream of chunks.
+
+        The chunks after the first one are summarized in a process pool while the next
+        chunks are read, and the partial statistics are merged in chunk order.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+
+        Returns:
+            pd.DataFrame: The statistics, with one row per numeric column.
+        """
+        try:
+            accumulator, num_chunks = reduce_chunks(chunks, MomentAccumulator.from_frame, self._config.get("workers"))
+            if accumulator is None:
+                logger.warning("No data received. Nothing to analyze.")
+                return MomentAccumulator().to_frame()
+
+            logger.info(f"Descriptive statistics computed for {len(accumulator.columns)} numeric columns over {accumulator.rows} rows in {num_chunks} chunk(s).")
+            return accumulator.to_frame()
+
+        except Exception as e:
+            logger.error(f"An error occurred while computing the descriptive statistics: {str(e)}")
+            raise
@@ -7,25 +7,40 @@ Version: 1.0.0
 Email: lbustio@gmail.com
 """
 
+import os
 import pandas as pd
-from scipy.io import arff
+from typing import Iterator
 from core.logging_config import logger
-from core.data_io_plugin import DataIOPlugin
+from core.data_io_plugin import DataIOPlugin, DEFAULT_FILTER_CHUNKSIZE, DEFAULT_WRITE_CHUNKSIZE
+from utils.arff_parser import ArffReader, ArffWriter
+from utils.file_utils import open_data_file, replace_on_success
 
 class arff_loader(DataIOPlugin):
     """
     Plugin for loading ARFF files into a pandas DataFrame.
 
+    The files are parsed in a single pass by the native `ArffReader`, which builds typed
+    columns directly and decodes nominal attributes to pandas categoricals. Compressed files
+    ('.arff.gz', '.arff.bz2', '.arff.xz', '.arff.zst') are decompressed as they are parsed.
+    DataFrames are written back by the `ArffWriter`, which declares the attributes from
+    the column dtypes.
+
     Attributes:
         _description (str): A brief description of the plugin's functionality.
         _version (str): The version of the plugin.
         _author (str): The author of the plugin.
         _date (str): The date when the plugin was created or last modified.
-        _config (dict): Configuration settings for the plugin, which is empty in this case.
+        _config (dict): Configuration settings for the plugin, including the chunk size used in streaming mode.
 
     Methods:
         load(path: str) -> pd.DataFrame:
             Loads an ARFF file from the specified path and returns its content as a DataFrame.
+        load_chunks(path: str) -> Iterator[pd.DataFrame]:
+            Streams an ARFF file from the specified path as DataFrame chunks of `chunksize` rows.
+        save(data: pd.DataFrame, path: str):
+            Writes a DataFrame to an ARFF file in blocks of `write_chunksize` rows.
+        save_chunks(chunks: Iterator[pd.DataFrame], path: str):
+            Writes a stream of DataFrame chunks to a single ARFF file.
     """
     
     def __init__(self):
@@ -34,12 +49,19 @@ class arff_loader(DataIOPlugin):
         """
         super().__init__()
         self._description = "Plugin for loading ARFF files into a pandas DataFrame."
-        self._version = "1.0.0"
+        self._version = "1.1.0"
         self._author = "Lázaro Bustio Martínez"
         self._date = "2024.08.01"
         self._config = {
-            # ARFF files typically do not have specific configuration settings for this plugin
+            "encoding": "utf-8",        # Text encoding of the ARFF file
+            "chunksize": None,          # Number of rows per chunk in streaming mode (None disables streaming)
+            "optimize_dtypes": "safe",  # Post-load data type optimization: off, safe or aggressive
+            "columns": None,            # Attributes to load (None loads every attribute)
+            "where": None,              # Row predicate applied while parsing, as a pandas query expression
+            "relation": None,           # Relation name written by `save` (None uses the file name)
+            "write_chunksize": DEFAULT_WRITE_CHUNKSIZE,  # Number of rows formatted at a time when writing
         }
+        self._supports_chunks = True
 
     def load(self, path: str) -> pd.DataFrame:
         """
@@ -57,10 +79,15 @@ class arff_loader(DataIOPlugin):
             Exception: For any other exceptions that occur during the file loading process.
         """
         try:
-            # Load the ARFF file into a dictionary
-            data, meta = arff.loadarff(path)
-            # Convert the data to a pandas DataFrame
-            df = pd.DataFrame(data)
+            # Parse the ARFF file directly into typed columns
+            with open_data_file(path, 'rt', encoding=self._config["encoding"]) as stream:
+                reader = ArffReader(stream)
+                if self._config.get("where"):
+                    # Filter each parsed chunk so only matching rows are kept
+                    df = self.load_filtered(reader.iter_chunks(DEFAULT_FILTER_CHUNKSIZE, self.column_selector()))
+                else:
+                    df = self.apply_filters(reader.read(self.column_selector()))
+            df = self.optimize_dtypes(df)
             logger.info(f"ARFF file loaded successfully from '{path}'.")
             return df
         except FileNotFoundError as e:
@@ -72,3 +99,101 @@ class arff_loader(DataIOPlugin):
         except Exception as e:
             logger.error(f"An unexpected error occurred while loading ARFF file: {e}")
             raise
+
+    def load_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Stream an ARFF file from the specified path as consecutive DataFrame chunks.
+
+        Nominal attributes keep the categories declared in the header in every chunk, so
+        the chunks can be concatenated without losing their categorical type. If no chunk
+        size is configured, the whole file is loaded and yielded as a single chunk.
+
+        Args:
+            path (str): The path to the ARFF file.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the ARFF file.
+
+        Raises:
+            FileNotFoundError: If the ARFF file does not exist at the specified path.
+            ValueError: If there is an issue with reading the ARFF file.
+            Exception: For any other exceptions that occur during the file loading process.
+        """
+        chunksize = self._config.get("chunksize")
+        if not chunksize:
+            yield self.load(path)
+            return
+
+        try:
+            with open_data_file(path, 'rt', encoding=self._config["encoding"]) as stream:
+                num_chunks = 0
+                for chunk in ArffReader(stream).iter_chunks(int(chunksize), self.column_selector()):
+                    num_chunks += 1
+                    yield self.optimize_dtypes(self.apply_filters(chunk), categorize=False)
+            logger.info(f"ARFF file streamed successfully from '{path}' in {num_chunks} chunks of up to {chunksize} rows.")
+        except FileNotFoundError as e:
+            logger.error(f"ARFF file not found: '{path}'. The error message is: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Error with ARFF file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while streaming ARFF file: {e}")
+            raise
+
+    def save(self, data: pd.DataFrame, path: str):
+        """
+        Write a DataFrame to an ARFF file at the specified path.
+
+        The rows are formatted and written in blocks of `write_chunksize` rows, so only one
+        block of formatted text is held in memory at a time.
+
+        Args:
+            data (pd.DataFrame): The data to write.
+            path (str): The path to the ARFF file.
+
+        Raises:
+            ValueError: If the data cannot be represented in ARFF.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        write_chunksize = int(self._config.get("write_chunksize") or DEFAULT_WRITE_CHUNKSIZE)
+        self.save_chunks((data.iloc[start:start + write_chunksize] for start in range(0, max(len(data), 1), write_chunksize)), path)
+
+    def save_chunks(self, chunks: Iterator[pd.DataFrame], path: str):
+        """
+        Write a stream of DataFrame chunks to a single ARFF file at the specified path.
+
+        The attributes are declared from the first chunk. Nominal attributes are only
+        declared for categorical columns, so the categories of every chunk must be included
+        in those of the first one.
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The chunks to write.
+            path (str): The path to the ARFF file.
+
+        Raises:
+            ValueError: If the chunks cannot be represented in ARFF.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        relation = self._config.get("relation") or os.path.basename(path).split('.')[0]
+        try:
+            num_rows = 0
+            # The file is written aside and replaces the target after the last chunk, so a failed
+            # stream (or one that reads the target itself) leaves the target unchanged
+            with replace_on_success(path) as temporary_path, open_data_file(temporary_path, 'wt', encoding=self._config["encoding"]) as stream:
+                writer = ArffWriter(stream, relation)
+                for chunk in chunks:
+                    writer.write(chunk)
+                    num_rows += len(chunk)
+            logger.info(f"ARFF file saved successfully to '{path}' ({num_rows} rows).")
+        except ValueError as e:
+            logger.error(f"Error writing ARFF file: '{path}'. The error message is: {e}")
+            raise
+        except OSError as e:
+            logger.error(f"Error writing ARFF file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while saving the ARFF file: {e}")
+            raise
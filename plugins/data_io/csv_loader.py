@@ -8,13 +8,20 @@ Email: lbustio@gmail.com
 """
 
 import pandas as pd
+from typing import Iterator
 from core.logging_config import logger
-from core.data_io_plugin import DataIOPlugin
+from utils.file_utils import open_data_file, replace_on_success
+from utils.strings_utils import get_compression
+from core.data_io_plugin import DataIOPlugin, DEFAULT_FILTER_CHUNKSIZE, DEFAULT_WRITE_CHUNKSIZE
 
 class csv_loader(DataIOPlugin):
     """
     Plugin for loading CSV files into a pandas DataFrame.
 
+    Compressed files ('.csv.gz', '.csv.bz2', '.csv.xz', '.csv.zst') are decompressed as
+    they are parsed. The plugin also writes CSV files, compressing them as they are written
+    when the output path has a compression suffix.
+
     Attributes:
         _description (str): A brief description of the plugin's functionality.
         _version (str): The version of the plugin.
@@ -25,6 +32,12 @@ class csv_loader(DataIOPlugin):
     Methods:
         load(path: str) -> pd.DataFrame:
             Loads a CSV file from the specified path and returns its content as a DataFrame.
+        load_chunks(path: str) -> Iterator[pd.DataFrame]:
+            Streams a CSV file from the specified path as DataFrame chunks of `chunksize` rows.
+        save(data: pd.DataFrame, path: str):
+            Writes a DataFrame to a CSV file in blocks of `write_chunksize` rows.
+        save_chunks(chunks: Iterator[pd.DataFrame], path: str):
+            Writes a stream of DataFrame chunks to a single CSV file.
     """
     
     def __init__(self):
@@ -39,7 +52,13 @@ class csv_loader(DataIOPlugin):
         self._config = {
             "delimiter": ",",  # Default delimiter for CSV
             "header": True,    # Whether the CSV file has a header row
+            "chunksize": None, # Number of rows per chunk in streaming mode (None disables streaming)
+            "optimize_dtypes": "safe",  # Post-load data type optimization: off, safe or aggressive
+            "columns": None,   # Columns to load (None loads every column)
+            "where": None,     # Row predicate applied while parsing, as a pandas query expression
+            "write_chunksize": DEFAULT_WRITE_CHUNKSIZE,  # Number of rows formatted at a time when writing
         }
+        self._supports_chunks = True
 
     def load(self, path: str) -> pd.DataFrame:
         """
@@ -58,12 +77,29 @@ class csv_loader(DataIOPlugin):
             Exception: For any other exceptions that occur during the file loading process.
         """
         try:
-            # Load the CSV file into a DataFrame with specified configuration
-            data = pd.read_csv(
-                path,
-                delimiter=self._config["delimiter"],
-                header=0 if self._config["header"] else None
-            )
+            if self._config.get("where"):
+                # Parse the file in chunks and filter each one so only matching rows are kept
+                reader = pd.read_csv(
+                    path,
+                    delimiter=self._config["delimiter"],
+                    header=0 if self._config["header"] else None,
+                    usecols=self.column_selector(),
+                    compression=get_compression(path),
+                    chunksize=DEFAULT_FILTER_CHUNKSIZE
+                )
+                with reader:
+                    data = self.load_filtered(reader)
+            else:
+                # Load the CSV file into a DataFrame with specified configuration
+                data = pd.read_csv(
+                    path,
+                    delimiter=self._config["delimiter"],
+                    header=0 if self._config["header"] else None,
+                    usecols=self.column_selector(),
+                    compression=get_compression(path)
+                )
+                data = self.apply_filters(data)
+            data = self.optimize_dtypes(data)
             logger.info(f"CSV file loaded successfully from '{path}'.")
             return data
         except FileNotFoundError as e:
@@ -78,3 +114,114 @@ class csv_loader(DataIOPlugin):
         except Exception as e:
             logger.error(f"An unexpected error occurred while loading the CSV file: {e}")
             raise
+
+    def load_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file from the specified path as consecutive DataFrame chunks.
+
+        Only one chunk of `chunksize` rows is held in memory at a time, so files larger
+        than the available memory can be processed. If no chunk size is configured, the
+        whole file is loaded and yielded as a single chunk.
+
+        Args:
+            path (str): The path to the CSV file.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the CSV file.
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist at the specified path.
+            pd.errors.EmptyDataError: If the CSV file is empty and cannot be read.
+            pd.errors.ParserError: If there is an error in parsing the CSV file.
+            Exception: For any other exceptions that occur during the file loading process.
+        """
+        chunksize = self._config.get("chunksize")
+        if not chunksize:
+            yield self.load(path)
+            return
+
+        try:
+            # Open the CSV file as an iterator of DataFrames with the specified chunk size
+            reader = pd.read_csv(
+                path,
+                delimiter=self._config["delimiter"],
+                header=0 if self._config["header"] else None,
+                usecols=self.column_selector(),
+                compression=get_compression(path),
+                chunksize=int(chunksize)
+            )
+            with reader:
+                num_chunks = 0
+                for chunk in reader:
+                    num_chunks += 1
+                    yield self.optimize_dtypes(self.apply_filters(chunk), categorize=False)
+            logger.info(f"CSV file streamed successfully from '{path}' in {num_chunks} chunks of up to {chunksize} rows.")
+        except FileNotFoundError as e:
+            logger.error(f"CSV file not found: '{path}'. The error message is: {e}")
+            raise
+        except pd.errors.EmptyDataError as e:
+            logger.error(f"CSV file is empty: '{path}'. The error message is: {e}")
+            raise
+        except pd.errors.ParserError as e:
+            logger.error(f"Error parsing CSV file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while streaming the CSV file: {e}")
+            raise
+
+    def save(self, data: pd.DataFrame, path: str):
+        """
+        Write a DataFrame to a CSV file at the specified path.
+
+        The rows are formatted and written in blocks of `write_chunksize` rows through a
+        buffered (and, for compressed paths, compressing) stream, so the whole file is never
+        built as a single string in memory.
+
+        Args:
+            data (pd.DataFrame): The data to write.
+            path (str): The path to the CSV file.
+
+        Raises:
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        self.save_chunks([data], path)
+
+    def save_chunks(self, chunks: Iterator[pd.DataFrame], path: str):
+        """
+        Write a stream of DataFrame chunks to a single CSV file at the specified path.
+
+        The header is written with the first chunk and the following chunks are appended to
+        the same stream, so only one chunk is held in memory at a time.
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The chunks to write.
+            path (str): The path to the CSV file.
+
+        Raises:
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        try:
+            num_rows = 0
+            num_chunks = 0
+            # The file is written aside and replaces the target after the last chunk, so a failed
+            # stream (or one that reads the target itself) leaves the target unchanged
+            with replace_on_success(path) as temporary_path, open_data_file(temporary_path, 'wt') as stream:
+                for chunk in chunks:
+                    chunk.to_csv(
+                        stream,
+                        sep=self._config["delimiter"],
+                        header=bool(self._config["header"]) and num_chunks == 0,
+                        index=False,
+                        chunksize=self._config.get("write_chunksize") or DEFAULT_WRITE_CHUNKSIZE
+                    )
+                    num_rows += len(chunk)
+                    num_chunks += 1
+            logger.info(f"CSV file saved successfully to '{path}' ({num_rows} rows).")
+        except OSError as e:
+            logger.error(f"Error writing CSV file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while saving the CSV file: {e}")
+            raise
@@ -0,0 +1,247 @@
+"""
+Plugin for loading and saving Feather (Arrow IPC) files as pandas DataFrames.
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0.0
+Email: lbustio@gmail.com
+"""
+
+import io
+import pandas as pd
+from typing import Iterator
+from core.logging_config import logger
+from core.data_io_plugin import DataIOPlugin
+from utils.file_utils import open_data_file, replace_on_success
+from utils.strings_utils import get_compression
+
+
+def _stream_schema(schema):
+    """
+    Returns the schema of a Feather file written from a stream of chunks.
+
+    Chunks are optimized one by one, so the same column may be int8 in a chunk and int16 in
+    the next one, or categorical with other categories. The file schema is taken from the
+    first chunk with integers widened to 64 bits, floats to double precision and categorical
+    columns decoded to their values, so every later chunk can be cast to it. The types are
+    optimized again when the file is loaded.
+
+    Args:
+        schema (pyarrow.Schema): The schema of the first chunk.
+
+    Returns:
+        pyarrow.Schema: The schema of the file, without the pandas metadata of the first chunk.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in schema:
+        data_type = field.type
+        if pa.types.is_dictionary(data_type):
+            data_type = data_type.value_type
+        if pa.types.is_integer(data_type) and data_type != pa.uint64():
+            data_type = pa.int64()
+        elif pa.types.is_floating(data_type):
+            data_type = pa.float64()
+        fields.append(pa.field(field.name, data_type))
+    return pa.schema(fields)
+
+
+class feather_loader(DataIOPlugin):
+    """
+    Plugin for loading and saving Feather (Arrow IPC) files as pandas DataFrames.
+
+    Feather is a binary columnar format: columns are stored with their data types
+    (including categoricals) and are read back without parsing, so it is the fastest
+    format to save a processed dataset and load it again. Only the requested columns are
+    read from the file. The format compresses its column buffers internally (LZ4 or ZSTD).
+
+    Attributes:
+        _description (str): A brief description of the plugin's functionality.
+        _version (str): The version of the plugin.
+        _author (str): The author of the plugin.
+        _date (str): The date when the plugin was created or last modified.
+        _config (dict): Configuration settings for the plugin, including the compression codec.
+
+    Methods:
+        load(path: str) -> pd.DataFrame:
+            Loads a Feather file from the specified path and returns its content as a DataFrame.
+        save(data: pd.DataFrame, path: str):
+            Writes a DataFrame to a Feather file at the specified path.
+        save_chunks(chunks: Iterator[pd.DataFrame], path: str):
+            Writes a stream of DataFrame chunks to a Feather file, one record batch per chunk.
+    """
+
+    def __init__(self):
+        """
+        Initializes the feather_loader plugin with default configuration settings.
+        """
+        super().__init__()
+        self._description = "Plugin for loading and saving Feather (Arrow IPC) files as pandas DataFrames."
+        self._version = "1.0.0"
+        self._author = "Lázaro Bustio Martínez"
+        self._date = "2026.10.17"
+        self._config = {
+            "compression": "lz4",       # Internal compression of the column buffers: lz4, zstd or uncompressed
+            "chunksize": None,          # Number of rows per chunk in streaming mode (None disables streaming)
+            "optimize_dtypes": "safe",  # Post-load data type optimization: off, safe or aggressive
+            "columns": None,            # Columns to load (None loads every column)
+            "where": None,              # Row predicate applied after loading, as a pandas query expression
+        }
+
+    def load(self, path: str) -> pd.DataFrame:
+        """
+        Load a Feather file from the specified path into a pandas DataFrame.
+
+        Args:
+            path (str): The path to the Feather file.
+
+        Returns:
+            pd.DataFrame: The loaded data as a DataFrame.
+
+        Raises:
+            FileNotFoundError: If the Feather file does not exist at the specified path.
+            ImportError: If the `pyarrow` package is not installed.
+            Exception: For any other exceptions that occur during the file loading process.
+        """
+        try:
+            source = path
+            if get_compression(path):
+                # Feather files need random access, so externally compressed ones are decompressed in memory
+                with open_data_file(path, 'rb') as stream:
+                    source = io.BytesIO(stream.read())
+            selector = self.column_selector()
+            columns = None
+            if selector is not None:
+                # Read only the schema to resolve which columns have to be loaded
+                import pyarrow as pa
+                schema = pa.ipc.open_file(pa.memory_map(source) if isinstance(source, str) else source).schema
+                columns = [name for name in schema.names if selector(name)]
+                if not isinstance(source, str):
+                    source.seek(0)
+            data = pd.read_feather(source, columns=columns)
+            data = self.optimize_dtypes(self.apply_filters(data))
+            logger.info(f"Feather file loaded successfully from '{path}'.")
+            return data
+        except FileNotFoundError as e:
+            logger.error(f"Feather file not found: '{path}'. The error message is: {e}")
+            raise
+        except ImportError as e:
+            logger.error(f"Reading Feather files requires the 'pyarrow' package. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while loading the Feather file: {e}")
+            raise
+
+    def save(self, data: pd.DataFrame, path: str):
+        """
+        Write a DataFrame to a Feather file at the specified path.
+
+        Feather requires string column names and a default index, so other column names are
+        converted to strings and a non-default index is written as regular columns.
+
+        Args:
+            data (pd.DataFrame): The data to write.
+            path (str): The path to the Feather file.
+
+        Raises:
+            ImportError: If the `pyarrow` package is not installed.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        try:
+            data = self._prepare(data)
+            compression = self._config.get("compression") or "uncompressed"
+            # The file is written aside and replaces the target once complete, so a failed
+            # write leaves the target unchanged
+            with replace_on_success(path) as temporary_path:
+                if get_compression(path):
+                    buffer = io.BytesIO()
+                    data.to_feather(buffer, compression=compression)
+                    with open_data_file(temporary_path, 'wb') as stream:
+                        stream.write(buffer.getvalue())
+                else:
+                    data.to_feather(temporary_path, compression=compression)
+            logger.info(f"Feather file saved successfully to '{path}' ({len(data)} rows).")
+        except ImportError as e:
+            logger.error(f"Writing Feather files requires the 'pyarrow' package. The error message is: {e}")
+            raise
+        except OSError as e:
+            logger.error(f"Error writing Feather file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while saving the Feather file: {e}")
+            raise
+
+    def save_chunks(self, chunks: Iterator[pd.DataFrame], path: str):
+        """
+        Write a stream of DataFrame chunks to a single Feather file at the specified path.
+
+        Every chunk is written as a record batch of the Arrow IPC file as soon as it is read,
+        so only one chunk is held in memory at a time. The column types of the file are
+        widened from those of the first chunk (see `_stream_schema`).
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The chunks to write.
+            path (str): The path to the Feather file.
+
+        Raises:
+            ImportError: If the `pyarrow` package is not installed.
+            ValueError: If there are no chunks or a chunk does not fit the columns of the first one.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        try:
+            import pyarrow as pa
+
+            compression = self._config.get("compression") or "uncompressed"
+            options = pa.ipc.IpcWriteOptions(compression=None if compression == "uncompressed" else compression)
+            num_rows = 0
+            # The file is written aside and replaces the target after the last chunk, so a failed
+            # stream (or one that reads the target itself) leaves the target unchanged
+            with replace_on_success(path) as temporary_path, open_data_file(temporary_path, 'wb') as stream:
+                writer = None
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(self._prepare(chunk), preserve_index=False)
+                    if writer is None:
+                        schema = _stream_schema(table.schema)
+                        writer = pa.ipc.new_file(stream, schema, options=options)
+                    try:
+                        table = table.cast(schema)
+                    except (ValueError, pa.ArrowInvalid) as e:
+                        raise ValueError(f"Chunk starting at row {num_rows} does not fit the columns of the first chunk: {e}") from e
+                    writer.write_table(table)
+                    num_rows += len(chunk)
+                if writer is None:
+                    raise ValueError("There are no chunks to write.")
+                writer.close()
+            logger.info(f"Feather file saved successfully to '{path}' ({num_rows} rows).")
+        except ImportError as e:
+            logger.error(f"Writing Feather files requires the 'pyarrow' package. The error message is: {e}")
+            raise
+        except OSError as e:
+            logger.error(f"Error writing Feather file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while saving the Feather file: {e}")
+            raise
+
+    @staticmethod
+    def _prepare(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Adapts a DataFrame to the Feather format.
+
+        Feather requires string column names and a default index, so other column names are
+        converted to strings and a non-default index is written as regular columns.
+
+        Args:
+            data (pd.DataFrame): The data to write.
+
+        Returns:
+            pd.DataFrame: The data with string column names and a default index.
+        """
+        if not isinstance(data.index, pd.RangeIndex) or data.index.start != 0 or data.index.step != 1:
+            data = data.reset_index(drop=isinstance(data.index, pd.RangeIndex))
+        if not all(isinstance(column, str) for column in data.columns):
+            data = data.rename(columns=str)
+        return data
@@ -7,14 +7,29 @@ Version: 1.0.0
 Email: lbustio@gmail.com
 """
 
+import io
+import os
 import pandas as pd
+from typing import Iterator, Union
+from concurrent.futures import ProcessPoolExecutor
 from core.logging_config import logger
-from core.data_io_plugin import DataIOPlugin
+from core.data_io_plugin import DataIOPlugin, DEFAULT_WRITE_CHUNKSIZE
+from utils.file_utils import open_data_file, replace_on_success
+from utils.parallel_utils import process_pool_context
+from utils.strings_utils import get_compression
+from utils.xlsx_reader import iter_sheet_chunks, read_sheet, resolve_sheet_names
 
 class xlsx_loader(DataIOPlugin):
     """
     Plugin for loading XLSX files into a pandas DataFrame.
 
+    By default the sheets are read with a streaming engine that iterates the rows in the
+    read-only mode of openpyxl and builds the columns incrementally. Several sheets can be
+    selected with `sheet_name='*'` or a comma-separated list; they are read concurrently in
+    a process pool and returned as a dictionary of DataFrames keyed by sheet name. DataFrames
+    are written with the write-only mode of openpyxl, which streams the rows to the workbook
+    instead of building a cell object for each value.
+
     Attributes:
         _description (str): A brief description of the plugin's functionality.
         _version (str): The version of the plugin.
@@ -23,8 +38,15 @@ class xlsx_loader(DataIOPlugin):
         _config (dict): Configuration settings for the plugin, including default sheet and header options.
 
     Methods:
-        load(path: str) -> pd.DataFrame: 
-            Loads an XLSX file from the specified path and returns its content as a DataFrame.
+        load(path: str) -> Union[pd.DataFrame, dict]: 
+            Loads an XLSX file from the specified path and returns its content as a DataFrame,
+            or as a dictionary of DataFrames when several sheets are selected.
+        load_chunks(path: str) -> Iterator[pd.DataFrame]:
+            Streams a sheet of an XLSX file from the specified path as DataFrame chunks of `chunksize` rows.
+        save(data: Union[pd.DataFrame, dict], path: str):
+            Writes a DataFrame, or a dictionary of DataFrames (one per sheet), to an XLSX file.
+        save_chunks(chunks: Iterator[pd.DataFrame], path: str):
+            Writes a stream of DataFrame chunks to a single sheet of an XLSX file.
     """
     
     def __init__(self):
@@ -33,15 +55,23 @@ class xlsx_loader(DataIOPlugin):
         """
         super().__init__()
         self._description = "Plugin for loading XLSX files into a pandas DataFrame."
-        self._version = "1.0.0"
+        self._version = "1.1.0"
         self._author = "Lázaro Bustio Martínez"
         self._date = "2024.08.01"
         self._config = {
-            "sheet_name": 0,  # Default to loading the first sheet
+            "sheet_name": 0,  # Sheet index or name, '*' for all sheets or a comma-separated list of sheets
             "header": True,   # Whether the XLSX file has a header row
+            "engine": "streaming",  # Reading engine: 'streaming' (read-only row iterator) or 'pandas'
+            "workers": None,  # Maximum number of processes used to read several sheets (None uses all cores)
+            "chunksize": None,  # Number of rows per chunk in streaming mode (None disables streaming)
+            "optimize_dtypes": "safe",  # Post-load data type optimization: off, safe or aggressive
+            "columns": None,  # Columns to load (None loads every column)
+            "where": None,    # Row predicate applied while parsing, as a pandas query expression
+            "write_chunksize": DEFAULT_WRITE_CHUNKSIZE,  # Number of rows converted at a time when writing
         }
+        self._supports_chunks = True
 
-    def load(self, path: str) -> pd.DataFrame:
+    def load(self, path: str) -> Union[pd.DataFrame, dict]:
         """
         Load an XLSX file from the specified path into a pandas DataFrame.
 
@@ -49,7 +79,8 @@ class xlsx_loader(DataIOPlugin):
             path (str): The path to the XLSX file.
 
         Returns:
-            pd.DataFrame: The loaded data as a DataFrame.
+            Union[pd.DataFrame, dict]: The loaded data as a DataFrame, or a dictionary of
+            DataFrames keyed by sheet name when several sheets are selected.
         
         Raises:
             FileNotFoundError: If the XLSX file does not exist at the specified path.
@@ -58,15 +89,47 @@ class xlsx_loader(DataIOPlugin):
             Exception: For any other exceptions that occur during the file loading process.
         """
         try:
-            # Load the XLSX file into a DataFrame with specified configuration
-            data = pd.read_excel(
-                path, 
-                sheet_name=self._config["sheet_name"], 
-                header=0 if self._config["header"] else None,
-                index_col=None  # Do not use any column as the index
-            )
-            logger.info(f"XLSX file loaded successfully from '{path}'.")
-            return data
+            if self._config.get("engine", "streaming") == "pandas":
+                # Load the XLSX file into a DataFrame with the default pandas engine
+                content = path
+                if get_compression(path):
+                    # Workbooks need random access, so compressed ones are decompressed in memory
+                    with open_data_file(path, 'rb') as stream:
+                        content = io.BytesIO(stream.read())
+                data = pd.read_excel(
+                    content, 
+                    sheet_name=self._config["sheet_name"], 
+                    header=0 if self._config["header"] else None,
+                    index_col=None,  # Do not use any column as the index
+                    usecols=self.column_selector()
+                )
+                data = self.optimize_dtypes(self.apply_filters(data))
+                logger.info(f"XLSX file loaded successfully from '{path}'.")
+                return data
+
+            sheet_names = resolve_sheet_names(path, self._config["sheet_name"])
+            if len(sheet_names) == 1:
+                data = read_sheet(path, sheet_names[0], self._config["header"], self._config.get("columns"), self._config.get("where"))
+                data = self.optimize_dtypes(data)
+                logger.info(f"XLSX file loaded successfully from '{path}' (sheet '{sheet_names[0]}').")
+                return data
+
+            # Read the selected sheets concurrently, one worker process per sheet
+            workers = min(len(sheet_names), self._config.get("workers") or os.cpu_count() or 1)
+            logger.info(f"Loading {len(sheet_names)} sheets from '{path}' using {workers} worker processes.")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context()) as executor:
+                num_sheets = len(sheet_names)
+                frames = executor.map(
+                    read_sheet,
+                    [path] * num_sheets,
+                    sheet_names,
+                    [self._config["header"]] * num_sheets,
+                    [self._config.get("columns")] * num_sheets,
+                    [self._config.get("where")] * num_sheets
+                )
+                datasets = {name: self.optimize_dtypes(frame) for name, frame in zip(sheet_names, frames)}
+            logger.info(f"XLSX file loaded successfully from '{path}' (sheets: {', '.join(sheet_names)}).")
+            return datasets
         except FileNotFoundError as e:
             logger.error(f"XLSX file not found: '{path}'. The error message is: {e}")
             raise
@@ -79,3 +142,189 @@ class xlsx_loader(DataIOPlugin):
         except Exception as e:
             logger.error(f"An unexpected error occurred while loading the XLSX file: {e}")
             raise
+
+    def load_chunks(self, path: str) -> Iterator[pd.DataFrame]:
+        """
+        Stream a sheet of an XLSX file from the specified path as consecutive DataFrame chunks.
+
+        The rows are read with the streaming engine, so only one chunk of `chunksize` rows is
+        held in memory at a time. Streaming requires a single selected sheet. If no chunk size
+        is configured, the sheet is loaded and yielded as a single chunk.
+
+        Args:
+            path (str): The path to the XLSX file.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the sheet.
+
+        Raises:
+            FileNotFoundError: If the XLSX file does not exist at the specified path.
+            ValueError: If the sheet selection is invalid or selects several sheets.
+            Exception: For any other exceptions that occur during the file loading process.
+        """
+        chunksize = self._config.get("chunksize")
+        if not chunksize:
+            yield self.load(path)
+            return
+
+        try:
+            sheet_names = resolve_sheet_names(path, self._config["sheet_name"])
+            if len(sheet_names) != 1:
+                raise ValueError("Streaming an XLSX file requires a single sheet.")
+            num_chunks = 0
+            for chunk in iter_sheet_chunks(path, sheet_names[0], self._config["header"], int(chunksize), self.column_selector()):
+                num_chunks += 1
+                yield self.optimize_dtypes(self.apply_filters(chunk), categorize=False)
+            logger.info(f"XLSX file streamed successfully from '{path}' in {num_chunks} chunks of up to {chunksize} rows.")
+        except FileNotFoundError as e:
+            logger.error(f"XLSX file not found: '{path}'. The error message is: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Error with sheet selection in XLSX file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while streaming the XLSX file: {e}")
+            raise
+
+    def _output_sheet_name(self) -> str:
+        """
+        Returns the name of the sheet written when a single DataFrame is saved.
+
+        Returns:
+            str: The configured sheet name if it names a single sheet, 'Sheet1' otherwise.
+        """
+        sheet_name = self._config.get("sheet_name")
+        if isinstance(sheet_name, str) and sheet_name.strip() not in ('', '*') and ',' not in sheet_name and not sheet_name.isdigit():
+            return sheet_name.strip()
+        return "Sheet1"
+
+    def _append_rows(self, worksheet, chunk: pd.DataFrame, num_rows: int) -> int:
+        """
+        Appends the rows of a DataFrame to a write-only worksheet.
+
+        Args:
+            worksheet (openpyxl.worksheet._write_only.WriteOnlyWorksheet): The worksheet.
+            chunk (pd.DataFrame): The rows to append.
+            num_rows (int): The number of rows already written to the worksheet.
+
+        Returns:
+            int: The number of rows written to the worksheet after the chunk.
+
+        Raises:
+            ValueError: If the sheet would exceed the maximum number of rows of an XLSX sheet.
+        """
+        if num_rows + len(chunk) > 1048575:
+            raise ValueError("The data exceeds the maximum number of rows of an XLSX sheet (1048576).")
+        # openpyxl only accepts Python scalars, so missing values become empty cells
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            worksheet.append(row)
+        return num_rows + len(chunk)
+
+    def _write_workbook(self, sheets, path: str):
+        """
+        Writes the sheets of a write-only workbook to an XLSX file.
+
+        Args:
+            sheets (iterable): (sheet name, iterable of DataFrame chunks) tuples.
+            path (str): The path to the XLSX file.
+
+        Returns:
+            int: The total number of rows written.
+        """
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        total_rows = 0
+        for sheet_name, chunks in sheets:
+            worksheet = workbook.create_sheet(title=str(sheet_name)[:31])
+            num_rows = 0
+            for index, chunk in enumerate(chunks):
+                if index == 0 and self._config["header"]:
+                    worksheet.append([str(column) for column in chunk.columns])
+                num_rows = self._append_rows(worksheet, chunk, num_rows)
+            total_rows += num_rows
+
+        if get_compression(path):
+            # Workbooks are ZIP archives written with random access, so they are built in memory before compressing
+            buffer = io.BytesIO()
+            workbook.save(buffer)
+            with open_data_file(path, 'wb') as stream:
+                stream.write(buffer.getvalue())
+        else:
+            workbook.save(path)
+        return total_rows
+
+    @staticmethod
+    def _blocks(frame: pd.DataFrame, size: int) -> Iterator[pd.DataFrame]:
+        """
+        Yields the rows of a DataFrame in blocks of a given size.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            size (int): The number of rows of each block.
+
+        Returns:
+            Iterator[pd.DataFrame]: The blocks. An empty DataFrame yields one empty block.
+        """
+        for start in range(0, max(len(frame), 1), size):
+            yield frame.iloc[start:start + size]
+
+    def save(self, data: Union[pd.DataFrame, dict], path: str):
+        """
+        Write a DataFrame to an XLSX file at the specified path.
+
+        A dictionary of DataFrames is written as one sheet per entry, keyed by sheet name.
+        The rows are converted in blocks of `write_chunksize` rows.
+
+        Args:
+            data (Union[pd.DataFrame, dict]): The data to write.
+            path (str): The path to the XLSX file.
+
+        Raises:
+            ValueError: If a sheet exceeds the maximum number of rows of an XLSX sheet.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        write_chunksize = int(self._config.get("write_chunksize") or DEFAULT_WRITE_CHUNKSIZE)
+        datasets = data if isinstance(data, dict) else {self._output_sheet_name(): data}
+        sheets = [(name, self._blocks(frame, write_chunksize)) for name, frame in datasets.items()]
+        self._save_sheets(sheets, path)
+
+    def save_chunks(self, chunks: Iterator[pd.DataFrame], path: str):
+        """
+        Write a stream of DataFrame chunks to a single sheet of an XLSX file at the specified path.
+
+        Args:
+            chunks (Iterator[pd.DataFrame]): The chunks to write.
+            path (str): The path to the XLSX file.
+
+        Raises:
+            ValueError: If the sheet exceeds the maximum number of rows of an XLSX sheet.
+            OSError: If the file cannot be written.
+            Exception: For any other exceptions that occur during the writing process.
+        """
+        self._save_sheets([(self._output_sheet_name(), chunks)], path)
+
+    def _save_sheets(self, sheets, path: str):
+        """
+        Writes the sheets to an XLSX file, logging the outcome.
+
+        Args:
+            sheets (list): (sheet name, iterable of DataFrame chunks) tuples.
+            path (str): The path to the XLSX file.
+        """
+        try:
+            # The workbook is written aside and replaces the target only once it is complete
+            with replace_on_success(path) as temporary_path:
+                num_rows = self._write_workbook(sheets, temporary_path)
+            logger.info(f"XLSX file saved successfully to '{path}' ({num_rows} rows in {len(sheets)} sheets).")
+        except ValueError as e:
+            logger.error(f"Error writing XLSX file: '{path}'. The error message is: {e}")
+            raise
+        except OSError as e:
+            logger.error(f"Error writing XLSX file: '{path}'. The error message is: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"An unexpected error occurred while saving the XLSX file: {e}")
+            raise
@@ -1,8 +1,17 @@
+import atexit
+import threading
+import numpy as np
 import pandas as pd
-from dash import Dash, dcc, html, Input, Output
-import plotly.express as px
+from core.logging_config import logger
 from core.visualization_plugin import VisualizationPlugin
-import threading
+from utils.correlation import correlation_cache
+from utils.class_index import resolve_class_column, filter_by_class
+from utils.downsampling import lttb, thin_points, in_range, DEFAULT_CELL_PIXELS
+from utils.figure_cache import FigureCache, dataset_fingerprint, DEFAULT_MAX_MB
+from utils.figure_encoding import encode_typed_arrays
+from utils.chart_aggregation import group_codes, coarsen, limit_categories, split_groups, histogram, box_statistics, group_sums, DEFAULT_MAX_OUTLIERS, DEFAULT_MAX_GROUPS
+from utils.shared_frame import SharedFrame
+from utils.wsgi_server import ThreadedServer, PreforkServer, DEFAULT_HOST, DEFAULT_PORT
 
 class interactive_graph_viewer(VisualizationPlugin):
     """
@@ -10,10 +19,22 @@ class interactive_graph_viewer(VisualizationPlugin):
 
     Attributes:
         _chart_types (list): List of supported chart types for visualization.
+        _config (dict): Configuration settings for the plugin, including the correlation method of the heatmap
+            and the downsampling of scatter and line charts.
+        _figure_cache (FigureCache): The figures already built, reused when the user goes back to a chart.
+        _server (ThreadedServer or PreforkServer): The running Dash server, or None.
+        _shared (SharedFrame): The dataset shared with the worker processes of the production server, or None.
+        _server_stop_event (threading.Event): Set when the server stops.
 
     Methods:
         visualize(dataframe: pd.DataFrame, class_column: str = None, class_value: str = None): 
             Displays interactive plots for the DataFrame.
+        stop_server(): Stops the running Dash server.
+        _build_app(dataframe, class_column, class_value): Creates the Dash app of the DataFrame.
+        _downsample(dataframe, chart_type, x_axis, y_axis, color_column, x_range, y_range):
+            Reduces the rows of a scatter or line chart to the points the viewport can show.
+        _aggregated_figure(dataframe, chart_type, x_axis, y_axis, color_column):
+            Builds a histogram, box or bar chart from aggregates computed on the server.
     
     Example Usage:
         viewer = InteractiveGraphViewer()
@@ -30,27 +51,342 @@ class interactive_graph_viewer(VisualizationPlugin):
         self._author = "Lázaro Bustio Martínez"
         self._date = "2024.08.01"
         self._chart_types = ["scatter", "line", "bar", "histogram", "box", "heatmap"]
+        self._config = {
+            "correlation": "pearson",   # Correlation method of the heatmap ('pearson' or 'spearman')
+            "downsample": True,         # Downsample scatter and line charts to the resolution of the viewport
+            "max_points": 20000,        # Maximum number of points per trace of scatter and line charts
+            "viewport_width": 1600,     # Width of the plot area, in pixels, used to size the downsampling
+            "viewport_height": 900,     # Height of the plot area, in pixels, used to size the downsampling
+            "figure_cache_mb": DEFAULT_MAX_MB,  # Maximum size of the cached figures, in MB
+            "aggregate": True,          # Compute histogram, box and bar charts on the server instead of sending every row
+            "histogram_bins": "auto",   # Number of bins of histograms, or a NumPy binning rule
+            "max_outliers": DEFAULT_MAX_OUTLIERS,  # Maximum number of outliers drawn per box
+            "max_groups": DEFAULT_MAX_GROUPS,      # Maximum number of x values of box and bar charts; more are binned
+            "webgl_threshold": 5000,    # Number of plotted points from which scatter and line charts are drawn with WebGL
+            "binary_arrays": True,      # Send the numeric arrays of the figures as base64 typed arrays instead of JSON lists
+            "server": "development",    # 'development' (one threaded server with the Dash dev tools) or 'production' (worker processes)
+            "host": DEFAULT_HOST,       # Address the Dash server listens on
+            "port": DEFAULT_PORT,       # Port the Dash server listens on (0 for any free port)
+            "workers": None,            # Worker processes of the production server (None uses all CPU cores)
+        }
+        self._figure_cache = FigureCache()
+        self._server = None
+        self._shared = None
+        self._server_stop_event = threading.Event()
+
+    @property
+    def url(self):
+        """
+        The URL of the running Dash server, or None if no server is running.
+        """
+        return self._server.url if self._server is not None else None
+
+    def _enabled(self, option: str) -> bool:
+        """
+        Returns whether a boolean option is enabled.
+
+        Args:
+            option (str): The name of the option.
+
+        Returns:
+            bool: True if the option is set to a true value.
+        """
+        return str(self._config.get(option)).lower() in ('true', '1', 'yes', 'on')
+
+    @staticmethod
+    def _viewport(relayout_data):
+        """
+        Returns the visible ranges of the axes from a Plotly relayout event.
+
+        Args:
+            relayout_data (dict): The relayout event, e.g. {'xaxis.range[0]': 1, 'xaxis.range[1]': 5}.
+
+        Returns:
+            tuple: The x and y ranges (None for an axis showing all the data), or None if the
+                event does not change the axes (e.g. a resize).
+        """
+        if not relayout_data:
+            return None
+        ranges = {}
+        for axis in ('xaxis', 'yaxis'):
+            if f'{axis}.range[0]' in relayout_data and f'{axis}.range[1]' in relayout_data:
+                ranges[axis] = (float(relayout_data[f'{axis}.range[0]']), float(relayout_data[f'{axis}.range[1]']))
+            elif f'{axis}.range' in relayout_data:
+                ranges[axis] = tuple(float(value) for value in relayout_data[f'{axis}.range'])
+            elif f'{axis}.autorange' in relayout_data:
+                ranges[axis] = None
+        if not ranges:
+            return None
+        return ranges.get('xaxis'), ranges.get('yaxis')
+
+    def _downsample(self, dataframe: pd.DataFrame, chart_type: str, x_axis: str, y_axis: str, color_column: str = None, x_range: tuple = None, y_range: tuple = None) -> pd.DataFrame:
+        """
+        Reduces the rows of a scatter or line chart to the points the viewport can show.
+
+        Only the rows inside the visible ranges are considered. Every trace (one per value of
+        a categorical color column) is reduced to at most `max_points` points: lines with
+        LTTB, at two points per horizontal pixel, and scatters by keeping one point per cell
+        of a grid of a few pixels plus a sample of the remaining points.
+
+        Args:
+            dataframe (pd.DataFrame): The data of the chart.
+            chart_type (str): 'scatter' or 'line'.
+            x_axis (str): The column of the x axis.
+            y_axis (str): The column of the y axis.
+            color_column (str, optional): The column that splits the rows into traces.
+            x_range (tuple, optional): The visible range of the x axis.
+            y_range (tuple, optional): The visible range of the y axis.
+
+        Returns:
+            pd.DataFrame: The rows to plot, with the columns used by the chart.
+        """
+        columns = list(dict.fromkeys(column for column in (x_axis, y_axis, color_column) if column))
+        max_points = int(self._config["max_points"])
+        if not self._enabled("downsample") or len(dataframe) <= max_points:
+            return dataframe[columns]
+
+        x = dataframe[x_axis].to_numpy(dtype=np.float64, na_value=np.nan)
+        y = dataframe[y_axis].to_numpy(dtype=np.float64, na_value=np.nan)
+        visible = ~np.isnan(x) & ~np.isnan(y)
+        if chart_type == "line":
+            # The points just outside the x range are kept so the line reaches the edges of the plot
+            visible &= in_range(x, x_range, margin=True)
+        else:
+            visible &= in_range(x, x_range) & in_range(y, y_range)
+
+        # A numeric color column is a color scale, drawn as a single trace
+        if color_column and not pd.api.types.is_numeric_dtype(dataframe[color_column]):
+            codes = pd.factorize(dataframe[color_column])[0]
+            traces = [np.flatnonzero(visible & (codes == code)) for code in range(codes.max() + 1)]
+        else:
+            traces = [np.flatnonzero(visible)]
+
+        width, height = int(self._config["viewport_width"]), int(self._config["viewport_height"])
+        selected = []
+        for positions in traces:
+            if chart_type == "line":
+                keep = lttb(x[positions], y[positions], min(max_points, 2 * width))
+            else:
+                grid = (max(1, width // DEFAULT_CELL_PIXELS), max(1, height // DEFAULT_CELL_PIXELS))
+                keep = thin_points(x[positions], y[positions], max_points, grid, x_range, y_range)
+            selected.append(positions[keep])
+        selected = np.sort(np.concatenate(selected)) if selected else np.array([], dtype=np.intp)
+        logger.info(f"{chart_type.capitalize()} chart downsampled from {len(dataframe)} to {len(selected)} points.")
+        return dataframe[columns].take(selected)
+
+    def _aggregated_figure(self, dataframe: pd.DataFrame, chart_type: str, x_axis: str, y_axis: str, color_column: str = None):
+        """
+        Builds a histogram, box or bar chart from aggregates computed on the server, so the
+        figure holds one value per bin, box or bar instead of every row.
+
+        The rows are grouped as Plotly Express would group them: histograms by color, boxes
+        by x value and color, and bars by x value and color (stacked bars add the y values
+        of the rows). A numeric x column with more than `max_groups` distinct values is
+        binned into `max_groups` ranges, drawn at their centers.
+
+        Args:
+            dataframe (pd.DataFrame): The data of the chart.
+            chart_type (str): 'histogram', 'box' or 'bar'.
+            x_axis (str): The column of the x axis.
+            y_axis (str): The column of the y axis (not used by histograms).
+            color_column (str, optional): The column that splits the rows into traces.
+
+        Returns:
+            plotly.graph_objects.Figure: The figure.
+        """
+        # Plotly is imported here so that loading the plugin does not pay for it
+        import plotly.express as px
+        import plotly.graph_objects as go
+
+        keys, width = [], None
+        if chart_type != "histogram":
+            x_key, width = coarsen(dataframe[x_axis], int(self._config["max_groups"]))
+            if width is not None:
+                logger.info(f"Column '{x_axis}' binned into {self._config['max_groups']} ranges of width {width:g}.")
+            keys.append(x_key)
+        if color_column:
+            # The color column is limited as the x column, so the number of traces is bounded too
+            color_key, color_width = coarsen(dataframe[color_column], int(self._config["max_groups"]))
+            if color_width is not None:
+                logger.info(f"Column '{color_column}' binned into {self._config['max_groups']} ranges of width {color_width:g}.")
+            else:
+                color_key, num_other = limit_categories(dataframe[color_column], int(self._config["max_groups"]))
+                if num_other:
+                    logger.info(f"{num_other} less frequent values of column '{color_column}' grouped as 'Other'.")
+            keys.append(color_key)
+        if keys:
+            codes, labels = group_codes(*keys)
+        else:
+            codes, labels = np.zeros(len(dataframe), dtype=np.intp), []
+        num_groups = len(labels[0]) if labels else 1
+        colors = labels[-1] if color_column else None
+
+        if chart_type == "histogram":
+            bins = self._config["histogram_bins"]
+            bins = int(bins) if str(bins).isdigit() else str(bins)
+            edges, counts = histogram(dataframe[x_axis].to_numpy(dtype=np.float64, na_value=np.nan), codes, num_groups, bins)
+            centers = np.tile((edges[:-1] + edges[1:]) / 2, num_groups)
+            bins_frame = pd.DataFrame({x_axis: centers, 'count': counts.reshape(-1)})
+            if color_column:
+                bins_frame[color_column] = np.repeat(colors, counts.shape[1])
+            bins_frame = bins_frame[bins_frame['count'] > 0]
+            fig = px.bar(bins_frame, x=x_axis, y='count', color=color_column)
+            fig.update_traces(width=float(edges[1] - edges[0]))
+            fig.update_layout(bargap=0)
+            logger.info(f"Histogram of {len(dataframe)} rows aggregated into {counts.shape[1]} bins and {num_groups} group(s).")
+        elif chart_type == "bar":
+            sums = group_sums(dataframe[y_axis].to_numpy(dtype=np.float64, na_value=np.nan), codes, num_groups)
+            bars_frame = pd.DataFrame({x_axis: labels[0], y_axis: sums})
+            if color_column:
+                bars_frame[color_column] = colors
+            fig = px.bar(bars_frame, x=x_axis, y=y_axis, color=color_column)
+            if width is not None:
+                fig.update_traces(width=width)
+            logger.info(f"Bar chart of {len(dataframe)} rows aggregated into {num_groups} bars.")
+        else:
+            statistics = box_statistics(dataframe[y_axis].to_numpy(dtype=np.float64, na_value=np.nan), codes, num_groups, int(self._config["max_outliers"]))
+            palette = px.colors.qualitative.Plotly
+            if color_column:
+                # One sort splits the boxes and the outliers by trace, in order of appearance of the colors
+                trace_codes, traces = pd.factorize(colors)
+                _, trace_groups = split_groups(trace_codes)
+                outlier_traces, outlier_positions = split_groups(trace_codes[statistics['outlier_groups']])
+            else:
+                traces, trace_groups = [None], [np.arange(num_groups)]
+                outlier_traces, outlier_positions = split_groups(np.zeros(len(statistics['outliers']), dtype=np.intp))
+            outliers_of_trace = dict(zip(outlier_traces.tolist(), outlier_positions))
+            fig = go.Figure()
+            for number, (trace, groups) in enumerate(zip(traces, trace_groups)):
+                name = str(trace) if color_column else y_axis
+                color = palette[number % len(palette)]
+                fig.add_trace(go.Box(
+                    name=name, x=labels[0][groups], q1=statistics['q1'][groups], median=statistics['median'][groups],
+                    q3=statistics['q3'][groups], mean=statistics['mean'][groups], lowerfence=statistics['lowerfence'][groups],
+                    upperfence=statistics['upperfence'][groups], boxpoints=False, marker_color=color,
+                    offsetgroup=name, legendgroup=name, showlegend=bool(color_column)
+                ))
+                outliers = outliers_of_trace.get(number)
+                if outliers is not None:
+                    # The outliers are drawn over their box, as the points of a Plotly box
+                    fig.add_trace(go.Scatter(
+                        x=labels[0][statistics['outlier_groups'][outliers]], y=statistics['outliers'][outliers], mode='markers',
+                        marker_color=color, offsetgroup=name, legendgroup=name, showlegend=False, name=name
+                    ))
+            fig.update_layout(boxmode='group', scattermode='group', xaxis_title=x_axis, yaxis_title=y_axis, legend_title_text=color_column)
+            logger.info(f"Box plot of {len(dataframe)} rows aggregated into {num_groups} box(es) with {len(statistics['outliers'])} outlier(s) drawn.")
+        return fig
 
     def visualize(self, dataframe: pd.DataFrame, class_column: str = None, class_value: str = None, use_reloader: bool = False):
         """
         Creates and displays interactive plots from the DataFrame using Plotly and Dash.
+
+        The app is served on the address given by the `host` and `port` options. In
+        development mode (the default) it runs in a background thread of this process, with
+        the Dash dev tools. In production mode the DataFrame is shared through memory-mapped
+        files and served by `workers` processes, each building the app on the shared data.
+        A server started by a previous call is stopped first.
         
         Args:
             dataframe (pd.DataFrame): The DataFrame to visualize.
             class_column (str, optional): The column used for filtering the DataFrame by class.
             class_value (str, optional): The value of the class to filter by.
-            use_reloader (bool, optional): Whether to use reloader for development. Default is False for production.
+            use_reloader (bool, optional): Whether the browser reloads the app when its assets change, in development mode. Default is False.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the DataFrame is empty, the class column does not exist or the server mode is unknown.
         """
         if dataframe.empty:
             raise ValueError("DataFrame is empty.")
 
         if class_column and class_value:
-            if class_column not in dataframe.columns:
+            column = resolve_class_column(dataframe.columns, class_column)
+            if column is None:
                 raise ValueError(f"Column '{class_column}' not found in DataFrame.")
-            dataframe = dataframe[dataframe[class_column].astype(str).str.lower() == class_value.lower()]
+            dataframe = filter_by_class(dataframe, column, class_value)
+
+        mode = str(self._config["server"]).lower()
+        if mode not in ("development", "production"):
+            raise ValueError(f"Unknown server mode '{self._config['server']}'. Use 'development' or 'production'.")
+
+        self.stop_server()
+        self._server_stop_event.clear()
+        try:
+            if mode == "production":
+                # The workers map the columns of the shared frame instead of receiving a copy of the data each
+                self._shared = SharedFrame.publish(dataframe)
+                atexit.register(self._shared.remove)
+                config = {key: value for key, value in self._config.items() if key not in ("max_rows", "row_selection")}
+                server = PreforkServer(_production_app, (config, self._shared.directory, class_column, class_value),
+                                       self._config["host"], self._config["port"], self._config["workers"])
+            else:
+                app = self._build_app(dataframe, class_column, class_value)
+                app.enable_dev_tools(debug=True, dev_tools_hot_reload=use_reloader)
+                server = ThreadedServer(app.server, self._config["host"], self._config["port"])
+            server.start()
+        except Exception as e:
+            logger.error(f"Error starting the Dash server: {e}")
+            if self._shared is not None:
+                self._shared.remove()
+                self._shared = None
+            raise
+        self._server = server
+
+        # The watcher is not a daemon, so the process keeps serving until the server stops
+        threading.Thread(target=self._watch_server, args=(server, self._shared), name='dash-server-watcher').start()
+        print(f"Dash app is running on {server.url} ({mode} mode).")
+
+    def _watch_server(self, server, shared):
+        """
+        Waits until a server stops, then removes its shared dataset and signals the stop.
+
+        Args:
+            server (ThreadedServer or PreforkServer): The server.
+            shared (SharedFrame): The dataset shared with its workers, or None.
+        """
+        server.join()
+        if shared is not None:
+            shared.remove()
+        if self._server is server:
+            self._server_stop_event.set()
+
+    def stop_server(self):
+        """
+        Stops the running Dash server, if any, and removes the dataset shared with its workers.
+        """
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.stop()
+        if self._shared is not None:
+            self._shared.remove()
+            self._shared = None
+        self._server_stop_event.set()
+        print("Dash server has been stopped.")
+
+    def _build_app(self, dataframe: pd.DataFrame, class_column: str = None, class_value: str = None):
+        """
+        Creates the Dash app that plots the DataFrame.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to visualize, already filtered by class.
+            class_column (str, optional): The column the DataFrame was filtered by.
+            class_value (str, optional): The value of the class it was filtered by.
+
+        Returns:
+            dash.Dash: The app.
+        """
+        # Figures are cached by the contents of the data, so they are reused if the same data is visualized again
+        fingerprint = dataset_fingerprint(dataframe)
+        self._figure_cache.max_bytes = int(float(self._config["figure_cache_mb"]) * 1024 * 1024)
+        options = tuple(self._config[option] for option in ("correlation", "downsample", "max_points", "viewport_width", "viewport_height", "aggregate", "histogram_bins", "max_outliers", "max_groups", "webgl_threshold", "binary_arrays"))
+
+        # Dash and Plotly are imported here so that loading the plugin does not pay for them
+        from dash import Dash, dcc, html, Input, Output, ctx
+        from dash.exceptions import PreventUpdate
+        import plotly.express as px
 
         app = Dash(__name__)
 
@@ -92,9 +428,25 @@ class interactive_graph_viewer(VisualizationPlugin):
             [Input('chart-type', 'value'),
              Input('x-axis', 'value'),
              Input('y-axis', 'value'),
-             Input('color-column', 'value')]
+             Input('color-column', 'value'),
+             Input('graph', 'relayoutData')]
         )
-        def update_graph(chart_type, x_axis, y_axis, color_column):
+        def update_graph(chart_type, x_axis, y_axis, color_column, relayout_data):
+            # Zooming and panning re-sample the chart shown; any other change shows all the data
+            x_range, y_range = None, None
+            if ctx.triggered_id == 'graph':
+                viewport = self._viewport(relayout_data)
+                if viewport is None or chart_type not in ("scatter", "line"):
+                    raise PreventUpdate
+                x_range, y_range = viewport
+
+            # The heatmap does not depend on the selected columns
+            columns = (None, None, None) if chart_type == "heatmap" else (x_axis, y_axis, color_column)
+            key = (fingerprint, chart_type, *columns, (class_column, class_value), x_range, y_range, options)
+            figure = self._figure_cache.get(key)
+            if figure is not None:
+                return figure
+
             try:
                 color_column = None if color_column == 'None' else color_column
                 
@@ -104,10 +456,14 @@ class interactive_graph_viewer(VisualizationPlugin):
                 if chart_type in ["scatter", "line", "bar", "box"] and not pd.api.types.is_numeric_dtype(dataframe[y_axis]):
                     raise ValueError(f"Column '{y_axis}' must contain numeric data for chart type '{chart_type}'.")
 
-                if chart_type == "scatter":
-                    fig = px.scatter(dataframe, x=x_axis, y=y_axis, color=color_column)
-                elif chart_type == "line":
-                    fig = px.line(dataframe, x=x_axis, y=y_axis, color=color_column)
+                if chart_type in ("scatter", "line"):
+                    data = self._downsample(dataframe, chart_type, x_axis, y_axis, color_column, x_range, y_range)
+                    # WebGL draws many points much faster than SVG, which creates one element per point
+                    render_mode = "webgl" if len(data) >= int(self._config["webgl_threshold"]) else "svg"
+                    plot = px.scatter if chart_type == "scatter" else px.line
+                    fig = plot(data, x=x_axis, y=y_axis, color=color_column, render_mode=render_mode)
+                elif chart_type in ("bar", "histogram", "box") and self._enabled("aggregate"):
+                    fig = self._aggregated_figure(dataframe, chart_type, x_axis, y_axis, color_column)
                 elif chart_type == "bar":
                     fig = px.bar(dataframe, x=x_axis, y=y_axis, color=color_column)
                 elif chart_type == "histogram":
@@ -115,32 +471,40 @@ class interactive_graph_viewer(VisualizationPlugin):
                 elif chart_type == "box":
                     fig = px.box(dataframe, x=x_axis, y=y_axis, color=color_column)
                 elif chart_type == "heatmap":
-                    # Validate if the DataFrame is suitable for heatmap (e.g., numeric values)
-                    if not dataframe.select_dtypes(include=['number']).shape[1]:
+                    # The matrix only depends on the data, so it is computed once and reused by later callbacks
+                    correlation = correlation_cache.get(dataframe, self._config["correlation"], filter_key=(class_column, class_value))
+                    if correlation.empty:
                         raise ValueError("DataFrame does not contain numeric columns for heatmap.")
-                    fig = px.imshow(dataframe.corr())
+                    fig = px.imshow(correlation)
                 else:
                     fig = px.scatter(dataframe, x=x_axis, y=y_axis, color=color_column)
 
-                fig.update_layout(title=f"{chart_type.capitalize()} Plot")
+                # The zoom of the user is kept while the same chart is re-sampled
+                fig.update_layout(title=f"{chart_type.capitalize()} Plot", uirevision=f"{chart_type}|{x_axis}|{y_axis}|{color_column}")
+                if self._enabled("binary_arrays"):
+                    fig = encode_typed_arrays(fig)
+                self._figure_cache.put(key, fig)
                 return fig
             except Exception as e:
                 return px.scatter(title=f"Error: {str(e)}")
 
-        # Run Dash app in a separate thread
-        def run_server():
-            app.run_server(debug=True, use_reloader=use_reloader)
-            self._server_stop_event.set()  # Signal that the server has stopped
+        return app
 
-        thread = threading.Thread(target=run_server)
-        thread.start()
 
-        # Continue execution of the script
-        print("Dash app is running in a separate thread.")
+def _production_app(config, shared_dir, class_column=None, class_value=None):
+    """
+    Builds the WSGI application of a worker process of the production server, on the
+    memory-mapped columns of the shared dataset.
 
-    def stop_server(self):
-        """
-        Stops the running Dash server by setting the stop event.
-        """
-        self._server_stop_event.set()
-        print("Dash server has been stopped.")
\ No newline at end of file
+    Args:
+        config (dict): The configuration of the plugin.
+        shared_dir (str): The directory of the shared dataset.
+        class_column (str, optional): The column the dataset was filtered by.
+        class_value (str, optional): The value of the class it was filtered by.
+
+    Returns:
+        flask.Flask: The server of the Dash app.
+    """
+    viewer = interactive_graph_viewer()
+    viewer._config.update(config)
+    return viewer._build_app(SharedFrame(shared_dir).load(), class_column, class_value).server
@@ -1,9 +1,14 @@
 import pandas as pd
 import numpy as np
 import os
-import webbrowser
 from core.logging_config import logger
 from core.visualization_plugin import VisualizationPlugin
+from utils.parallel_utils import reduce_chunks
+from utils.class_index import resolve_class_column, filter_by_class, class_mask
+from utils.sketches import DatasetSketch, DEFAULT_QUANTILE_ERROR, DEFAULT_DISTINCT_ERROR, DEFAULT_FREQUENCY_ERROR
+
+# Number of rows summarized at a time in approximate mode when the data is in memory
+APPROX_BLOCK_ROWS = 1000000
 
 class resume_viewer(VisualizationPlugin):
     """
@@ -19,7 +24,105 @@ class resume_viewer(VisualizationPlugin):
         self._version = "1.0.0"
         self._date = "2024.08.03"
         self._author = "Lázaro Bustio Martínez"
-    
+        self._config = {
+            "approx": False,                                # Compute the statistics with mergeable sketches in one pass
+            "quantile_error": DEFAULT_QUANTILE_ERROR,       # Rank error of the approximate quartiles
+            "distinct_error": DEFAULT_DISTINCT_ERROR,       # Relative error of the approximate distinct counts
+            "frequency_error": DEFAULT_FREQUENCY_ERROR,     # Error of the approximate top value frequencies
+            "workers": None,                                # Worker processes summarizing the chunks in approximate mode
+        }
+        self._supports_chunks = True
+
+    def _approx_enabled(self) -> bool:
+        """
+        Returns whether the approximate mode is enabled.
+
+        Returns:
+            bool: True if the `approx` option is set to a true value.
+        """
+        return str(self._config.get("approx")).lower() in ('true', '1', 'yes', 'on')
+
+    def _sketch(self, chunks) -> DatasetSketch:
+        """
+        Summarizes a stream of chunks with mergeable sketches, in parallel.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+
+        Returns:
+            DatasetSketch: The sketches of every column, or None if no chunk was received.
+        """
+        from functools import partial
+
+        summarize = partial(
+            DatasetSketch.from_frame,
+            quantile_error=float(self._config["quantile_error"]),
+            distinct_error=float(self._config["distinct_error"]),
+            frequency_error=float(self._config["frequency_error"]),
+        )
+        sketch, num_chunks = reduce_chunks(chunks, summarize, self._config.get("workers"))
+        if sketch is not None:
+            logger.info(f"Approximate statistics computed over {sketch.rows} rows in {num_chunks} chunk(s).")
+        return sketch
+
+    @staticmethod
+    def _filter_chunk(chunk: pd.DataFrame, class_column: str, class_value: str) -> pd.DataFrame:
+        """
+        Returns the rows of a chunk with a class value.
+
+        Args:
+            chunk (pd.DataFrame): The chunk.
+            class_column (str): The column name for filtering.
+            class_value (str): The value for filtering.
+
+        Returns:
+            pd.DataFrame: The matching rows.
+
+        Raises:
+            ValueError: If the chunk has no such column.
+        """
+        column = resolve_class_column(chunk.columns, class_column)
+        if column is None:
+            raise ValueError(f"Column '{class_column}' does not exist in the DataFrame.")
+        return chunk[class_mask(chunk[column], class_value)]
+
+    def visualize_chunks(self, chunks, data_path: str = None, class_column: str = None, class_value: str = None, output_file: str = "summary_report.html"):
+        """
+        Generates the summary report of a stream of chunks.
+
+        In approximate mode the chunks are summarized with mergeable sketches, so the report
+        is produced in one pass with memory bounded by the chunk size. Otherwise the chunks
+        are concatenated and summarized exactly.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+            data_path (str): The path to the data file.
+            class_column (str): Optional column name for filtering.
+            class_value (str): Optional value for filtering.
+            output_file (str): The path where the HTML report will be saved.
+
+        Returns:
+            None
+        """
+        if not self._approx_enabled():
+            logger.warning("Exact statistics need the whole dataset. All chunks will be loaded into memory.")
+            dataframe = pd.concat(chunks, ignore_index=True)
+            return self.visualize(dataframe, data_path, class_column, class_value, output_file)
+
+        try:
+            if class_column and class_value:
+                chunks = (self._filter_chunk(chunk, class_column, class_value) for chunk in chunks)
+            sketch = self._sketch(chunks)
+            if sketch is None or sketch.rows == 0:
+                logger.warning("No data received. Nothing to summarize.")
+                return
+            numeric_stats, non_numeric_stats = sketch.describe()
+            self._write_report((sketch.rows, len(sketch.columns)), pd.Series(sketch.dtypes), numeric_stats, non_numeric_stats, data_path, output_file, approx=True)
+
+        except Exception as e:
+            logger.error(f"An error occurred while generating the summary report: {str(e)}")
+            raise
+
     def visualize(self, dataframe: pd.DataFrame, data_path: str = None, class_column: str = None, class_value: str = None, output_file: str = "summary_report.html"):
         """
         Generates an HTML report summarizing the DataFrame including dimensions, column names, data types, and statistics.
@@ -44,105 +147,137 @@ class resume_viewer(VisualizationPlugin):
         try:
             # Filter DataFrame if class_column and class_value are provided
             if class_column and class_value:
-                if class_column not in dataframe.columns:
+                column = resolve_class_column(dataframe.columns, class_column)
+                if column is None:
                     raise ValueError(f"Column '{class_column}' does not exist in the DataFrame.")
-                dataframe = dataframe[dataframe[class_column] == class_value]
+                dataframe = filter_by_class(dataframe, column, class_value)
                 if dataframe.empty:
                     logger.warning("Filtered DataFrame is empty. Nothing to summarize.")
                     return 
 
-            # Ensure the output directory exists
-            output_file_path = os.path.join('results', 'visualization', output_file)
-            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-
-            # Create an HTML report
-            with open(output_file_path, "w") as file:
-                # HTML Header with CSS styles
-                file.write("""
-                <html>
-                <head>
-                    <title>DataFrame Summary Report</title>
-                    <style>
-                        body {
-                            font-family: Arial, sans-serif;
-                            margin: 20px;
-                            color: #333;
-                        }
-                        h1 {
-                            color: #2c3e50;
-                        }
-                        h2 {
-                            color: #3498db;
-                        }
-                        table {
-                            width: 100%;
-                            border-collapse: collapse;
-                            margin: 20px 0;
-                        }
-                        table, th, td {
-                            border: 1px solid #ddd;
-                        }
-                        th, td {
-                            padding: 12px;
-                            text-align: left;
-                        }
-                        th {
-                            background-color: #f2f2f2;
-                            color: #2c3e50;
-                        }
-                        tr:nth-child(even) {
-                            background-color: #f9f9f9;
-                        }
-                        tr:hover {
-                            background-color: #f1c40f;
-                        }
-                        .statistics {
-                            border: 1px solid #ddd;
-                            padding: 10px;
-                            margin: 10px 0;
-                            background-color: #f5f5f5;
-                        }
-                    </style>
-                </head>
-                <body>
-                <h1>DataFrame Summary Report</h1>
-                """)
-
-                # Include the data file path
-                if data_path:
-                    file.write(f"<h2>Data File Path</h2><p>{data_path}</p>")
-
-                # DataFrame dimensions
-                num_rows, num_cols = dataframe.shape
-                file.write(f"<h2>DataFrame Dimensions</h2>")
-                file.write(f"<p>Rows: {num_rows}<br>Columns: {num_cols}</p>")
-
-                # Column names and data types
-                column_info = dataframe.dtypes.reset_index()
-                column_info.columns = ['Column Name', 'Data Type']
-                column_info["Data Type"] = column_info["Data Type"].astype(str)  # Convert to string
-
-                file.write("<h2>Column Names and Data Types</h2>")
-                file.write(column_info.to_html(index=False, border=0, classes='statistics'))
-
-                # Basic statistics for numerical and non-numerical columns
-                numeric_stats = dataframe.describe(include=[np.number]).style.background_gradient(cmap='coolwarm').to_html()
-                non_numeric_stats = dataframe.describe(exclude=[np.number]).style.background_gradient(cmap='coolwarm').to_html()
-
-                file.write("<h2>Basic Statistics (Numerical)</h2>")
-                file.write(numeric_stats)
-
-                file.write("<h2>Basic Statistics (Non-Numerical)</h2>")
-                file.write(non_numeric_stats)
-
-                # HTML Footer
-                file.write("</body></html>")
-
-            logger.info(f"DataFrame summary report generated successfully: {output_file_path}")
-
-            # Open the HTML file in the default web browser
-            webbrowser.open(f'file://{os.path.abspath(output_file_path)}')
+            if self._approx_enabled():
+                blocks = (dataframe.iloc[start:start + APPROX_BLOCK_ROWS] for start in range(0, len(dataframe), APPROX_BLOCK_ROWS))
+                sketch = self._sketch(blocks)
+                if sketch is None:
+                    logger.warning("No data received. Nothing to summarize.")
+                    return
+                numeric_stats, non_numeric_stats = sketch.describe()
+            else:
+                numeric_stats = dataframe.describe(include=[np.number])
+                non_numeric_stats = dataframe.describe(exclude=[np.number])
+            self._write_report(dataframe.shape, dataframe.dtypes, numeric_stats, non_numeric_stats, data_path, output_file, approx=self._approx_enabled())
 
         except Exception as e:
             logger.error(f"An error occurred while generating the summary report: {str(e)}")
             raise
+
+    def _write_report(self, shape, dtypes, numeric_stats: pd.DataFrame, non_numeric_stats: pd.DataFrame, data_path: str = None, output_file: str = "summary_report.html", approx: bool = False):
+        """
+        Writes the HTML summary report and opens it in the default web browser.
+
+        Args:
+            shape (tuple): The number of rows and columns of the data.
+            dtypes (pd.Series): The data type of every column.
+            numeric_stats (pd.DataFrame): The statistics of the numerical columns.
+            non_numeric_stats (pd.DataFrame): The statistics of the non-numerical columns.
+            data_path (str): The path to the data file.
+            output_file (str): The path where the HTML report will be saved.
+            approx (bool): Whether the statistics are approximate.
+
+        Returns:
+            None
+        """
+        # Ensure the output directory exists
+        output_file_path = os.path.join('results', 'visualization', output_file)
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+
+        # Create an HTML report
+        with open(output_file_path, "w") as file:
+            # HTML Header with CSS styles
+            file.write("""
+            <html>
+            <head>
+                <title>DataFrame Summary Report</title>
+                <style>
+                    body {
+                        font-family: Arial, sans-serif;
+                        margin: 20px;
+                        color: #333;
+                    }
+                    h1 {
+                        color: #2c3e50;
+                    }
+                    h2 {
+                        color: #3498db;
+                    }
+                    table {
+                        width: 100%;
+                        border-collapse: collapse;
+                        margin: 20px 0;
+                    }
+                    table, th, td {
+                        border: 1px solid #ddd;
+                    }
+                    th, td {
+                        padding: 12px;
+                        text-align: left;
+                    }
+                    th {
+                        background-color: #f2f2f2;
+                        color: #2c3e50;
+                    }
+                    tr:nth-child(even) {
+                        background-color: #f9f9f9;
+                    }
+                    tr:hover {
+                        background-color: #f1c40f;
+                    }
+                    .statistics {
+                        border: 1px solid #ddd;
+                        padding: 10px;
+                        margin: 10px 0;
+                        background-color: #f5f5f5;
+                    }
+                </style>
+            </head>
+            <body>
+            <h1>DataFrame Summary Report</h1>
+            """)
+
+            # Include the data file path
+            if data_path:
+                file.write(f"<h2>Data File Path</h2><p>{data_path}</p>")
+
+            # DataFrame dimensions
+            num_rows, num_cols = shape
+            file.write(f"<h2>DataFrame Dimensions</h2>")
+            file.write(f"<p>Rows: {num_rows}<br>Columns: {num_cols}</p>")
+
+            # Column names and data types
+            column_info = dtypes.reset_index()
+            column_info.columns = ['Column Name', 'Data Type']
+            column_info["Data Type"] = column_info["Data Type"].astype(str)  # Convert to string
+
+            file.write("<h2>Column Names and Data Types</h2>")
+            file.write(column_info.to_html(index=False, border=0, classes='statistics'))
+
+            # Basic statistics for numerical and non-numerical columns
+            numeric_stats = numeric_stats.style.background_gradient(cmap='coolwarm').to_html()
+            non_numeric_stats = non_numeric_stats.style.background_gradient(cmap='coolwarm').to_html()
+            if approx:
+                file.write("<p>Approximate statistics: quartiles, unique counts and top values are estimated with mergeable sketches.</p>")
+
+            file.write("<h2>Basic Statistics (Numerical)</h2>")
+            file.write(numeric_stats)
+
+            file.write("<h2>Basic Statistics (Non-Numerical)</h2>")
+            file.write(non_numeric_stats)
+
+            # HTML Footer
+            file.write("</body></html>")
+
+        logger.info(f"DataFrame summary report generated successfully: {output_file_path}")
+
+        # Open the HTML file in the default web browser
+        import webbrowser
+        webbrowser.open(f'file://{os.path.abspath(output_file_path)}')
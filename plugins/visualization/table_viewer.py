@@ -8,9 +8,9 @@ Email: lbustio@gmail.com
 """
 
 import pandas as pd
-import plotly.graph_objects as go
 from core.logging_config import logger
 from core.visualization_plugin import VisualizationPlugin
+from utils.class_index import resolve_class_column, filter_by_class, class_mask
 
 class table_viewer(VisualizationPlugin):
     """
@@ -18,6 +18,7 @@ class table_viewer(VisualizationPlugin):
 
     Methods:
         visualize(dataframe: pd.DataFrame, class_column: str = None, class_value: str = None): Visualizes the DataFrame as an interactive table.
+        visualize_chunks(chunks, class_column: str = None, class_value: str = None): Selects rows from a stream of chunks and visualizes them as an interactive table.
     """
     
     def __init__(self):
@@ -32,6 +33,7 @@ class table_viewer(VisualizationPlugin):
             "max_rows": 100,  # Maximum number of rows to display at once
             "row_selection": "Random"  # Method for selecting rows: Random, Top, Bottom, by_class
         }
+        self._supports_chunks = True
 
     def visualize(self, dataframe: pd.DataFrame, class_column: str = None, class_value: str = None):
         """
@@ -52,52 +54,116 @@ class table_viewer(VisualizationPlugin):
         try:
             num_rows = len(dataframe)
             max_rows = self._config.get("max_rows", 100)
-            row_selection = self._config.get("row_selection", "Random")
+            row_selection = str(self._config.get("row_selection", "Random")).lower()
 
             # Validate and apply row selection policy
             if num_rows <= max_rows:
                 logger.info(f"DataFrame has {num_rows} rows, which is fewer than or equal to max_rows. Showing all rows.")
                 selected_data = dataframe
             else:
-                if row_selection == "Top":
+                if row_selection == "top":
                     selected_data = dataframe.head(max_rows)
-                elif row_selection == "Bottom":
+                elif row_selection == "bottom":
                     selected_data = dataframe.tail(max_rows)
-                elif row_selection == "Random":
+                elif row_selection == "random":
                     selected_data = dataframe.sample(min(max_rows, num_rows), random_state=42)
                 elif row_selection == "by_class":
                     if class_column is None or class_value is None:
                         logger.error("class_column and class_value must be provided for row_selection='by_class'.")
                         raise ValueError("class_column and class_value must be specified for by_class selection.")
                     
-                    class_column = class_column.lower()
-                    class_value = class_value.lower()
-                    
-                    if class_column not in dataframe.columns:
+                    column = resolve_class_column(dataframe.columns, class_column)
+                    if column is None:
                         logger.error(f"Class column '{class_column}' does not exist in the DataFrame.")
                         raise KeyError(f"Class column '{class_column}' does not exist in the DataFrame.")
                     
-                    filtered_data = dataframe[dataframe[class_column].str.lower() == class_value]
-                    selected_data = filtered_data.head(max_rows)
+                    selected_data = filter_by_class(dataframe, column, class_value, limit=max_rows)
                 else:
                     logger.error(f"Unknown row_selection method: '{row_selection}'. Defaulting to 'Top'.")
                     selected_data = dataframe.head(max_rows)
             
-            # Create the interactive table using Plotly with enhanced colors
-            fig = go.Figure(data=[go.Table(
-                header=dict(values=list(selected_data.columns),
-                            fill_color='royalblue',
-                            align='center',
-                            font=dict(color='white', size=12)),
-                cells=dict(values=[selected_data[col] for col in selected_data.columns],
-                           fill_color=[['lavender', 'lightyellow'] * (len(selected_data) // 2) + ['lavender'] * (len(selected_data) % 2)],
-                           align='left',
-                           font=dict(color='black', size=11))
-            )])
-
-            fig.update_layout(title="Interactive DataFrame Viewer", title_font=dict(size=20, family='Arial'))
-
-            fig.show()
+            self._render_table(selected_data)
+
+            logger.info("DataFrame visualized successfully.")
+
+        except ValueError as ve:
+            logger.error(f"ValueError: {str(ve)}")
+            raise
+        except KeyError as ke:
+            logger.error(f"KeyError: {str(ke)}")
+            raise
+        except Exception as e:
+            logger.error(f"An error occurred while visualizing the DataFrame: {str(e)}")
+            raise
+
+    def visualize_chunks(self, chunks, class_column: str = None, class_value: str = None):
+        """
+        Selects rows from a stream of DataFrame chunks and visualizes them as an interactive table.
+
+        Only the rows that can end up in the table are kept in memory while the chunks are
+        consumed, so the memory footprint is bounded by the chunk size plus `max_rows`:
+            - Top: Stops reading as soon as `max_rows` rows have been collected.
+            - Bottom: Keeps only the last `max_rows` rows seen so far.
+            - Random: Keeps a uniform reservoir of `max_rows` rows using random keys.
+            - by_class: Keeps the first `max_rows` rows matching the class value.
+
+        Args:
+            chunks (iterable): An iterable of pandas DataFrames.
+            class_column (str, optional): The column name for class-based selection. Required for by_class.
+            class_value (str, optional): The value of the class to select. Required for by_class.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If class_column or class_value are not provided when row_selection is 'by_class'.
+            KeyError: If the specified class_column does not exist in the DataFrame.
+        """
+        try:
+            max_rows = self._config.get("max_rows", 100)
+            row_selection = str(self._config.get("row_selection", "Random")).lower()
+
+            if row_selection == "by_class":
+                if class_column is None or class_value is None:
+                    logger.error("class_column and class_value must be provided for row_selection='by_class'.")
+                    raise ValueError("class_column and class_value must be specified for by_class selection.")
+            elif row_selection not in ("top", "bottom", "random"):
+                logger.error(f"Unknown row_selection method: '{row_selection}'. Defaulting to 'Top'.")
+                row_selection = "top"
+
+            selected_data = None
+            num_rows = 0
+
+            if row_selection == "random":
+                # Keep a uniform reservoir of rows while the chunks are consumed
+                from utils.sampling_utils import reservoir_sample
+                selected_data, num_rows = reservoir_sample(chunks, max_rows, seed=42)
+
+            for chunk in (chunks if row_selection != "random" else []):
+                num_rows += len(chunk)
+                if row_selection == "top":
+                    needed = max_rows - (0 if selected_data is None else len(selected_data))
+                    selected_data = pd.concat([selected_data, chunk.head(needed)])
+                    if len(selected_data) >= max_rows:
+                        break
+                elif row_selection == "bottom":
+                    selected_data = pd.concat([selected_data, chunk]).tail(max_rows)
+                else:
+                    column = resolve_class_column(chunk.columns, class_column)
+                    if column is None:
+                        logger.error(f"Class column '{class_column}' does not exist in the DataFrame.")
+                        raise KeyError(f"Class column '{class_column}' does not exist in the DataFrame.")
+                    needed = max_rows - (0 if selected_data is None else len(selected_data))
+                    matches = chunk[class_mask(chunk[column], class_value)]
+                    selected_data = pd.concat([selected_data, matches.head(needed)])
+                    if len(selected_data) >= max_rows:
+                        break
+
+            if selected_data is None:
+                raise ValueError("No data chunks were received.")
+
+            logger.info(f"Selected {len(selected_data)} rows from {num_rows} streamed rows using '{row_selection}' selection.")
+            self._render_table(selected_data)
 
             logger.info("DataFrame visualized successfully.")
 
@@ -110,3 +176,32 @@ class table_viewer(VisualizationPlugin):
         except Exception as e:
             logger.error(f"An error occurred while visualizing the DataFrame: {str(e)}")
             raise
+
+    def _render_table(self, selected_data: pd.DataFrame):
+        """
+        Renders the selected rows as an interactive Plotly table.
+
+        Args:
+            selected_data (pd.DataFrame): The rows to display.
+
+        Returns:
+            None
+        """
+        # Plotly is imported here so that loading the plugin does not pay for it
+        import plotly.graph_objects as go
+
+        # Create the interactive table using Plotly with enhanced colors
+        fig = go.Figure(data=[go.Table(
+            header=dict(values=list(selected_data.columns),
+                        fill_color='royalblue',
+                        align='center',
+                        font=dict(color='white', size=12)),
+            cells=dict(values=[selected_data[col] for col in selected_data.columns],
+                       fill_color=[['lavender', 'lightyellow'] * (len(selected_data) // 2) + ['lavender'] * (len(selected_data) % 2)],
+                       align='left',
+                       font=dict(color='black', size=11))
+        )])
+
+        fig.update_layout(title="Interactive DataFrame Viewer", title_font=dict(size=20, family='Arial'))
+
+        fig.show()
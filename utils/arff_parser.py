@@ -0,0 +1,612 @@
+"""
+Module: utils.arff_parser
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.1
+Email: lbustio@gmail.com
+
+Description:
+This module provides a native, single-pass parser for ARFF (Attribute-Relation File Format) files. The `ArffReader` class reads the header of an ARFF file and then parses its `@data` section, in dense or sparse format, directly into typed column arrays: numeric attributes are accumulated in compact float buffers and nominal attributes are stored as integer codes that become pandas categoricals without any intermediate byte strings. The data can be read at once or iterated in chunks of a fixed number of rows, so large Weka datasets can be processed with memory bounded by the chunk size. The `ArffWriter` class does the reverse: it declares the attributes from the dtypes of a DataFrame and writes the data in blocks, formatting each column with vectorized string operations.
+
+"""
+
+import re
+import math
+from array import array
+import numpy as np
+import pandas as pd
+
+# Regular expressions for the values of dense and sparse data lines
+_QUOTED = r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\""
+_DENSE_TOKEN = re.compile(rf"\s*({_QUOTED}|[^,]*?)\s*(,|$)")
+_SPARSE_TOKEN = re.compile(rf"\s*(\d+)\s+({_QUOTED}|[^,]*?)\s*(,|$)")
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+# Conversion of Java SimpleDateFormat patterns (used by ARFF) to strftime directives
+_DATE_PATTERNS = [('yyyy', '%Y'), ('yy', '%y'), ('MM', '%m'), ('dd', '%d'), ('HH', '%H'), ('mm', '%M'), ('ss', '%S'), ('SSS', '%f'), ('Z', '%z')]
+_DEFAULT_DATE_FORMAT = "yyyy-MM-dd'T'HH:mm:ss"
+
+# Values that have to be quoted when they are written
+_NEEDS_QUOTES = re.compile(r"[\s,'\"{}%\\]|^\?$|^$")
+_WRITE_ESCAPES = {'\\': '\\\\', "'": "\\'", '\n': '\\n', '\t': '\\t', '\r': '\\r'}
+
+
+def _unquote(token):
+    """
+    Converts a raw ARFF token into its value.
+
+    Quoted tokens are unquoted and unescaped, and the unquoted token '?' is the missing value.
+
+    Args:
+        token (str): The raw token, already stripped of surrounding whitespace.
+
+    Returns:
+        str: The value of the token, or None if the value is missing.
+    """
+    if len(token) >= 2 and token[0] in '\'"' and token[-1] == token[0]:
+        return _ESCAPE.sub(lambda match: _ESCAPES.get(match.group(1), match.group(1)), token[1:-1])
+    if token == '?':
+        return None
+    return token
+
+
+def split_values(text):
+    """
+    Splits a comma-separated list of ARFF values, honouring quoted values.
+
+    Args:
+        text (str): The comma-separated values.
+
+    Returns:
+        list: The values, with None for missing values.
+    """
+    if "'" not in text and '"' not in text:
+        # Fast path for the common case of unquoted values
+        return [None if token == '?' else token for token in (token.strip() for token in text.split(','))]
+
+    values = []
+    position = 0
+    while True:
+        match = _DENSE_TOKEN.match(text, position)
+        values.append(_unquote(match.group(1)))
+        if match.group(2) != ',':
+            return values
+        position = match.end()
+
+
+def split_sparse_values(text):
+    """
+    Parses the entries of a sparse ARFF data line (without its enclosing braces).
+
+    Args:
+        text (str): The comma-separated `index value` entries.
+
+    Returns:
+        dict: The values by attribute index, with None for missing values.
+
+    Raises:
+        ValueError: If an entry is not in the `index value` format.
+    """
+    entries = {}
+    if not text.strip():
+        return entries
+
+    position = 0
+    while True:
+        match = _SPARSE_TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Invalid sparse entry: '{text[position:].strip()}'.")
+        entries[int(match.group(1))] = _unquote(match.group(2))
+        if match.group(3) != ',':
+            return entries
+        position = match.end()
+
+
+def java_date_format_to_strftime(date_format):
+    """
+    Converts a Java SimpleDateFormat pattern, as used by ARFF date attributes, to a strftime format.
+
+    Args:
+        date_format (str): The Java date pattern (e.g. "yyyy-MM-dd'T'HH:mm:ss").
+
+    Returns:
+        str: The equivalent strftime format (e.g. "%Y-%m-%dT%H:%M:%S").
+    """
+    result = []
+    literal = False
+    position = 0
+    while position < len(date_format):
+        char = date_format[position]
+        if char == "'":
+            literal = not literal
+            position += 1
+            continue
+        if not literal:
+            for pattern, directive in _DATE_PATTERNS:
+                if date_format.startswith(pattern, position):
+                    result.append(directive)
+                    position += len(pattern)
+                    break
+            else:
+                result.append(char)
+                position += 1
+        else:
+            result.append('%%' if char == '%' else char)
+            position += 1
+    return ''.join(result)
+
+
+class ArffAttribute:
+    """
+    Description of an attribute declared in the header of an ARFF file.
+
+    Attributes:
+        name (str): The name of the attribute.
+        kind (str): The attribute type: 'numeric', 'integer', 'nominal', 'string' or 'date'.
+        values (list): The declared values of a nominal attribute, None otherwise.
+        date_format (str): The Java date pattern of a date attribute, None otherwise.
+    """
+
+    def __init__(self, name, kind, values=None, date_format=None):
+        """
+        Initializes the ArffAttribute.
+
+        Args:
+            name (str): The name of the attribute.
+            kind (str): The attribute type.
+            values (list, optional): The declared values of a nominal attribute.
+            date_format (str, optional): The Java date pattern of a date attribute.
+        """
+        self.name = name
+        self.kind = kind
+        self.values = values
+        self.date_format = date_format
+
+    @classmethod
+    def parse(cls, declaration):
+        """
+        Parses an `@attribute` declaration.
+
+        Args:
+            declaration (str): The declaration line without the `@attribute` keyword.
+
+        Returns:
+            ArffAttribute: The parsed attribute.
+
+        Raises:
+            ValueError: If the declaration is malformed or its type is not supported.
+        """
+        declaration = declaration.strip()
+        if not declaration:
+            raise ValueError("Attribute declaration without name.")
+
+        # The name may be quoted to contain spaces
+        if declaration[0] in '\'"':
+            end = declaration.find(declaration[0], 1)
+            while end > 0 and declaration[end - 1] == '\\':
+                end = declaration.find(declaration[0], end + 1)
+            if end < 0:
+                raise ValueError(f"Unterminated attribute name in '{declaration}'.")
+            name = _unquote(declaration[:end + 1])
+            type_spec = declaration[end + 1:].strip()
+        else:
+            parts = declaration.split(None, 1)
+            name = parts[0]
+            type_spec = parts[1].strip() if len(parts) > 1 else ''
+
+        if type_spec.startswith('{'):
+            closing = type_spec.rfind('}')
+            if closing < 0:
+                raise ValueError(f"Unterminated nominal specification for attribute '{name}'.")
+            return cls(name, 'nominal', values=split_values(type_spec[1:closing]))
+
+        keyword = type_spec.split(None, 1)[0].lower() if type_spec else ''
+        if keyword in ('numeric', 'real'):
+            return cls(name, 'numeric')
+        if keyword == 'integer':
+            return cls(name, 'integer')
+        if keyword == 'string':
+            return cls(name, 'string')
+        if keyword == 'date':
+            parts = type_spec.split(None, 1)
+            date_format = _unquote(parts[1].strip()) if len(parts) > 1 else _DEFAULT_DATE_FORMAT
+            return cls(name, 'date', date_format=date_format)
+        raise ValueError(f"Unsupported type '{type_spec}' for attribute '{name}'.")
+
+
+class _NumericColumn:
+    """
+    Accumulates the values of a numeric or integer attribute in a compact float buffer.
+    """
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.reset()
+
+    def reset(self):
+        self.buffer = array('d')
+
+    def append(self, value):
+        self.buffer.append(math.nan if value is None else float(value))
+
+    def append_default(self):
+        self.buffer.append(0.0)
+
+    def build(self):
+        values = np.frombuffer(self.buffer, dtype=np.float64) if len(self.buffer) else np.empty(0, dtype=np.float64)
+        if self.attribute.kind == 'integer' and not np.isnan(values).any():
+            return values.astype(np.int64)
+        return values
+
+
+class _NominalColumn:
+    """
+    Accumulates the values of a nominal attribute as integer codes of its declared values.
+    """
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.codes_by_value = {value: code for code, value in enumerate(attribute.values)}
+        self.reset()
+
+    def reset(self):
+        self.buffer = array('i')
+
+    def append(self, value):
+        if value is None:
+            self.buffer.append(-1)
+            return
+        code = self.codes_by_value.get(value)
+        if code is None:
+            raise ValueError(f"Value '{value}' is not declared for nominal attribute '{self.attribute.name}'.")
+        self.buffer.append(code)
+
+    def append_default(self):
+        self.buffer.append(0)
+
+    def build(self):
+        codes = np.frombuffer(self.buffer, dtype=np.int32) if len(self.buffer) else np.empty(0, dtype=np.int32)
+        return pd.Categorical.from_codes(codes, categories=self.attribute.values)
+
+
+class _StringColumn:
+    """
+    Accumulates the values of a string or date attribute as Python objects.
+    """
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.reset()
+
+    def reset(self):
+        self.buffer = []
+
+    def append(self, value):
+        self.buffer.append(value)
+
+    def append_default(self):
+        self.buffer.append('')
+
+    def build(self):
+        if self.attribute.kind == 'date':
+            date_format = java_date_format_to_strftime(self.attribute.date_format)
+            return pd.to_datetime(pd.Series(self.buffer, dtype=object), format=date_format, errors='coerce').to_numpy()
+        return np.array(self.buffer, dtype=object)
+
+
+_COLUMN_TYPES = {
+    'numeric': _NumericColumn,
+    'integer': _NumericColumn,
+    'nominal': _NominalColumn,
+    'string': _StringColumn,
+    'date': _StringColumn,
+}
+
+
+class ArffReader:
+    """
+    Single-pass reader of ARFF files into pandas DataFrames.
+
+    The header is parsed when the reader is created. The `@data` section is then parsed
+    line by line, in dense or sparse format, directly into typed column buffers.
+
+    Attributes:
+        relation (str): The name of the relation declared in the header.
+        attributes (list): The ArffAttribute objects declared in the header.
+
+    Methods:
+        iter_chunks(chunksize): Yields the data as DataFrames of up to `chunksize` rows.
+        read(): Reads all the data into a single DataFrame.
+
+    Example:
+        >>> with open('data/raw/iris.arff', 'r', encoding='utf-8') as stream:
+        ...     dataframe = ArffReader(stream).read()
+    """
+
+    def __init__(self, stream):
+        """
+        Initializes the ArffReader and parses the header of the ARFF file.
+
+        Args:
+            stream (io.TextIOBase): A text stream positioned at the start of the ARFF file.
+
+        Raises:
+            ValueError: If the header is malformed or has no `@data` section.
+        """
+        self._stream = stream
+        self._line_number = 0
+        self.relation = None
+        self.attributes = []
+        self._parse_header()
+
+    def _parse_header(self):
+        """
+        Parses the `@relation` and `@attribute` declarations up to the `@data` marker.
+
+        Raises:
+            ValueError: If a declaration is malformed or the `@data` section is missing.
+        """
+        for line in self._stream:
+            self._line_number += 1
+            line = line.strip()
+            if not line or line.startswith('%'):
+                continue
+            keyword = line.split(None, 1)[0].lower()
+            if keyword == '@relation':
+                self.relation = _unquote(line[len('@relation'):].strip())
+            elif keyword == '@attribute':
+                try:
+                    self.attributes.append(ArffAttribute.parse(line[len('@attribute'):]))
+                except ValueError as e:
+                    raise ValueError(f"Line {self._line_number}: {e}") from e
+            elif keyword == '@data':
+                if not self.attributes:
+                    raise ValueError("The ARFF header does not declare any attribute.")
+                return
+            else:
+                raise ValueError(f"Line {self._line_number}: unexpected header line '{line}'.")
+        raise ValueError("The ARFF file has no @data section.")
+
+    def iter_chunks(self, chunksize=None, usecols=None):
+        """
+        Parses the `@data` section and yields it as DataFrames.
+
+        Args:
+            chunksize (int, optional): The maximum number of rows per DataFrame. If None, all
+                the data is yielded as a single DataFrame.
+            usecols (callable, optional): A function that receives an attribute name and
+                returns whether the attribute has to be kept. Values of the other attributes
+                are skipped without being converted or stored.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the data, indexed by their row number.
+
+        Raises:
+            ValueError: If a data line is malformed or contains an undeclared nominal value.
+        """
+        columns = [
+            _COLUMN_TYPES[attribute.kind](attribute) if usecols is None or usecols(attribute.name) else None
+            for attribute in self.attributes
+        ]
+        num_attributes = len(columns)
+        start = 0
+        num_rows = 0
+
+        for line in self._stream:
+            self._line_number += 1
+            line = line.strip()
+            if not line or line.startswith('%'):
+                continue
+
+            try:
+                if line.startswith('{'):
+                    entries = split_sparse_values(line[1:line.rindex('}')])
+                    for index, column in enumerate(columns):
+                        if column is None:
+                            continue
+                        if index in entries:
+                            column.append(entries[index])
+                        else:
+                            column.append_default()
+                else:
+                    values = split_values(line)
+                    if len(values) != num_attributes:
+                        raise ValueError(f"expected {num_attributes} values but found {len(values)}.")
+                    for column, value in zip(columns, values):
+                        if column is not None:
+                            column.append(value)
+            except ValueError as e:
+                raise ValueError(f"Line {self._line_number}: {e}") from e
+
+            num_rows += 1
+            if chunksize and num_rows == chunksize:
+                yield self._build_chunk(columns, start, num_rows)
+                start += num_rows
+                num_rows = 0
+
+        if num_rows or start == 0:
+            yield self._build_chunk(columns, start, num_rows)
+
+    def read(self, usecols=None):
+        """
+        Reads all the data of the ARFF file into a single DataFrame.
+
+        Args:
+            usecols (callable, optional): A function that receives an attribute name and
+                returns whether the attribute has to be kept.
+
+        Returns:
+            pd.DataFrame: The data of the ARFF file.
+        """
+        return next(self.iter_chunks(usecols=usecols))
+
+    def _build_chunk(self, columns, start, num_rows):
+        """
+        Builds a DataFrame from the accumulated column buffers and resets them.
+
+        Args:
+            columns (list): The column buffers.
+            start (int): The row number of the first row of the chunk.
+            num_rows (int): The number of rows of the chunk.
+
+        Returns:
+            pd.DataFrame: The chunk.
+        """
+        selected = [column for column in columns if column is not None]
+        data = {column.attribute.name: column.build() for column in selected}
+        chunk = pd.DataFrame(data, index=pd.RangeIndex(start, start + num_rows), copy=False)
+        for column in selected:
+            column.reset()
+        return chunk
+
+
+def quote_value(value):
+    """
+    Formats a value so it can be written in an ARFF file.
+
+    Values with whitespace, commas, quotes, braces or the missing value marker are enclosed
+    in single quotes and escaped.
+
+    Args:
+        value (str): The value to format.
+
+    Returns:
+        str: The formatted value.
+    """
+    value = str(value)
+    if not _NEEDS_QUOTES.search(value):
+        return value
+    return "'" + ''.join(_WRITE_ESCAPES.get(char, char) for char in value) + "'"
+
+
+class ArffWriter:
+    """
+    Writer of pandas DataFrames to ARFF files.
+
+    The attributes are declared from the dtypes of the first DataFrame written: numeric
+    columns become NUMERIC (or INTEGER) attributes, categorical columns become nominal
+    attributes with their categories, datetime columns become DATE attributes and any other
+    column becomes a STRING attribute. Every DataFrame passed to `write` is appended to the
+    `@data` section, so a dataset can be written in chunks.
+
+    Attributes:
+        relation (str): The name of the relation written in the header.
+        attributes (list): The ArffAttribute objects declared in the header, once written.
+
+    Example:
+        >>> with open('data/processed/iris.arff', 'w', encoding='utf-8') as stream:
+        ...     ArffWriter(stream, 'iris').write(dataframe)
+    """
+
+    def __init__(self, stream, relation):
+        """
+        Initializes the ArffWriter.
+
+        Args:
+            stream (io.TextIOBase): A writable text stream.
+            relation (str): The name of the relation.
+        """
+        self._stream = stream
+        self.relation = relation
+        self.attributes = None
+
+    @staticmethod
+    def _declare(name, column):
+        """
+        Builds the attribute that describes a DataFrame column.
+
+        Args:
+            name (str): The name of the column.
+            column (pd.Series): The column.
+
+        Returns:
+            ArffAttribute: The attribute.
+        """
+        dtype = column.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            return ArffAttribute(name, 'nominal', values=[str(value) for value in dtype.categories])
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return ArffAttribute(name, 'integer')
+        if pd.api.types.is_numeric_dtype(dtype):
+            return ArffAttribute(name, 'numeric')
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return ArffAttribute(name, 'date', date_format=_DEFAULT_DATE_FORMAT)
+        return ArffAttribute(name, 'string')
+
+    def _write_header(self, dataframe):
+        """
+        Declares the attributes from the columns of a DataFrame and writes the header.
+
+        Args:
+            dataframe (pd.DataFrame): The first DataFrame to write.
+        """
+        self.attributes = [self._declare(str(name), dataframe[name]) for name in dataframe.columns]
+        lines = [f"@relation {quote_value(self.relation)}", ""]
+        for attribute in self.attributes:
+            if attribute.kind == 'nominal':
+                type_spec = '{' + ','.join(quote_value(value) for value in attribute.values) + '}'
+            elif attribute.kind == 'date':
+                type_spec = f'date "{attribute.date_format}"'
+            else:
+                type_spec = attribute.kind
+            lines.append(f"@attribute {quote_value(attribute.name)} {type_spec}")
+        lines.extend(["", "@data", ""])
+        self._stream.write('\n'.join(lines))
+
+    def _format_column(self, attribute, column):
+        """
+        Formats the values of a column as ARFF tokens.
+
+        Args:
+            attribute (ArffAttribute): The declared attribute of the column.
+            column (pd.Series): The column.
+
+        Returns:
+            np.ndarray: The formatted values, with '?' for missing values.
+
+        Raises:
+            ValueError: If a nominal column has values that are not declared in the header.
+        """
+        missing = column.isna().to_numpy()
+        if attribute.kind == 'nominal':
+            # Format every category once and take the formatted values by code
+            categories = [str(value) for value in column.cat.categories]
+            if not set(categories) <= set(attribute.values):
+                raise ValueError(f"Column '{attribute.name}' has values that are not declared for its nominal attribute.")
+            formatted = np.array([quote_value(value) for value in categories] + ['?'], dtype=object)
+            return formatted[column.cat.codes.to_numpy()]
+        if attribute.kind == 'date':
+            values = column.dt.strftime(java_date_format_to_strftime(attribute.date_format)).to_numpy(dtype=object)
+            values = np.array([quote_value(value) for value in values], dtype=object)
+        elif attribute.kind == 'string':
+            values = np.array([quote_value(value) for value in column.to_numpy(dtype=object)], dtype=object)
+        else:
+            values = column.astype(int) if pd.api.types.is_bool_dtype(column.dtype) else column
+            values = values.astype(str).to_numpy(dtype=object)
+        values[missing] = '?'
+        return values
+
+    def write(self, dataframe):
+        """
+        Appends the rows of a DataFrame to the `@data` section, writing the header first if needed.
+
+        Args:
+            dataframe (pd.DataFrame): The rows to write. Its columns must match the columns of
+                the first DataFrame written.
+
+        Raises:
+            ValueError: If the columns do not match the declared attributes.
+        """
+        if self.attributes is None:
+            self._write_header(dataframe)
+        elif [str(name) for name in dataframe.columns] != [attribute.name for attribute in self.attributes]:
+            raise ValueError("The columns of the DataFrame do not match the declared ARFF attributes.")
+        if dataframe.empty:
+            return
+
+        columns = [pd.Series(self._format_column(attribute, dataframe.iloc[:, index])) for index, attribute in enumerate(self.attributes)]
+        lines = columns[0].str.cat(columns[1:], sep=',') if len(columns) > 1 else columns[0]
+        self._stream.write('\n'.join(lines))
+        self._stream.write('\n')
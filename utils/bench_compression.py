@@ -0,0 +1,109 @@
+"""
+Module: utils.bench_compression
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module benchmarks the throughput of the CSV loader on compressed inputs versus the uncompressed file. It generates a CSV file with random numerical data, writes compressed copies of it with every available codec (gzip, bz2, xz and, if installed, zstandard), and measures how long `csv_loader` takes to parse each one with streaming decompression. Throughput is reported in megabytes of uncompressed CSV per second.
+
+Usage:
+    python -m utils.bench_compression --rows 1000000 --repeats 3
+
+"""
+
+import os
+import io
+import bz2
+import gzip
+import lzma
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from plugins.data_io.csv_loader import csv_loader
+
+
+def write_compressed_copies(source_path, output_dir):
+    """
+    Writes a compressed copy of a file with every available codec.
+
+    Args:
+        source_path (str): The path to the uncompressed file.
+        output_dir (str): The directory where the compressed copies are written.
+
+    Returns:
+        dict: The path of each copy, keyed by codec name. The uncompressed file is included as 'none'.
+    """
+    openers = {'gzip': ('gz', gzip.open), 'bz2': ('bz2', bz2.open), 'xz': ('xz', lzma.open)}
+    try:
+        import zstandard
+        openers['zstd'] = ('zst', zstandard.open)
+    except ImportError:
+        print("zstandard is not installed: skipping the Zstandard benchmark.")
+
+    paths = {'none': source_path}
+    for codec, (extension, opener) in openers.items():
+        target_path = os.path.join(output_dir, f"{os.path.basename(source_path)}.{extension}")
+        with open(source_path, 'rb') as source, opener(target_path, 'wb') as target:
+            shutil.copyfileobj(source, target, length=io.DEFAULT_BUFFER_SIZE * 64)
+        paths[codec] = target_path
+    return paths
+
+
+def benchmark_load(path, repeats):
+    """
+    Measures the best time of loading a CSV file with `csv_loader`.
+
+    Args:
+        path (str): The path to the (possibly compressed) CSV file.
+        repeats (int): The number of timed loads.
+
+    Returns:
+        float: The best load time, in seconds.
+    """
+    loader = csv_loader()
+    loader._config["optimize_dtypes"] = "off"
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loader.load(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Runs the compression benchmark and prints a table with the results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the CSV loader on compressed inputs.')
+    parser.add_argument('--rows', type=int, default=1000000, help='Number of rows of the generated CSV file.')
+    parser.add_argument('--columns', type=int, default=8, help='Number of columns of the generated CSV file.')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of timed loads per file.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        source_path = os.path.join(output_dir, 'benchmark.csv')
+        data = pd.DataFrame(np.random.rand(args.rows, args.columns) * 100, columns=[f"Column_{i + 1}" for i in range(args.columns)])
+        data.to_csv(source_path, index=False)
+        uncompressed_mb = os.path.getsize(source_path) / (1024 * 1024)
+
+        results = []
+        for codec, path in write_compressed_copies(source_path, output_dir).items():
+            seconds = benchmark_load(path, args.repeats)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            results.append((codec, size_mb, uncompressed_mb / size_mb, seconds, uncompressed_mb / seconds))
+
+    print(f"\nCSV file: {args.rows} rows x {args.columns} columns, {uncompressed_mb:.1f} MB uncompressed (best of {args.repeats})")
+    print(f"{'Codec':<8}{'Size (MB)':>12}{'Ratio':>8}{'Time (s)':>11}{'MB/s':>9}{'vs none':>10}")
+    baseline = results[0][3]
+    for codec, size_mb, ratio, seconds, throughput in results:
+        print(f"{codec:<8}{size_mb:>12.1f}{ratio:>8.2f}{seconds:>11.3f}{throughput:>9.1f}{baseline / seconds:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
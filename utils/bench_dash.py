@@ -0,0 +1,209 @@
+"""
+Module: utils.bench_dash
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module load-tests the Dash server of the `interactive_graph_viewer` plugin. A synthetic dataset is generated, the app is served in development mode (one threaded server) and in production mode (worker processes sharing the dataset through memory-mapped files), and concurrent clients post the requests the browser sends when the user changes the chart (scatter, line, histogram, box, bar and heatmap charts of several columns) to the callback endpoint of Dash. For every mode the benchmark reports the callbacks served per second, the latency percentiles and the failed requests. The figure cache is disabled by default so every callback builds its figure; `--figure-cache-mb` enables it.
+
+Usage:
+    python -m utils.bench_dash --rows 1000000 --workers 4 --requests 200 --concurrency 8
+
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Root directory of the CLI (where main.py lives), so the plugins can be imported
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+# Charts requested by the clients: (chart type, x column, y column, color column)
+DEFAULT_CHARTS = [
+    ('scatter', 'a', 'b', 'None'),
+    ('scatter', 'c', 'd', 'label'),
+    ('line', 'e', 'a', 'None'),
+    ('histogram', 'a', 'b', 'label'),
+    ('box', 'e', 'c', 'label'),
+    ('bar', 'e', 'b', 'label'),
+    ('heatmap', 'a', 'b', 'None'),
+]
+
+
+def synthetic_frame(rows, seed=42):
+    """
+    Generates the benchmark dataset.
+
+    Args:
+        rows (int): The number of rows.
+        seed (int): The seed of the random values.
+
+    Returns:
+        pd.DataFrame: Four float columns ('a' to 'd'), an increasing integer column ('e')
+        and a text column with five classes ('label').
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(rows, 4)), columns=['a', 'b', 'c', 'd'])
+    frame['e'] = np.arange(rows)
+    frame['label'] = pd.Categorical.from_codes(rng.integers(0, 5, rows), [f"class{i}" for i in range(5)]).astype(str)
+    return frame
+
+
+def callback_payload(chart_type, x_axis, y_axis, color_column):
+    """
+    Builds the body of the request the browser sends when the chart options change.
+
+    Args:
+        chart_type (str): The chart type.
+        x_axis (str): The x column.
+        y_axis (str): The y column.
+        color_column (str): The color column ('None' for no color).
+
+    Returns:
+        bytes: The JSON body.
+    """
+    return json.dumps({
+        'output': 'graph.figure',
+        'outputs': {'id': 'graph', 'property': 'figure'},
+        'inputs': [
+            {'id': 'chart-type', 'property': 'value', 'value': chart_type},
+            {'id': 'x-axis', 'property': 'value', 'value': x_axis},
+            {'id': 'y-axis', 'property': 'value', 'value': y_axis},
+            {'id': 'color-column', 'property': 'value', 'value': color_column},
+            {'id': 'graph', 'property': 'relayoutData', 'value': None},
+        ],
+        'changedPropIds': ['chart-type.value'],
+    }).encode()
+
+
+def post_callback(url, payload):
+    """
+    Posts a callback request and reads the whole response.
+
+    Args:
+        url (str): The URL of the server.
+        payload (bytes): The JSON body.
+
+    Returns:
+        tuple: The latency in seconds and whether the request succeeded.
+    """
+    request = urllib.request.Request(url + '_dash-update-component', data=payload, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=300) as response:
+            response.read()
+            ok = response.status == 200
+    except OSError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def load_test(url, payloads, requests, concurrency):
+    """
+    Sends callback requests from concurrent clients.
+
+    Args:
+        url (str): The URL of the server.
+        payloads (list): The request bodies, sent in turn.
+        requests (int): The total number of requests.
+        concurrency (int): The number of concurrent clients.
+
+    Returns:
+        dict: The callbacks per second, the 50th, 95th and 99th latency percentiles (ms) and
+        the number of failed requests.
+    """
+    import numpy as np
+
+    bodies = list(itertools.islice(itertools.cycle(payloads), requests))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda body: post_callback(url, body), bodies))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    return {
+        'rate': requests / elapsed,
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95)),
+        'p99': float(np.percentile(latencies, 99)),
+        'failed': sum(not ok for _, ok in results),
+    }
+
+
+def benchmark_mode(frame, mode, args, payloads):
+    """
+    Serves the dataset in a server mode and load-tests it.
+
+    Args:
+        frame (pd.DataFrame): The dataset.
+        mode (str): 'development' or 'production'.
+        args (argparse.Namespace): The options of the benchmark.
+        payloads (list): The request bodies.
+
+    Returns:
+        tuple: The seconds taken to start the server and the results of `load_test`.
+    """
+    from plugins.visualization.interactive_graph_viewer import interactive_graph_viewer
+
+    viewer = interactive_graph_viewer()
+    viewer._config.update({'server': mode, 'port': 0, 'workers': args.workers, 'figure_cache_mb': args.figure_cache_mb})
+    start = time.perf_counter()
+    viewer.visualize(frame)
+    started = time.perf_counter() - start
+    try:
+        # One request per chart first, so every worker process has imported what the callbacks use
+        load_test(viewer.url, payloads, len(payloads), args.concurrency)
+        return started, load_test(viewer.url, payloads, args.requests, args.concurrency)
+    finally:
+        viewer.stop_server()
+
+
+def main():
+    """
+    Runs the Dash server benchmark and prints a table with the results. Exits with an error
+    if any request failed.
+    """
+    parser = argparse.ArgumentParser(description='Load-test the Dash server of interactive_graph_viewer.')
+    parser.add_argument('--rows', type=int, default=1000000, help='Number of rows of the synthetic dataset.')
+    parser.add_argument('--requests', type=int, default=200, help='Number of callback requests per server mode.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent clients.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes of the production server (all CPU cores by default).')
+    parser.add_argument('--figure-cache-mb', type=float, default=0, help='Size of the figure cache, in MB (0 disables it).')
+    parser.add_argument('--mode', action='append', choices=['development', 'production'], default=[], help='Server mode to benchmark (can be repeated; both by default).')
+    args = parser.parse_args()
+
+    import logging
+    from core.logging_config import logger
+
+    # The callbacks log every figure they build, and Werkzeug every request
+    logger.setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    frame = synthetic_frame(args.rows)
+    payloads = [callback_payload(*chart) for chart in DEFAULT_CHARTS]
+
+    failures = 0
+    print(f"{'Mode':<13}{'Start (s)':>10}{'Callbacks/s':>13}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'Failed':>8}")
+    for mode in args.mode or ['development', 'production']:
+        started, result = benchmark_mode(frame, mode, args, payloads)
+        failures += result['failed']
+        print(f"{mode:<13}{started:>10.2f}{result['rate']:>13.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}{result['failed']:>8}")
+
+    if failures:
+        print(f"\n{failures} callback request(s) failed.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Module: utils.bench_startup
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module benchmarks the cold start of the DataSphere CLI. Every command is run in a fresh interpreter with `python -X importtime main.py <command>`, and the import report written by the interpreter is parsed to obtain the total import time, the slowest top-level imports and which heavy libraries (pandas, numpy, plotly, dash, openpyxl, pyarrow, scipy, matplotlib) were imported. The wall time of each run is also reported. Commands can declare heavy libraries they must not import (e.g. `help` must not import any), and an import time budget can be given, so the benchmark exits with an error when a change makes the startup regress.
+
+Usage:
+    python -m utils.bench_startup --repeats 3 --budget-ms 150
+
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Libraries whose import dominates the startup time
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly', 'dash', 'openpyxl', 'pyarrow', 'scipy', 'matplotlib')
+
+# Lines of the import report: "import time: self [us] | cumulative | imported package"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Root directory of the CLI (where main.py lives)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_commands(data_path, output_path):
+    """
+    Returns the commands benchmarked by default.
+
+    Args:
+        data_path (str): The path to a CSV file used by the data commands.
+        output_path (str): The path written by the save command.
+
+    Returns:
+        list: (name, command string, forbidden heavy modules) tuples.
+    """
+    return [
+        ('help', 'help', HEAVY_MODULES),
+        ('load_data', f"load_data={data_path} cache=off", ('plotly', 'dash', 'openpyxl', 'scipy', 'matplotlib')),
+        ('load+save', f"load_data={data_path} cache=off save={output_path}", ('plotly', 'dash', 'openpyxl', 'scipy', 'matplotlib')),
+    ]
+
+
+def parse_import_report(report):
+    """
+    Parses the import report written by `python -X importtime`.
+
+    Args:
+        report (str): The standard error of the interpreter.
+
+    Returns:
+        tuple: The total import time in microseconds (sum of the cumulative time of the
+        top-level imports), a list of (cumulative microseconds, module) tuples of the
+        top-level imports, and the set of imported module names.
+    """
+    total = 0
+    top_level = []
+    modules = set()
+    for line in report.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), match.group(3), match.group(4)
+        modules.add(module)
+        if len(indent) <= 1:
+            total += cumulative
+            top_level.append((cumulative, module))
+    return total, top_level, modules
+
+
+def run_command(command, cwd):
+    """
+    Runs the CLI with a command in a fresh interpreter and collects its import report.
+
+    Args:
+        command (str): The command string passed to main.py.
+        cwd (str): The working directory of the interpreter.
+
+    Returns:
+        tuple: The wall time in seconds, the exit code and the import report.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(PROJECT_DIR, 'main.py'), command],
+        cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return time.perf_counter() - start, process.returncode, process.stderr
+
+
+def benchmark_command(command, repeats):
+    """
+    Measures the best import time and wall time of a command over several runs.
+
+    Args:
+        command (str): The command string passed to main.py.
+        repeats (int): The number of runs.
+
+    Returns:
+        dict: The best import time (ms), best wall time (ms), exit code, slowest top-level
+        imports and imported heavy modules.
+    """
+    best = None
+    for _ in range(repeats):
+        seconds, returncode, report = run_command(command, PROJECT_DIR)
+        total, top_level, modules = parse_import_report(report)
+        if best is None or total < best['import_ms'] * 1000:
+            best = {
+                'import_ms': total / 1000,
+                'slowest': sorted(top_level, reverse=True)[:3],
+                'heavy': sorted(name for name in HEAVY_MODULES if name in modules),
+                'returncode': returncode,
+            }
+        best['wall_ms'] = min(best.get('wall_ms', float('inf')), seconds * 1000)
+    return best
+
+
+def main():
+    """
+    Runs the startup benchmark, prints a table with the results and exits with an error if a
+    command imports a forbidden heavy module or exceeds the import time budget.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the cold start of the DataSphere CLI.')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of runs per command (the best run is reported).')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Maximum import time of the help command, in milliseconds.')
+    parser.add_argument('--command', action='append', default=[], help='Additional command string to benchmark (can be repeated).')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_path = os.path.join(work_dir, 'startup.csv')
+        with open(data_path, 'w', encoding='utf-8') as file:
+            file.write('a,b,label\n' + ''.join(f"{i},{i * 0.5},c{i % 3}\n" for i in range(1000)))
+        commands = default_commands(data_path, os.path.join(work_dir, 'startup.feather'))
+        commands += [(command.split('=', 1)[0], command, ()) for command in args.command]
+
+        print(f"{'Command':<12}{'Import (ms)':>13}{'Wall (ms)':>11}  {'Heavy modules':<40}Slowest top-level imports")
+        for name, command, forbidden in commands:
+            result = benchmark_command(command, args.repeats)
+            slowest = ', '.join(f"{module} {cumulative / 1000:.0f}ms" for cumulative, module in result['slowest'])
+            print(f"{name:<12}{result['import_ms']:>13.1f}{result['wall_ms']:>11.1f}  {', '.join(result['heavy']) or '-':<40}{slowest}")
+
+            if result['returncode'] != 0:
+                failures.append(f"'{command}' exited with code {result['returncode']}")
+            imported = [module for module in result['heavy'] if module in forbidden]
+            if imported:
+                failures.append(f"'{name}' imports {', '.join(imported)}")
+            if name == 'help' and args.budget_ms is not None and result['import_ms'] > args.budget_ms:
+                failures.append(f"'help' imports take {result['import_ms']:.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    if failures:
+        print("\nStartup regressions:\n  " + '\n  '.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+"""
+Module: utils.chart_aggregation
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module computes on the server the aggregates drawn by histogram, box and bar charts, so only the aggregates are sent to the browser instead of every row and the size of a figure does not depend on the number of rows. The rows are split into groups (e.g. one per value of the color column) by `group_codes`, which encodes the key columns as integer codes, and every aggregate is computed for all the groups at once with vectorized NumPy operations (numeric x and color columns with too many distinct values are first binned by `coarsen`, and other color columns keep their most frequent values with `limit_categories`): `histogram` counts the values of every group in shared bins, `box_statistics` computes the quartiles (with linear interpolation, as Plotly), whiskers and a bounded sample of the outliers of every group from a single sort, and `group_sums` adds the values of every group.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+# Maximum number of bins chosen automatically for a histogram
+MAX_AUTO_BINS = 200
+
+# Default maximum number of outliers drawn per box
+DEFAULT_MAX_OUTLIERS = 1000
+
+# Default maximum number of distinct x values of box and bar charts before they are binned
+DEFAULT_MAX_GROUPS = 200
+
+# Label of the group that holds the values left out by `limit_categories`
+OTHER_LABEL = 'Other'
+
+
+def group_codes(*keys):
+    """
+    Encodes the combinations of values of several key columns as integer group codes.
+
+    Args:
+        *keys (pd.Series): The key columns, all of the same length.
+
+    Returns:
+        tuple: The group code of every row (-1 for rows with a missing key) and, for every
+            key column, an array with its value in every group.
+    """
+    if not keys:
+        return np.zeros(0, dtype=np.intp), []
+    num_rows = len(keys[0])
+    factorized = [pd.factorize(key) for key in keys]
+    missing = np.zeros(num_rows, dtype=bool)
+    for codes, _ in factorized:
+        missing |= codes < 0
+    sizes = [max(len(uniques), 1) for _, uniques in factorized]
+    combined = np.ravel_multi_index([np.where(missing, 0, codes) for codes, _ in factorized], sizes)
+    groups, codes = np.unique(combined[~missing], return_inverse=True)
+    group_of_row = np.full(num_rows, -1, dtype=np.intp)
+    group_of_row[~missing] = codes.reshape(-1)
+    labels = [np.asarray(uniques)[positions] for (_, uniques), positions in zip(factorized, np.unravel_index(groups, sizes))]
+    return group_of_row, labels
+
+
+def coarsen(series, max_groups=DEFAULT_MAX_GROUPS):
+    """
+    Replaces the values of a numeric column with more than `max_groups` distinct values by
+    the centers of `max_groups` equal-width bins, so they can be used as group keys.
+
+    Args:
+        series (pd.Series): The column.
+        max_groups (int): The maximum number of distinct values.
+
+    Returns:
+        tuple: The column with at most `max_groups` distinct values and the width of the
+            bins (None if the column was not binned).
+    """
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series) or series.nunique() <= max_groups:
+        return series, None
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    edges = np.linspace(np.nanmin(values), np.nanmax(values), max_groups + 1)
+    positions = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, max_groups - 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    return pd.Series(np.where(np.isnan(values), np.nan, centers[positions]), index=series.index, name=series.name), float(edges[1] - edges[0])
+
+
+def limit_categories(series, max_groups=DEFAULT_MAX_GROUPS, other=OTHER_LABEL):
+    """
+    Keeps the `max_groups - 1` most frequent values of a column with more than `max_groups`
+    distinct values and replaces the rest by a single `other` value.
+
+    Args:
+        series (pd.Series): The column.
+        max_groups (int): The maximum number of distinct values.
+        other (str): The value that replaces the less frequent values.
+
+    Returns:
+        tuple: The column with at most `max_groups` distinct values and the number of values
+            replaced by `other` (0 if the column was not limited).
+    """
+    codes, uniques = pd.factorize(series)
+    if len(uniques) <= max_groups:
+        return series, 0
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    kept = np.zeros(len(uniques), dtype=bool)
+    kept[np.argsort(-counts, kind='stable')[:max(max_groups - 1, 1)]] = True
+    values = np.asarray(uniques, dtype=object)[np.maximum(codes, 0)]
+    values[(codes >= 0) & ~kept[np.maximum(codes, 0)]] = other
+    values[codes < 0] = None
+    return pd.Series(values, index=series.index, name=series.name), int(len(uniques) - kept.sum())
+
+
+def split_groups(keys):
+    """
+    Splits positions by their key with a single sort.
+
+    Args:
+        keys (np.ndarray): The integer key of every position.
+
+    Returns:
+        tuple: The distinct keys, in increasing order, and a list with the positions of
+            every key, in increasing order.
+    """
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return keys, []
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    return sorted_keys[np.concatenate([[0], boundaries]).astype(np.intp)], np.split(order, boundaries)
+
+
+def histogram(values, codes, num_groups, bins='auto'):
+    """
+    Counts the values of every group in bins shared by all the groups.
+
+    Args:
+        values (np.ndarray): The values (missing values are ignored).
+        codes (np.ndarray): The group code of every value (negative codes are ignored).
+        num_groups (int): The number of groups.
+        bins (int or str): The number of bins, or a NumPy binning rule ('auto' by default,
+            limited to `MAX_AUTO_BINS` bins).
+
+    Returns:
+        tuple: The bin edges and the counts, an array with one row per group and one column per bin.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+    if len(values) == 0:
+        return np.array([0.0, 1.0]), np.zeros((num_groups, 1), dtype=np.int64)
+    if isinstance(bins, str):
+        edges = np.histogram_bin_edges(values, bins=bins)
+        if len(edges) > MAX_AUTO_BINS + 1:
+            edges = np.histogram_bin_edges(values, bins=MAX_AUTO_BINS)
+    else:
+        edges = np.histogram_bin_edges(values, bins=int(bins))
+    num_bins = len(edges) - 1
+    # The last bin includes its right edge, as in np.histogram
+    positions = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, num_bins - 1)
+    counts = np.bincount(codes * num_bins + positions, minlength=num_groups * num_bins)
+    return edges, counts.reshape(num_groups, num_bins)
+
+
+def _quantile(sorted_values, starts, counts, probability):
+    """
+    Returns a quantile of every group of a sorted array, with linear interpolation.
+
+    Args:
+        sorted_values (np.ndarray): The values, sorted by group and then by value.
+        starts (np.ndarray): The position of the first value of every group.
+        counts (np.ndarray): The number of values of every group (at least one).
+        probability (float): The probability of the quantile.
+
+    Returns:
+        np.ndarray: The quantile of every group.
+    """
+    position = probability * (counts - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, counts - 1)
+    fraction = position - lower
+    return sorted_values[starts + lower] + fraction * (sorted_values[starts + upper] - sorted_values[starts + lower])
+
+
+def box_statistics(values, codes, num_groups, max_outliers=DEFAULT_MAX_OUTLIERS, seed=42):
+    """
+    Computes the statistics drawn by a box plot for every group.
+
+    The whiskers end at the most extreme values within 1.5 times the interquartile range of
+    the quartiles, and the values beyond them are outliers. At most `max_outliers` outliers
+    per group are returned (a uniform sample of them).
+
+    Args:
+        values (np.ndarray): The values (missing values are ignored).
+        codes (np.ndarray): The group code of every value (negative codes are ignored).
+        num_groups (int): The number of groups.
+        max_outliers (int): The maximum number of outliers returned per group.
+        seed (int): The seed of the sample of outliers.
+
+    Returns:
+        dict: The 'count', 'q1', 'median', 'q3', 'mean', 'lowerfence' and 'upperfence' of
+            every group (groups without values are missing), and the 'outliers' and their
+            'outlier_groups'.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values) & (codes >= 0)
+    values, codes = values[valid], codes[valid]
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+
+    counts = np.bincount(codes, minlength=num_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.intp)
+    present = counts > 0
+    statistics = {name: np.full(num_groups, np.nan) for name in ('q1', 'median', 'q3', 'mean', 'lowerfence', 'upperfence')}
+    statistics['count'] = counts
+    statistics['outliers'] = np.array([], dtype=np.float64)
+    statistics['outlier_groups'] = np.array([], dtype=np.intp)
+    if not present.any():
+        return statistics
+
+    starts_p, counts_p = starts[present], counts[present]
+    q1 = _quantile(values, starts_p, counts_p, 0.25)
+    q3 = _quantile(values, starts_p, counts_p, 0.75)
+    statistics['q1'][present] = q1
+    statistics['median'][present] = _quantile(values, starts_p, counts_p, 0.5)
+    statistics['q3'][present] = q3
+    statistics['mean'][present] = np.bincount(codes, weights=values, minlength=num_groups)[present] / counts_p
+
+    # The values of a group are sorted, so the values below the lower limit come first and those above the upper limit last
+    low_limit = np.full(num_groups, np.nan)
+    high_limit = np.full(num_groups, np.nan)
+    low_limit[present] = q1 - 1.5 * (q3 - q1)
+    high_limit[present] = q3 + 1.5 * (q3 - q1)
+    below = values < low_limit[codes]
+    above = values > high_limit[codes]
+    num_below = np.bincount(codes, weights=below, minlength=num_groups).astype(np.intp)
+    num_above = np.bincount(codes, weights=above, minlength=num_groups).astype(np.intp)
+    statistics['lowerfence'][present] = values[(starts + num_below)[present]]
+    statistics['upperfence'][present] = values[(starts + counts - 1 - num_above)[present]]
+
+    outliers = np.flatnonzero(below | above)
+    if len(outliers):
+        # A random key per outlier; the first max_outliers of every group in key order are kept
+        keys = np.random.default_rng(seed).random(len(outliers))
+        outliers = outliers[np.lexsort((keys, codes[outliers]))]
+        outlier_codes = codes[outliers]
+        first = np.searchsorted(outlier_codes, outlier_codes, side='left')
+        outliers = outliers[np.arange(len(outliers)) - first < max_outliers]
+        statistics['outliers'] = values[outliers]
+        statistics['outlier_groups'] = codes[outliers]
+    return statistics
+
+
+def group_sums(values, codes, num_groups):
+    """
+    Adds the values of every group.
+
+    Args:
+        values (np.ndarray): The values (missing values are ignored).
+        codes (np.ndarray): The group code of every value (negative codes are ignored).
+        num_groups (int): The number of groups.
+
+    Returns:
+        np.ndarray: The sum of every group.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values) & (codes >= 0)
+    return np.bincount(codes[valid], weights=values[valid], minlength=num_groups)
@@ -0,0 +1,179 @@
+"""
+Module: utils.check_sessions
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module checks that the datasets of a session do not depend on the command lines executed after they were loaded. In batch mode (`run=`) and daemon mode (`serve` and `client`) every command line runs in the same process against the same plugins, so a streamed dataset, which reads its files again every time it is used, must keep the options of its own load (`chunksize`, `columns`, `where`, `sheet_name`) even when later lines load other files with other options. A script loads a streamed dataset, then loads another file with a column selection and a filter and once more without options, and finally analyzes the streamed dataset. The script is run with `run=` and line by line through a daemon, and the check exits with an error if a line fails or the streamed dataset is not analyzed in chunks with all its columns.
+
+Usage:
+    python -m utils.check_sessions
+
+"""
+
+import os
+import re
+import sys
+import time
+import socket
+import tempfile
+import subprocess
+
+# Root directory of the CLI (where main.py lives)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rows of the streamed file and rows per chunk
+STREAMED_ROWS = 500
+STREAMED_CHUNKSIZE = 100
+
+# Seconds the daemon may take to start listening
+DAEMON_START_TIMEOUT = 60
+
+# Escape sequences of the colored log messages
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def session_script(streamed_path, other_path):
+    """
+    Returns the command lines of the check.
+
+    Args:
+        streamed_path (str): The path to the file loaded as a streamed dataset.
+        other_path (str): The path to the file loaded by the later lines.
+
+    Returns:
+        list: The command lines.
+    """
+    return [
+        f"load_data=streamed:{streamed_path} chunksize={STREAMED_CHUNKSIZE}",
+        f"load_data=narrow:{other_path} columns=p where=p>10",
+        f"load_data=full:{other_path}",
+        "dataset=streamed analyze=descriptive_stats",
+    ]
+
+
+def expected_message():
+    """
+    Returns the log message of the analysis of the streamed dataset with its own options.
+
+    Returns:
+        str: The message.
+    """
+    chunks = -(-STREAMED_ROWS // STREAMED_CHUNKSIZE)
+    return f"computed for 2 numeric columns over {STREAMED_ROWS} rows in {chunks} chunk(s)"
+
+
+def run_cli(command, timeout=300):
+    """
+    Runs the CLI with a command string in a fresh interpreter.
+
+    Args:
+        command (str): The command string passed to main.py.
+        timeout (float): The maximum number of seconds the command may take.
+
+    Returns:
+        tuple: The exit code and the output of the CLI, without color codes.
+    """
+    process = subprocess.run(
+        [sys.executable, os.path.join(PROJECT_DIR, 'main.py'), command],
+        cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=timeout
+    )
+    return process.returncode, _ANSI_ESCAPE.sub('', process.stdout)
+
+
+def check_batch(lines, work_dir):
+    """
+    Runs the command lines as a batch script.
+
+    Args:
+        lines (list): The command lines.
+        work_dir (str): The directory where the script is written.
+
+    Returns:
+        tuple: The exit code and the output of the CLI.
+    """
+    script_path = os.path.join(work_dir, 'session.txt')
+    with open(script_path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    return run_cli(f"run={script_path}")
+
+
+def check_daemon(lines, work_dir):
+    """
+    Starts a daemon and sends it the command lines one by one.
+
+    Args:
+        lines (list): The command lines.
+        work_dir (str): The directory of the daemon socket.
+
+    Returns:
+        tuple: The highest exit code of the lines and the output of the clients.
+
+    Raises:
+        RuntimeError: If the daemon does not start listening in time.
+    """
+    socket_path = os.path.join(work_dir, 'session.sock')
+    daemon = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, 'main.py'), f"serve={socket_path}"],
+        cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT
+        while not os.path.exists(socket_path):
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"The daemon did not start listening on '{socket_path}'.")
+            time.sleep(0.1)
+
+        exit_code, output = 0, ''
+        for line in lines:
+            line_code, line_output = run_cli(f"client={socket_path} {line}")
+            exit_code = max(exit_code, line_code)
+            output += line_output
+        run_cli(f"client={socket_path} shutdown")
+        daemon.wait(timeout=DAEMON_START_TIMEOUT)
+        return exit_code, output
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+            daemon.wait()
+
+
+def main():
+    """
+    Runs the session check in batch and daemon mode, prints the result of each mode and
+    exits with an error if any of them failed.
+    """
+    failures = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        streamed_path = os.path.join(work_dir, 'streamed.csv')
+        other_path = os.path.join(work_dir, 'other.csv')
+        with open(streamed_path, 'w', encoding='utf-8') as file:
+            file.write('a,b\n' + ''.join(f"{i},{i * 0.5}\n" for i in range(STREAMED_ROWS)))
+        with open(other_path, 'w', encoding='utf-8') as file:
+            file.write('p,q\n' + ''.join(f"{i},{i % 7}\n" for i in range(50)))
+        lines = session_script(streamed_path, other_path)
+
+        modes = [('run', check_batch)]
+        # The daemon listens on a Unix socket
+        if hasattr(socket, 'AF_UNIX'):
+            modes.append(('serve/client', check_daemon))
+        for mode, check in modes:
+            try:
+                exit_code, output = check(lines, work_dir)
+            except (RuntimeError, subprocess.TimeoutExpired) as e:
+                exit_code, output = 1, str(e)
+            ok = exit_code == 0 and expected_message() in output
+            print(f"{mode:<14}{'ok' if ok else 'FAILED'}")
+            if not ok:
+                failures.append(f"{mode}: exit code {exit_code}\n{output}")
+
+    if failures:
+        print("\nSession regressions:\n" + '\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Module: utils.class_index
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module implements the class filtering (`class_column` and `class_value`) shared by the visualization plugins. Class values are compared as lowercase text, so `class_value=iris-setosa` selects the rows of `Iris-setosa` in every plugin, whatever the type of the column. Instead of converting and lowercasing the whole column on every call, the column is factorized once into integer codes and only its distinct values are normalized. The `ClassIndex` class keeps, for every normalized value, the positions of its rows, so a filter takes time proportional to the number of matching rows; the indexes of the datasets in use are kept by `class_index_cache`, keyed by dataset and column. Streamed chunks are filtered with `class_mask`, which uses the same normalization without building an index.
+
+"""
+
+import weakref
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from core.logging_config import logger
+
+# Number of class indexes kept by the cache
+DEFAULT_CACHE_ENTRIES = 32
+
+
+def normalize_class_value(value):
+    """
+    Returns the normalized form of a class value used for comparisons.
+
+    Args:
+        value: The class value.
+
+    Returns:
+        str: The value as lowercase text.
+    """
+    return str(value).lower()
+
+
+def resolve_class_column(columns, class_column):
+    """
+    Returns the column of a dataset named by `class_column`. An exact match is preferred,
+    otherwise the name is matched case-insensitively.
+
+    Args:
+        columns (iterable): The column names of the dataset.
+        class_column (str): The requested column name.
+
+    Returns:
+        The column name, or None if the dataset has no such column.
+    """
+    columns = list(columns)
+    if class_column in columns:
+        return class_column
+    matches = [column for column in columns if normalize_class_value(column) == normalize_class_value(class_column)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _factorize(series):
+    """
+    Encodes a column as integer codes of its normalized distinct values.
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        tuple: The codes of the rows (-1 for missing values) and the normalized values, one per code.
+    """
+    codes, uniques = pd.factorize(series, sort=False)
+    normalized = [normalize_class_value(value) for value in uniques]
+    # Distinct values with the same normalized form (e.g. 'A' and 'a') share a code
+    keys = sorted(set(normalized))
+    positions = {key: code for code, key in enumerate(keys)}
+    # The last entry maps the code of missing values (-1) to itself
+    remap = np.array([positions[value] for value in normalized] + [-1], dtype=np.intp)
+    return remap[codes], keys
+
+
+def class_mask(series, class_value):
+    """
+    Returns which rows of a column match a class value.
+
+    Args:
+        series (pd.Series): The column.
+        class_value: The class value.
+
+    Returns:
+        np.ndarray: A boolean mask of the rows.
+    """
+    codes, keys = _factorize(series)
+    value = normalize_class_value(class_value)
+    if value not in keys:
+        return np.zeros(len(series), dtype=bool)
+    return codes == keys.index(value)
+
+
+class ClassIndex:
+    """
+    Positions of the rows of every class value of a column.
+
+    Attributes:
+        values (list): The normalized class values.
+        num_rows (int): The number of rows of the column.
+
+    Methods:
+        rows(class_value): Returns the positions of the rows of a class value.
+        filter(frame, class_value): Returns the rows of a DataFrame with a class value.
+    """
+
+    def __init__(self, series):
+        """
+        Builds the index of a column.
+
+        Args:
+            series (pd.Series): The column.
+        """
+        codes, self.values = _factorize(series)
+        self.num_rows = len(codes)
+        # A stable sort keeps the rows of every class in their original order
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        start = int(np.count_nonzero(codes < 0))
+        bounds = start + np.concatenate([[0], np.cumsum(counts)])
+        self._rows = {value: order[bounds[code]:bounds[code + 1]] for code, value in enumerate(self.values)}
+
+    def rows(self, class_value):
+        """
+        Returns the positions of the rows of a class value.
+
+        Args:
+            class_value: The class value.
+
+        Returns:
+            np.ndarray: The positions, in increasing order.
+        """
+        return self._rows.get(normalize_class_value(class_value), np.array([], dtype=np.intp))
+
+    def filter(self, frame, class_value, limit=None):
+        """
+        Returns the rows of a DataFrame with a class value.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame the index was built from.
+            class_value: The class value.
+            limit (int, optional): The maximum number of rows returned (the first ones).
+
+        Returns:
+            pd.DataFrame: The matching rows.
+        """
+        return frame.take(self.rows(class_value)[:limit])
+
+
+class ClassIndexCache:
+    """
+    Least recently used cache of class indexes, keyed by DataFrame and column.
+
+    An entry is only returned while its DataFrame is alive, so a new DataFrame that reuses
+    the memory address of a discarded one never gets its index. DataFrames are assumed not
+    to be modified in place while they are cached.
+
+    Attributes:
+        max_entries (int): The maximum number of cached indexes.
+
+    Methods:
+        get(frame, class_column): Returns the class index of a column, building it on a cache miss.
+        clear(): Removes every entry.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached indexes.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Plugins run in several threads
+        self._lock = threading.Lock()
+
+    def get(self, frame, class_column):
+        """
+        Returns the class index of a column of a DataFrame.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            class_column (str): The column name.
+
+        Returns:
+            ClassIndex: The index.
+        """
+        key = (id(frame), class_column)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is frame:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        index = ClassIndex(frame[class_column])
+        logger.info(f"Class index of column '{class_column}' built: {len(index.values)} classes over {index.num_rows} rows.")
+        with self._lock:
+            self._entries[key] = (weakref.ref(frame), index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache shared by the visualization plugins
+class_index_cache = ClassIndexCache()
+
+
+def filter_by_class(frame, class_column, class_value, limit=None):
+    """
+    Returns the rows of a DataFrame whose class column matches a class value, using the
+    cached class index of the column.
+
+    Args:
+        frame (pd.DataFrame): The DataFrame.
+        class_column (str): The column name, as resolved by `resolve_class_column`.
+        class_value: The class value.
+        limit (int, optional): The maximum number of rows returned (the first ones).
+
+    Returns:
+        pd.DataFrame: The matching rows, in their original order.
+    """
+    return class_index_cache.get(frame, class_column).filter(frame, class_value, limit)
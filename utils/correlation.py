@@ -0,0 +1,411 @@
+"""
+Module: utils.correlation
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module computes Pearson and Spearman correlation matrices of the numeric columns of a dataset with blocked NumPy matrix products. Missing values are handled pairwise, as in `DataFrame.corr`: the correlation of two columns uses the rows where both are present. For every pair of column blocks, the number of shared rows and the sums, products and squares of the values over those rows are obtained with six matrix products of the values and their presence masks, so the cost is dominated by BLAS instead of a Python loop over column pairs, and the temporary arrays are bounded by the block size. The values are shifted by the means of the first values of every column before the products to avoid cancellation. The sums are additive over rows, so the Pearson matrix of a stream of chunks is computed in one pass; the Spearman matrix of a stream is computed one column block at a time (ranks need whole columns) with the ranks spilled to a memory-mapped file, so wide tables do not need to fit in memory. For Spearman, the pairs of columns with missing values are ranked again over the rows they share, as pandas does, so only datasets with missing values pay for a ranking per pair. The `CorrelationCache` class keeps the matrices of the datasets in use, keyed by dataset, filter and method.
+
+"""
+
+import os
+import shutil
+import weakref
+import warnings
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from core.logging_config import logger
+from utils.moments import numeric_columns
+
+# Supported correlation methods
+CORRELATION_METHODS = ('pearson', 'spearman')
+
+# Number of columns multiplied at a time
+DEFAULT_BLOCK_SIZE = 256
+
+# Number of correlation matrices kept by the cache
+DEFAULT_CACHE_ENTRIES = 16
+
+
+def _check_method(method):
+    """
+    Validates a correlation method.
+
+    Args:
+        method (str): The correlation method.
+
+    Returns:
+        str: The method, in lowercase.
+
+    Raises:
+        ValueError: If the method is not supported.
+    """
+    method = str(method).lower()
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unsupported correlation method '{method}'. Expected one of: {', '.join(CORRELATION_METHODS)}.")
+    return method
+
+
+def _rank_columns(values):
+    """
+    Replaces the values of every column by their ranks (average ranks for ties). Missing
+    values stay missing.
+
+    Args:
+        values (np.ndarray): The values, one column per variable.
+
+    Returns:
+        np.ndarray: The ranks.
+    """
+    return pd.DataFrame(values).rank(method='average').to_numpy(dtype=np.float64)
+
+
+def _column_means(values):
+    """
+    Returns the mean of every column, ignoring missing values.
+
+    Args:
+        values (np.ndarray): The values, one column per variable.
+
+    Returns:
+        np.ndarray: The means (missing for columns without values).
+    """
+    with warnings.catch_warnings():
+        # Columns without values have a missing mean
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+
+
+def _correlate_ranks(x, y, min_periods):
+    """
+    Returns the correlation of a column with every column of a block, all without missing values.
+
+    Args:
+        x (np.ndarray): The column.
+        y (np.ndarray): The block, one column per variable, with the rows of `x`.
+        min_periods (int): The minimum number of rows.
+
+    Returns:
+        np.ndarray: The correlation with every column of the block.
+    """
+    if len(x) < max(1, int(min_periods)):
+        return np.full(y.shape[1], np.nan)
+    x = x - x.mean()
+    y = y - y.mean(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = (x @ y) / np.sqrt((x @ x) * np.einsum('ij,ij->j', y, y))
+    return np.clip(result, -1.0, 1.0)
+
+
+def _rerank_missing(ranks, result, min_periods=1, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Corrects the Spearman correlations of the pairs of columns with missing values, ranking
+    both columns again over the rows they share, as `DataFrame.corr` does.
+
+    Ranks are ranked again instead of the values, which gives the same result because
+    ranking keeps the order and the ties of the values.
+
+    Args:
+        ranks (np.ndarray): The ranks of every column over its own values (it may be a
+            memory-mapped array; it is read one block of columns at a time).
+        result (np.ndarray): The correlation matrix of the ranks, corrected in place.
+        min_periods (int): The minimum number of shared rows of a pair of columns.
+        block_size (int): The number of columns ranked at a time.
+    """
+    size = ranks.shape[1]
+    present = np.empty(size, dtype=bool)
+    for start in range(0, size, block_size):
+        present[start:start + block_size] = ~np.isnan(ranks[:, start:start + block_size]).any(axis=0)
+    partial = np.flatnonzero(~present)
+    for i in partial:
+        rows = ~np.isnan(ranks[:, i])
+        x = ranks[rows, i]
+        # Complete columns share the rows of column i: only they are ranked again
+        for start in range(0, size, block_size):
+            block = np.arange(start, min(start + block_size, size))
+            block = block[present[block]]
+            if len(block):
+                correlations = _correlate_ranks(x, _rank_columns(ranks[:, block][rows]), min_periods)
+                result[i, block] = result[block, i] = correlations
+        # Both columns have missing values: both are ranked again over their shared rows
+        for j in partial[partial > i]:
+            shared = rows & ~np.isnan(ranks[:, j])
+            pair = _rank_columns(np.column_stack([ranks[shared, i], ranks[shared, j]]))
+            result[i, j] = result[j, i] = _correlate_ranks(pair[:, 0], pair[:, 1:], min_periods)[0]
+
+
+class PairwiseMoments:
+    """
+    Accumulator of the pairwise sums needed by the correlation of every pair of columns.
+
+    For columns x and y, over the rows where both are present, it keeps the number of rows
+    and the sums of x, y, x*y, x^2 and y^2 (of the values shifted by a per-column constant).
+
+    Attributes:
+        size (int): The number of columns.
+        shift (np.ndarray): The constant subtracted from every column.
+        block_size (int): The number of columns multiplied at a time.
+
+    Methods:
+        update(values): Adds the rows of an array of values.
+        correlation(min_periods): Returns the correlation matrix.
+    """
+
+    def __init__(self, size, shift=None, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            size (int): The number of columns.
+            shift (np.ndarray, optional): The constant subtracted from every column, ideally
+                close to its mean. Defaults to the mean of the first values of the column.
+            block_size (int): The number of columns multiplied at a time.
+        """
+        self.size = size
+        self.shift = np.full(size, np.nan) if shift is None else np.asarray(shift, dtype=np.float64).copy()
+        self.block_size = max(1, int(block_size))
+        self._count = np.zeros((size, size))
+        self._sum_x = np.zeros((size, size))
+        self._sum_xy = np.zeros((size, size))
+        self._sum_xx = np.zeros((size, size))
+
+    def _prepare(self, values, columns):
+        """
+        Returns the shifted values of a block of columns with missing values set to zero, and
+        their presence mask.
+
+        Args:
+            values (np.ndarray): The values of every column.
+            columns (slice): The columns of the block.
+
+        Returns:
+            tuple: The shifted values and the presence mask, as float64 arrays.
+        """
+        block = np.asarray(values[:, columns], dtype=np.float64) - self.shift[columns]
+        mask = ~np.isnan(block)
+        return np.where(mask, block, 0.0), mask.astype(np.float64)
+
+    def update(self, values):
+        """
+        Adds the rows of an array of values. Only one block of columns per side is prepared
+        at a time, so the array can be a memory-mapped file larger than memory.
+
+        Args:
+            values (np.ndarray): The values, one column per variable (missing values as NaN).
+
+        Returns:
+            PairwiseMoments: This accumulator.
+        """
+        # Nothing has been accumulated yet for the columns without a shift, so it can still be chosen
+        unset = np.flatnonzero(np.isnan(self.shift))
+        if unset.size:
+            self.shift[unset] = _column_means(values[:, unset])
+        blocks = [slice(start, min(start + self.block_size, self.size)) for start in range(0, self.size, self.block_size)]
+        for index, rows_block in enumerate(blocks):
+            x, mask_x = self._prepare(values, rows_block)
+            for columns_block in blocks[index:]:
+                y, mask_y = (x, mask_x) if columns_block == rows_block else self._prepare(values, columns_block)
+                # The products of the (j, i) block are the transposes of the products of the (i, j) block
+                self._count[rows_block, columns_block] += mask_x.T @ mask_y
+                self._sum_x[rows_block, columns_block] += x.T @ mask_y
+                self._sum_xy[rows_block, columns_block] += x.T @ y
+                self._sum_xx[rows_block, columns_block] += (x * x).T @ mask_y
+                if columns_block != rows_block:
+                    self._sum_x[columns_block, rows_block] += y.T @ mask_x
+                    self._sum_xx[columns_block, rows_block] += (y * y).T @ mask_x
+        return self
+
+    def correlation(self, min_periods=1):
+        """
+        Returns the correlation matrix of the accumulated rows.
+
+        Args:
+            min_periods (int): The minimum number of shared rows of a pair of columns; pairs
+                with fewer rows have a missing correlation.
+
+        Returns:
+            np.ndarray: The correlation matrix.
+        """
+        upper = np.triu(np.ones((self.size, self.size), dtype=bool), 1)
+        count = np.where(upper.T, self._count.T, self._count)
+        sum_xy = np.where(upper.T, self._sum_xy.T, self._sum_xy)
+        # sum_x[i, j] is the sum of column i over the rows shared with column j
+        sum_x, sum_xx = self._sum_x, self._sum_xx
+        sum_y, sum_yy = sum_x.T, sum_xx.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = sum_xy - sum_x * sum_y / count
+            variance_x = sum_xx - sum_x * sum_x / count
+            variance_y = sum_yy - sum_y * sum_y / count
+            result = covariance / np.sqrt(variance_x * variance_y)
+        result = np.where((count >= max(1, int(min_periods))) & (variance_x > 0) & (variance_y > 0), result, np.nan)
+        np.fill_diagonal(result, np.where(np.isnan(np.diag(result)), np.nan, 1.0))
+        return np.clip(result, -1.0, 1.0)
+
+
+def correlation_matrix(frame, method='pearson', block_size=DEFAULT_BLOCK_SIZE, min_periods=1):
+    """
+    Computes the correlation matrix of the numeric columns of a DataFrame.
+
+    The Spearman matrix is the Pearson matrix of the ranks of every column. The pairs of
+    columns with missing values are then ranked again over the rows they share, so the
+    result matches `DataFrame.corr`; this costs a ranking per pair involving such columns.
+
+    Args:
+        frame (pd.DataFrame): The DataFrame.
+        method (str): 'pearson' or 'spearman'.
+        block_size (int): The number of columns multiplied at a time.
+        min_periods (int): The minimum number of shared rows of a pair of columns.
+
+    Returns:
+        pd.DataFrame: The correlation matrix, indexed by column name on both axes.
+
+    Raises:
+        ValueError: If the method is not supported.
+    """
+    method = _check_method(method)
+    columns = numeric_columns(frame)
+    values = frame[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if method == 'spearman':
+        values = _rank_columns(values)
+    result = PairwiseMoments(len(columns), block_size=block_size).update(values).correlation(min_periods)
+    if method == 'spearman':
+        _rerank_missing(values, result, min_periods, block_size)
+    return pd.DataFrame(result, index=columns, columns=columns)
+
+
+def correlation_from_chunks(chunk_source, method='pearson', block_size=DEFAULT_BLOCK_SIZE, min_periods=1, spill_dir=None):
+    """
+    Computes the correlation matrix of the numeric columns of a stream of chunks.
+
+    The Pearson matrix is accumulated in one pass over the chunks. The Spearman matrix needs
+    the ranks of whole columns, so the chunks are read once per block of columns, the ranks
+    of each block are written to a memory-mapped file and the matrix is computed from it.
+
+    Args:
+        chunk_source (callable): A function returning a new iterator over the chunks.
+        method (str): 'pearson' or 'spearman'.
+        block_size (int): The number of columns processed at a time.
+        min_periods (int): The minimum number of shared rows of a pair of columns.
+        spill_dir (str, optional): The directory of the memory-mapped ranks. Defaults to the
+            temporary directory of the system.
+
+    Returns:
+        pd.DataFrame: The correlation matrix, indexed by column name on both axes.
+
+    Raises:
+        ValueError: If the method is not supported.
+    """
+    method = _check_method(method)
+    chunks = iter(chunk_source())
+    first = next(chunks, None)
+    if first is None:
+        return pd.DataFrame()
+    columns = numeric_columns(first)
+
+    if method == 'pearson':
+        moments = PairwiseMoments(len(columns), block_size=block_size)
+        moments.update(first[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        for chunk in chunks:
+            moments.update(chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        return pd.DataFrame(moments.correlation(min_periods), index=columns, columns=columns)
+
+    num_rows = len(first) + sum(len(chunk) for chunk in chunks)
+    work_dir = tempfile.mkdtemp(prefix='datasphere-ranks-', dir=spill_dir)
+    try:
+        # Column-major layout, so every block of columns is contiguous on disk
+        ranks = np.lib.format.open_memmap(os.path.join(work_dir, 'ranks.npy'), mode='w+', dtype=np.float64,
+                                          shape=(num_rows, len(columns)), fortran_order=True)
+        for start in range(0, len(columns), block_size):
+            block = columns[start:start + block_size]
+            values = np.concatenate([chunk[block].to_numpy(dtype=np.float64, na_value=np.nan) for chunk in chunk_source()]) if num_rows else np.empty((0, len(block)))
+            ranks[:, start:start + len(block)] = _rank_columns(values)
+        logger.info(f"Ranks of {len(columns)} columns and {num_rows} rows computed in {-(-len(columns) // block_size)} column block(s).")
+        # The mean rank of a full column; the exact means would need another pass over the file
+        shift = np.full(len(columns), (num_rows + 1) / 2)
+        result = PairwiseMoments(len(columns), shift, block_size).update(ranks).correlation(min_periods)
+        _rerank_missing(ranks, result, min_periods, block_size)
+        del ranks
+        return pd.DataFrame(result, index=columns, columns=columns)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class CorrelationCache:
+    """
+    Least recently used cache of correlation matrices.
+
+    Entries are keyed by the identity of the DataFrame, a filter key describing how the
+    DataFrame was derived from the loaded dataset (e.g. the selected class) and the method.
+    An entry is only returned while its DataFrame is alive, so a new DataFrame that reuses
+    the memory address of a discarded one never gets its matrix. DataFrames are assumed not
+    to be modified in place while they are cached.
+
+    Attributes:
+        max_entries (int): The maximum number of cached matrices.
+
+    Methods:
+        get(frame, method, filter_key, min_periods): Returns the correlation matrix of a
+            DataFrame, computing it on a cache miss.
+        clear(): Removes every entry.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached matrices.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Dash callbacks run in several threads
+        self._lock = threading.Lock()
+
+    def get(self, frame, method='pearson', filter_key=None, min_periods=1):
+        """
+        Returns the correlation matrix of the numeric columns of a DataFrame.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            method (str): 'pearson' or 'spearman'.
+            filter_key (hashable, optional): A description of the filter that produced the
+                DataFrame.
+            min_periods (int): The minimum number of shared rows of a pair of columns.
+
+        Returns:
+            pd.DataFrame: The correlation matrix.
+        """
+        method = _check_method(method)
+        key = (id(frame), filter_key, method, min_periods)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is frame:
+                self._entries.move_to_end(key)
+                logger.info(f"Correlation matrix ({method}) served from the cache.")
+                return entry[1]
+
+        matrix = correlation_matrix(frame, method, min_periods=min_periods)
+        logger.info(f"Correlation matrix ({method}) of {matrix.shape[0]} numeric columns computed and cached.")
+        with self._lock:
+            self._entries[key] = (weakref.ref(frame), matrix)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return matrix
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache shared by the visualization plugins
+correlation_cache = CorrelationCache()
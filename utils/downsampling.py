@@ -0,0 +1,127 @@
+"""
+Module: utils.downsampling
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module reduces the number of points of a chart trace to what the screen can show, so large datasets are not sent to the browser point by point. Line traces are downsampled with the Largest-Triangle-Three-Buckets (LTTB) algorithm of Steinarsson, which splits the rows into buckets and keeps, in each bucket, the point forming the largest triangle with the point kept in the previous bucket and the average of the next bucket; it keeps peaks and the overall shape of the line. Scatter traces are thinned on a grid of cells the size of a few pixels: one point of every occupied cell is kept, so sparse regions and outliers are never lost, and the remaining budget is filled with a uniform sample of the other points, so dense regions still look dense. Both functions return row positions, so the caller can keep every column of the selected rows.
+
+"""
+
+import numpy as np
+
+# Size, in pixels, of the cells of the scatter thinning grid
+DEFAULT_CELL_PIXELS = 2
+
+
+def lttb(x, y, threshold):
+    """
+    Selects the points of a line with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+        x (np.ndarray): The x coordinates of the points, in drawing order.
+        y (np.ndarray): The y coordinates of the points.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: The positions of the selected points, in increasing order. The first and
+            last points are always selected.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    num_points = len(x)
+    if threshold >= num_points or threshold < 3:
+        return np.arange(num_points)
+
+    # threshold - 2 buckets between the first and the last point
+    edges = np.linspace(1, num_points - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, num_points - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket == threshold - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_end = edges[bucket + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Twice the area of the triangles formed by the previous point, every candidate and the next average
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def thin_points(x, y, max_points, grid=(800, 450), x_range=None, y_range=None, seed=42):
+    """
+    Selects a subset of the points of a scatter trace that preserves its density and outliers.
+
+    The plot area is divided into a grid of cells, one point of every occupied cell is kept
+    and the remaining budget is filled with a uniform sample of the other points. When more
+    cells are occupied than points can be kept, a uniform sample of the cells is kept.
+
+    Args:
+        x (np.ndarray): The x coordinates of the points (without missing values).
+        y (np.ndarray): The y coordinates of the points (without missing values).
+        max_points (int): The maximum number of points to keep.
+        grid (tuple): The number of cells along the x and y axes.
+        x_range (tuple, optional): The visible range of the x axis. Defaults to the range of the data.
+        y_range (tuple, optional): The visible range of the y axis. Defaults to the range of the data.
+        seed (int): The seed of the random sample.
+
+    Returns:
+        np.ndarray: The positions of the selected points, in increasing order.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return np.arange(len(x))
+
+    cells = np.zeros(len(x), dtype=np.int64)
+    for values, value_range, size in ((x, x_range, grid[0]), (y, y_range, grid[1])):
+        low, high = value_range if value_range is not None else (np.nanmin(values), np.nanmax(values))
+        scale = size / (high - low) if high > low else 0.0
+        cells = cells * size + np.clip(((values - low) * scale).astype(np.int64), 0, size - 1)
+
+    # Any point of a cell can represent it, so a scatter assignment (last write wins) is enough
+    owner = np.full(grid[0] * grid[1], -1, dtype=np.intp)
+    owner[cells] = np.arange(len(x))
+    representatives = owner[owner >= 0]
+
+    rng = np.random.default_rng(seed)
+    if len(representatives) >= max_points:
+        return np.sort(rng.choice(representatives, max_points, replace=False))
+    chosen = np.zeros(len(x), dtype=bool)
+    chosen[representatives] = True
+    extra = rng.choice(np.flatnonzero(~chosen), max_points - len(representatives), replace=False)
+    chosen[extra] = True
+    return np.flatnonzero(chosen)
+
+
+def in_range(values, value_range, margin=False):
+    """
+    Returns which values fall inside a range.
+
+    Args:
+        values (np.ndarray): The values.
+        value_range (tuple): The lower and upper bounds (in any order), or None for no bounds.
+        margin (bool): Whether the neighbours of the values inside the range are also
+            selected, so the segments of a line that cross the edges are drawn.
+
+    Returns:
+        np.ndarray: A boolean mask of the values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if value_range is None:
+        return np.ones(len(values), dtype=bool)
+    low, high = sorted(value_range)
+    inside = (values >= low) & (values <= high)
+    if not margin:
+        return inside
+    selected = inside.copy()
+    selected[:-1] |= inside[1:]
+    selected[1:] |= inside[:-1]
+    return selected
@@ -0,0 +1,144 @@
+"""
+Module: utils.figure_cache
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides the cache of chart figures used by the interactive visualization plugins. Building a Plotly figure from a large dataset is the slowest part of a Dash callback, and users often go back to a chart they have already seen. The `FigureCache` class keeps the figures as serialized JSON, so their memory footprint is known exactly, and evicts the least recently used ones when the number of entries or the total size exceeds its limits. The keys are built by the caller from the parameters of the chart and the fingerprint of the dataset, computed by `dataset_fingerprint` from the contents of the DataFrame, so a dataset loaded again from an unchanged file reuses the figures of the previous one. Hits and misses are counted and logged.
+
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from core.logging_config import logger
+from core.session_store import format_size
+
+# Default maximum number of cached figures
+DEFAULT_MAX_ENTRIES = 64
+
+# Default maximum total size of the cached figures, in MB
+DEFAULT_MAX_MB = 256
+
+
+def dataset_fingerprint(frame):
+    """
+    Returns a fingerprint of the contents of a DataFrame: its column names, data types and
+    the hash of every row.
+
+    Args:
+        frame (pd.DataFrame): The DataFrame.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(frame.columns), [str(dtype) for dtype in frame.dtypes], frame.shape)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Least recently used cache of serialized figures, bounded by number of entries and size.
+
+    Attributes:
+        max_entries (int): The maximum number of cached figures.
+        max_bytes (int): The maximum total size of the cached figures, in bytes.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups not found in the cache.
+
+    Methods:
+        get(key): Returns a cached figure.
+        put(key, figure): Serializes and caches a figure.
+        clear(): Removes every entry.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_mb=DEFAULT_MAX_MB):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached figures.
+            max_mb (float): The maximum total size of the cached figures, in MB.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        # Dash callbacks run in several threads
+        self._lock = threading.Lock()
+
+    def _stats(self):
+        """
+        Returns a description of the counters and size of the cache, for the log.
+
+        Returns:
+            str: The description.
+        """
+        return f"hits: {self.hits}, misses: {self.misses}, {len(self._entries)} figure(s), {format_size(self._size)}"
+
+    def get(self, key):
+        """
+        Returns a cached figure.
+
+        Args:
+            key (hashable): The key of the figure.
+
+        Returns:
+            dict: The figure, as a Plotly JSON dictionary, or None if it is not cached.
+        """
+        with self._lock:
+            serialized = self._entries.get(key)
+            if serialized is None:
+                self.misses += 1
+                logger.info(f"Figure cache miss ({self._stats()}).")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            logger.info(f"Figure cache hit ({self._stats()}).")
+        return json.loads(serialized)
+
+    def put(self, key, figure):
+        """
+        Serializes and caches a figure, evicting the least recently used figures if the
+        cache exceeds its limits. Figures larger than the whole cache are not cached.
+
+        Args:
+            key (hashable): The key of the figure.
+            figure (plotly.graph_objects.Figure or dict): The figure, or its dictionary.
+        """
+        # Plotly is imported here so that importing the module does not pay for it
+        from plotly.io.json import to_json_plotly
+
+        serialized = to_json_plotly(figure)
+        size = len(serialized)
+        if size > self.max_bytes:
+            logger.info(f"Figure of {format_size(size)} not cached: it exceeds the cache size.")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = serialized
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """
+        Removes every entry and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,88 @@
+"""
+Module: utils.figure_encoding
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module encodes the numeric arrays of a Plotly figure as typed binary arrays before it is sent to the browser. By default every number of a figure is written as JSON text, which is slow to serialize on the server, slow to parse in the browser and takes about three times the memory of the binary values. Plotly.js (2.28 and later) accepts, instead of a list of numbers, an object with the data type (`dtype`), the base64-encoded little-endian bytes of the array (`bdata`) and, for matrices, its `shape`, and decodes it directly into a JavaScript typed array. `encode_typed_arrays` replaces every numeric NumPy array of the traces of a figure by this object. 64-bit integers, which have no JavaScript typed array, are sent as 32-bit integers when their values fit, and as 64-bit floats otherwise.
+
+"""
+
+import base64
+import numpy as np
+
+# Plotly.js typed array code of every NumPy data type
+TYPED_ARRAY_CODES = {
+    np.dtype(np.int8): 'i1', np.dtype(np.uint8): 'u1',
+    np.dtype(np.int16): 'i2', np.dtype(np.uint16): 'u2',
+    np.dtype(np.int32): 'i4', np.dtype(np.uint32): 'u4',
+    np.dtype(np.float32): 'f4', np.dtype(np.float64): 'f8',
+}
+
+# Arrays shorter than this are left as JSON lists, where the encoding does not pay off
+MIN_ENCODED_LENGTH = 16
+
+
+def typed_array(values):
+    """
+    Encodes a numeric array as a Plotly.js typed array specification.
+
+    Args:
+        values (np.ndarray): The array, of one or two dimensions.
+
+    Returns:
+        dict: The 'dtype', 'bdata' and (for matrices) 'shape' of the array, or None if the
+            array has no typed array representation.
+    """
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        small = values.size == 0 or (values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max)
+        values = values.astype(np.int32 if small else np.float64)
+    code = TYPED_ARRAY_CODES.get(values.dtype.newbyteorder('='))
+    if code is None or values.ndim > 2:
+        return None
+    encoded = {'dtype': code, 'bdata': base64.b64encode(np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<')).tobytes()).decode('ascii')}
+    if values.ndim == 2:
+        encoded['shape'] = f"{values.shape[0]},{values.shape[1]}"
+    return encoded
+
+
+def _encode(node):
+    """
+    Returns a copy of a node of a figure dictionary with its numeric arrays encoded.
+
+    Args:
+        node: The node (a dictionary, list, array or scalar).
+
+    Returns:
+        The encoded node.
+    """
+    if isinstance(node, np.ndarray):
+        if node.size >= MIN_ENCODED_LENGTH and node.dtype.kind in 'iuf':
+            encoded = typed_array(node)
+            if encoded is not None:
+                return encoded
+        return node
+    if isinstance(node, dict):
+        return {key: _encode(value) for key, value in node.items()}
+    if isinstance(node, (list, tuple)):
+        return [_encode(value) for value in node]
+    return node
+
+
+def encode_typed_arrays(figure):
+    """
+    Returns the dictionary of a figure with the numeric arrays of its traces encoded as
+    typed binary arrays. The layout is not changed.
+
+    Args:
+        figure (plotly.graph_objects.Figure): The figure.
+
+    Returns:
+        dict: The figure dictionary, ready to be returned by a Dash callback.
+    """
+    figure = figure.to_dict()
+    figure['data'] = [_encode(trace) for trace in figure['data']]
+    return figure
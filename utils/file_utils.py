@@ -12,8 +12,18 @@ This module provides utility functions for file handling. The `validate_file_pat
 """
 
 import os
+import bz2
+import glob
+import gzip
+import lzma
+import uuid
 import fnmatch
+from contextlib import contextmanager
 from core.logging_config import logger
+from utils.strings_utils import get_compression
+
+# Buffer size used when reading or writing uncompressed data files
+IO_BUFFER_SIZE = 1024 * 1024
 
 def validate_file_path(path):
     """
@@ -52,6 +62,114 @@ def validate_file_path(path):
 # ensuring that only valid paths are processed and preventing potential errors.
 
 
+def expand_data_paths(path):
+    """
+    Expands a data path into the list of readable files it refers to.
+
+    The path can be a single file, a directory (all the non-hidden files directly inside it are
+    selected) or a glob pattern such as `data/raw/2026-*.csv` (`**` matches subdirectories).
+    The resulting files are sorted so that multi-file loads are deterministic.
+
+    Args:
+        path (str): A file path, a directory path or a glob pattern.
+
+    Returns:
+        list: The sorted paths of the readable files. The list is empty if nothing matches.
+
+    Raises:
+        ValueError: If `path` is not a valid string or is empty.
+
+    Example:
+        >>> expand_data_paths('data/raw/*.arff')
+        ['data/raw/iris.arff']
+    """
+
+    # Validate that path is a non-empty string
+    if not isinstance(path, str) or not path.strip():
+        raise ValueError("The file path must be a non-empty string.")
+
+    if os.path.isdir(path):
+        candidates = [os.path.join(path, name) for name in os.listdir(path) if not name.startswith('.')]
+    elif any(char in path for char in '*?['):
+        candidates = glob.glob(path, recursive=True)
+    else:
+        candidates = [path]
+
+    return sorted(candidate for candidate in candidates if validate_file_path(candidate))
+
+
+def open_data_file(path, mode='rt', encoding='utf-8'):
+    """
+    Opens a data file, decompressing (or compressing) it on the fly if it is compressed.
+
+    The compression codec is taken from the last extension of the path ('.gz', '.bz2', '.xz' or '.zst'). The returned file object decompresses the data as it is read, or compresses it as it is written, so compressed files are processed as a stream without an uncompressed copy on disk. Uncompressed files are opened with a large buffer to reduce the number of system calls.
+
+    Args:
+        path (str): The path to the file.
+        mode (str): 'rt' or 'rb' to read text or bytes, 'wt' or 'wb' to write text or bytes.
+        encoding (str): The text encoding, used only in text mode.
+
+    Returns:
+        file object: A file object with the uncompressed content.
+
+    Raises:
+        ValueError: If the file is compressed with Zstandard and the `zstandard` package is not installed.
+
+    Example:
+        >>> with open_data_file('data/raw/iris.arff.gz') as stream:
+        ...     header = stream.readline()
+    """
+    kwargs = {'encoding': encoding} if 't' in mode else {}
+    compression = get_compression(path)
+
+    if compression is None:
+        return open(path, mode, buffering=IO_BUFFER_SIZE, **kwargs)
+    if compression == 'gzip':
+        return gzip.open(path, mode, **kwargs)
+    if compression == 'bz2':
+        return bz2.open(path, mode, **kwargs)
+    if compression == 'xz':
+        return lzma.open(path, mode, **kwargs)
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ValueError("Zstandard-compressed files require the 'zstandard' package.") from e
+    return zstandard.open(path, mode, **kwargs)
+
+
+@contextmanager
+def replace_on_success(path):
+    """
+    Provides a temporary path to write a file that replaces `path` only if the writing succeeds.
+
+    The temporary file is created in the directory of `path` and its name ends with the name
+    of `path`, so its format and compression are chosen from the same extensions. When the
+    block exits without an error the temporary file atomically replaces `path`; otherwise it
+    is removed and `path` is left as it was.
+
+    Args:
+        path (str): The path of the file to write.
+
+    Yields:
+        str: The temporary path to write to.
+
+    Example:
+        >>> with replace_on_success('data/processed/out.csv') as temporary_path:
+        ...     frame.to_csv(temporary_path)
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    # The writer creates the file, so it gets the usual permissions of new files
+    temporary_path = os.path.join(directory, f".tmp-{uuid.uuid4().hex}-{name}")
+    try:
+        yield temporary_path
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
 def verify_folder_structure():
     """
     Ensure the working directory has the required folder structure.
@@ -0,0 +1,89 @@
+"""
+Module: utils.filter_utils
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides the column projection and row predicate used by the data I/O plugins to filter data while it is being parsed. The `ColumnSelector` class decides which columns have to be read: the requested columns plus any column referenced by the row predicate. The `apply_filters` function evaluates the predicate on a DataFrame (typically a chunk) and keeps only the requested columns, in the requested order. Both are plain module-level objects so they can be sent to worker processes.
+
+"""
+
+import re
+
+# Number of rows parsed at a time when a row predicate is applied while loading a whole file
+DEFAULT_FILTER_CHUNKSIZE = 100000
+
+
+class ColumnSelector:
+    """
+    Callable that decides whether a column has to be read from a data file.
+
+    A column is read if it was requested or if it is referenced by the row predicate, since
+    the predicate is evaluated before the projection is applied.
+
+    Attributes:
+        columns (list): The requested column names, or None to read every column.
+        where (str): The row predicate, or None.
+    """
+
+    def __init__(self, columns=None, where=None):
+        """
+        Initializes the ColumnSelector.
+
+        Args:
+            columns (list, optional): The requested column names.
+            where (str, optional): The row predicate, as a pandas query expression.
+        """
+        self.columns = set(str(column) for column in columns) if columns else None
+        self.where = where
+
+    def __call__(self, name):
+        """
+        Returns whether a column has to be read.
+
+        Args:
+            name (str or int): The column name (or position, for files without header).
+
+        Returns:
+            bool: True if the column has to be read.
+        """
+        name = str(name)
+        if self.columns is None or name in self.columns:
+            return True
+        return bool(self.where) and re.search(rf"(?<![\w.]){re.escape(name)}(?!\w)", self.where) is not None
+
+
+def apply_filters(dataframe, columns=None, where=None):
+    """
+    Applies a row predicate and a column projection to a DataFrame.
+
+    Args:
+        dataframe (pd.DataFrame): The data to filter.
+        columns (list, optional): The column names to keep, in the order they are returned.
+        where (str, optional): The row predicate, as a pandas query expression
+            (e.g. "petallength>1.5"). Column names that are not valid Python identifiers
+            must be enclosed in backticks.
+
+    Returns:
+        pd.DataFrame: The filtered data.
+
+    Raises:
+        ValueError: If a requested column does not exist or the predicate is invalid.
+    """
+    if where:
+        try:
+            dataframe = dataframe.query(where)
+        except Exception as e:
+            raise ValueError(f"Invalid row predicate '{where}': {e}") from e
+
+    if columns:
+        names = {str(column): column for column in dataframe.columns}
+        missing = [column for column in columns if str(column) not in names]
+        if missing:
+            raise ValueError(f"Columns not found: {', '.join(map(str, missing))}.")
+        dataframe = dataframe[[names[str(column)] for column in columns]]
+
+    return dataframe
@@ -0,0 +1,217 @@
+"""
+Module: utils.moments
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides mergeable accumulators of descriptive statistics (count, mean, variance, minimum, maximum and skewness) of the numeric columns of a dataset delivered in chunks. Instead of raw power sums, which lose precision through catastrophic cancellation, the `MomentAccumulator` class keeps the count, the mean and the sums of the squared and cubed deviations from the mean of every column. The moments of a chunk are computed with a two-pass algorithm on the chunk, and partial accumulators are combined with the pairwise update formulas of Chan et al. and Pébay, so the chunks of a file can be summarized independently (e.g. in several worker processes) and merged in any order with the same numerical stability as a single pass over the whole data. Missing values are ignored, as in pandas.
+
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+
+# Statistics reported for every column
+STATISTICS = ('count', 'mean', 'variance', 'std', 'min', 'max', 'skew')
+
+
+def numeric_columns(frame):
+    """
+    Returns the names of the numeric (non-boolean) columns of a DataFrame.
+
+    Args:
+        frame (pd.DataFrame): The DataFrame.
+
+    Returns:
+        list: The column names.
+    """
+    return [column for column, dtype in frame.dtypes.items() if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+
+
+class MomentAccumulator:
+    """
+    Mergeable accumulator of the count, mean, variance, minimum, maximum and skewness of the
+    numeric columns of a dataset.
+
+    Attributes:
+        columns (list): The names of the accumulated columns.
+        count (np.ndarray): The number of non-missing values of every column.
+        mean (np.ndarray): The mean of every column.
+        m2 (np.ndarray): The sum of the squared deviations from the mean of every column.
+        m3 (np.ndarray): The sum of the cubed deviations from the mean of every column.
+        minimum (np.ndarray): The minimum of every column.
+        maximum (np.ndarray): The maximum of every column.
+        rows (int): The number of rows accumulated.
+
+    Methods:
+        from_frame(frame, columns): Builds the accumulator of the numeric columns of a DataFrame.
+        update(frame): Adds the rows of a DataFrame to the accumulator.
+        merge(other): Adds the statistics of another accumulator to this one.
+        to_frame(): Returns the statistics as a DataFrame with one row per column.
+
+    Example:
+        >>> accumulator = MomentAccumulator()
+        >>> for chunk in chunks:
+        ...     accumulator.update(chunk)
+        >>> statistics = accumulator.to_frame()
+    """
+
+    def __init__(self, columns=()):
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            columns (iterable): The names of the accumulated columns.
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.minimum = np.full(size, np.inf)
+        self.maximum = np.full(size, -np.inf)
+        self.rows = 0
+
+    @classmethod
+    def from_frame(cls, frame, columns=None):
+        """
+        Builds the accumulator of the numeric columns of a DataFrame.
+
+        The moments are computed with two passes over the values of the DataFrame (the mean
+        first, then the sums of the centered powers), which is numerically stable.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            columns (list, optional): The columns to accumulate. Defaults to the numeric columns.
+
+        Returns:
+            MomentAccumulator: The accumulator.
+        """
+        accumulator = cls(numeric_columns(frame) if columns is None else columns)
+        accumulator.rows = len(frame)
+        if not accumulator.columns or frame.empty:
+            return accumulator
+
+        values = frame[accumulator.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        count = present.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.where(present, values, 0.0).sum(axis=0) / count, 0.0)
+            deviations = np.where(present, values - mean, 0.0)
+            squared = deviations * deviations
+            accumulator.m2 = squared.sum(axis=0)
+            accumulator.m3 = (squared * deviations).sum(axis=0)
+        accumulator.count = count
+        accumulator.mean = mean
+        # fmin and fmax ignore missing values
+        accumulator.minimum = np.fmin.reduce(values, axis=0, initial=np.inf)
+        accumulator.maximum = np.fmax.reduce(values, axis=0, initial=-np.inf)
+        return accumulator
+
+    def _align(self, columns):
+        """
+        Extends the accumulator with empty statistics for columns it does not have yet.
+
+        Args:
+            columns (list): The columns that must be accumulated.
+        """
+        missing = [column for column in columns if column not in self.columns]
+        if not missing:
+            return
+        size = len(missing)
+        self.columns += missing
+        self.count = np.concatenate([self.count, np.zeros(size)])
+        self.mean = np.concatenate([self.mean, np.zeros(size)])
+        self.m2 = np.concatenate([self.m2, np.zeros(size)])
+        self.m3 = np.concatenate([self.m3, np.zeros(size)])
+        self.minimum = np.concatenate([self.minimum, np.full(size, np.inf)])
+        self.maximum = np.concatenate([self.maximum, np.full(size, -np.inf)])
+
+    def merge(self, other):
+        """
+        Adds the statistics of another accumulator to this one.
+
+        The combined moments of two partitions A and B with n = nA + nB values and
+        delta = meanB - meanA are:
+            mean = meanA + delta * nB / n
+            M2 = M2A + M2B + delta^2 * nA * nB / n
+            M3 = M3A + M3B + delta^3 * nA * nB * (nA - nB) / n^2 + 3 * delta * (nA * M2B - nB * M2A) / n
+
+        Args:
+            other (MomentAccumulator): The accumulator to merge.
+
+        Returns:
+            MomentAccumulator: This accumulator.
+        """
+        self._align(other.columns)
+        index = np.array([self.columns.index(column) for column in other.columns], dtype=np.intp)
+        count_a, mean_a, m2_a, m3_a = self.count[index], self.mean[index], self.m2[index], self.m3[index]
+        count_b, mean_b, m2_b, m3_b = other.count, other.mean, other.m2, other.m3
+
+        count = count_a + count_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - mean_a
+            weight = np.where(count > 0, count_b / count, 0.0)
+            mean = mean_a + delta * weight
+            m2 = m2_a + m2_b + delta * delta * count_a * weight
+            m3 = (m3_a + m3_b + delta ** 3 * count_a * weight * (count_a - count_b) / np.where(count > 0, count, 1.0)
+                  + 3.0 * delta * (count_a * m2_b - count_b * m2_a) / np.where(count > 0, count, 1.0))
+
+        self.count[index] = count
+        self.mean[index] = mean
+        self.m2[index] = m2
+        self.m3[index] = m3
+        self.minimum[index] = np.fmin(self.minimum[index], other.minimum)
+        self.maximum[index] = np.fmax(self.maximum[index], other.maximum)
+        self.rows += other.rows
+        return self
+
+    def update(self, frame):
+        """
+        Adds the rows of a DataFrame to the accumulator.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+
+        Returns:
+            MomentAccumulator: This accumulator.
+        """
+        return self.merge(MomentAccumulator.from_frame(frame))
+
+    def to_frame(self):
+        """
+        Returns the statistics as a DataFrame with one row per column.
+
+        The variance and standard deviation are the sample estimates (normalized by n - 1)
+        and the skewness is the adjusted Fisher-Pearson coefficient, as in pandas. Statistics
+        that are undefined for the number of values of a column are missing.
+
+        Returns:
+            pd.DataFrame: A 'column' column with the column names and one column per statistic.
+        """
+        count = self.count
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            variance = np.where(count > 1, self.m2 / (count - 1), np.nan)
+            biased_variance = self.m2 / count
+            skew = np.where(
+                (count > 2) & (biased_variance > 0),
+                np.sqrt(count * (count - 1)) / (count - 2) * (self.m3 / count) / biased_variance ** 1.5,
+                np.nan
+            )
+            skew = np.where((count > 2) & (biased_variance == 0), 0.0, skew)
+        return pd.DataFrame({
+            'column': self.columns,
+            'count': count.astype(np.int64),
+            'mean': np.where(count > 0, self.mean, np.nan),
+            'variance': variance,
+            'std': np.sqrt(variance),
+            'min': np.where(count > 0, self.minimum, np.nan),
+            'max': np.where(count > 0, self.maximum, np.nan),
+            'skew': skew,
+        })
@@ -0,0 +1,77 @@
+"""
+Module: utils.parallel_utils
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides the map-reduce loop shared by the plugins that summarize a stream of DataFrame chunks with mergeable summaries (moment accumulators, sketches). The `reduce_chunks` function summarizes the first chunk in the calling process and, when there are more chunks, submits them to a process pool while the next chunks are read, keeping at most two chunks per worker in flight so memory stays bounded. The partial summaries are merged in chunk order, so the result does not depend on the scheduling of the workers. The `process_pool_context` function returns the start method of every process pool of the CLI: pools are started from the threads of the step scheduler, and forking while another thread holds a lock (e.g. the logging lock) can deadlock the child processes, so the workers are started by a fork server (or spawned where it is not available) instead.
+
+"""
+
+import os
+import multiprocessing
+from itertools import chain
+from collections import deque
+from core.logging_config import logger
+
+
+def process_pool_context():
+    """
+    Returns the multiprocessing context used to start the worker processes of the pools.
+
+    Returns:
+        multiprocessing.context.BaseContext: The 'forkserver' context, or the 'spawn' context
+        on platforms without a fork server.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def reduce_chunks(chunks, summarize, workers=None):
+    """
+    Summarizes a stream of chunks with a mergeable summary.
+
+    Args:
+        chunks (iterable): An iterable of pandas DataFrames.
+        summarize (callable): A picklable function that returns the summary of a chunk. The
+            summaries have a `merge(other)` method that returns the merged summary.
+        workers (int, optional): The maximum number of worker processes. Defaults to the
+            number of CPU cores; 1 summarizes every chunk in the calling process.
+
+    Returns:
+        tuple: The merged summary (None if there were no chunks) and the number of chunks.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return None, 0
+
+    summary = summarize(first)
+    second = next(chunks, None)
+    if second is None:
+        return summary, 1
+
+    num_chunks = 1
+    workers = int(workers or os.cpu_count() or 1)
+    if workers == 1:
+        for chunk in chain([second], chunks):
+            summary = summary.merge(summarize(chunk))
+            num_chunks += 1
+        return summary, num_chunks
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    logger.info(f"Summarizing chunks using {workers} worker processes.")
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context()) as executor:
+        for chunk in chain([second], chunks):
+            pending.append(executor.submit(summarize, chunk))
+            num_chunks += 1
+            while len(pending) >= 2 * workers:
+                summary = summary.merge(pending.popleft().result())
+        while pending:
+            summary = summary.merge(pending.popleft().result())
+    return summary, num_chunks
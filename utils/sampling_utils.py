@@ -0,0 +1,103 @@
+"""
+Module: utils.sampling_utils
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides one-pass sampling of data delivered as a stream of DataFrame chunks. The `reservoir_sample` function draws a uniform sample of a fixed number of rows without replacement using random keys: every row gets a uniform random key and the rows with the smallest keys are kept, so only the reservoir and the current chunk are ever in memory. The `bernoulli_sample` function keeps every row independently with a given probability. Both use a seeded generator, so the same file and seed always produce the same sample.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+# Default seed of the sampling generators
+DEFAULT_SAMPLE_SEED = 42
+
+# Number of rows parsed at a time while sampling a file
+DEFAULT_SAMPLE_CHUNKSIZE = 100000
+
+
+def reservoir_sample(chunks, n, seed=DEFAULT_SAMPLE_SEED):
+    """
+    Draws a uniform sample of `n` rows without replacement in a single pass over the chunks.
+
+    Once the reservoir is full, only the rows of a chunk whose key is below the largest key in
+    the reservoir can enter it, so most chunks are discarded after a vectorized comparison.
+    The sampled rows keep their original index and file order.
+
+    Args:
+        chunks (iterable): An iterable of pandas DataFrames.
+        n (int): The number of rows to sample.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        tuple: The sampled DataFrame (None if no chunk was received) and the number of rows read.
+
+    Raises:
+        ValueError: If `n` is smaller than 1.
+    """
+    if n < 1:
+        raise ValueError(f"The sample size must be at least 1, got {n}.")
+
+    rng = np.random.default_rng(seed)
+    sample = None
+    keys = None
+    num_rows = 0
+
+    for chunk in chunks:
+        chunk_keys = rng.random(len(chunk))
+        num_rows += len(chunk)
+
+        if sample is not None and len(sample) >= n:
+            # Only rows with a key smaller than the current largest key can enter the reservoir
+            mask = chunk_keys < keys.max()
+            if not mask.any():
+                continue
+            chunk = chunk[mask]
+            chunk_keys = chunk_keys[mask]
+
+        if sample is None:
+            candidates, candidate_keys = chunk, chunk_keys
+        else:
+            candidates = pd.concat([sample, chunk])
+            candidate_keys = np.concatenate([keys, chunk_keys])
+
+        if len(candidates) > n:
+            keep = np.sort(np.argpartition(candidate_keys, n - 1)[:n])
+            candidates = candidates.iloc[keep]
+            candidate_keys = candidate_keys[keep]
+        sample, keys = candidates, candidate_keys
+
+    return sample, num_rows
+
+
+def bernoulli_sample(chunks, fraction, seed=DEFAULT_SAMPLE_SEED):
+    """
+    Keeps every row independently with probability `fraction` in a single pass over the chunks.
+
+    Args:
+        chunks (iterable): An iterable of pandas DataFrames.
+        fraction (float): The probability of keeping a row, between 0 and 1.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        tuple: The sampled DataFrame (None if no chunk was received) and the number of rows read.
+
+    Raises:
+        ValueError: If `fraction` is not between 0 and 1.
+    """
+    if not 0 <= fraction <= 1:
+        raise ValueError(f"The sample fraction must be between 0 and 1, got {fraction}.")
+
+    rng = np.random.default_rng(seed)
+    samples = []
+    num_rows = 0
+    for chunk in chunks:
+        num_rows += len(chunk)
+        samples.append(chunk[rng.random(len(chunk)) < fraction])
+
+    return (pd.concat(samples) if samples else None), num_rows
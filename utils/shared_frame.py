@@ -0,0 +1,149 @@
+"""
+Module: utils.shared_frame
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module shares a DataFrame between processes through memory-mapped files, so several worker processes serving the same dataset (e.g. the workers of the production server of `interactive_graph_viewer`) do not hold one copy of it each. `SharedFrame.publish` writes every column as a NumPy `.npy` file: numeric, boolean and date columns as their values (plus a mask of missing values for the nullable types of pandas), and text and categorical columns as integer category codes, with the categories and the column metadata in a small pickle file. `SharedFrame.load` opens the files with `numpy.load(mmap_mode='r')` and builds a DataFrame whose columns are read-only views of the mappings, so the data is read from the page cache of the operating system, which keeps a single copy for all the processes, and only the pages that are used are loaded. Text columns are loaded as categorical columns.
+
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from core.logging_config import logger
+
+# Default directory of the shared frames
+DEFAULT_SHARED_DIR = os.path.join('data', 'processed', 'shared')
+
+# Name of the metadata file of a shared frame
+METADATA_FILE = 'frame.pkl'
+
+
+def _masked_array(values, mask, dtype):
+    """
+    Builds a nullable pandas array from its values and mask, without copying them.
+
+    Args:
+        values (np.ndarray): The values.
+        mask (np.ndarray): True for the missing values.
+        dtype (pd.api.extensions.ExtensionDtype): The nullable data type.
+
+    Returns:
+        pd.api.extensions.ExtensionArray: The array.
+    """
+    if isinstance(dtype, pd.BooleanDtype):
+        return pd.arrays.BooleanArray(values, mask)
+    if dtype.kind == 'f':
+        return pd.arrays.FloatingArray(values, mask)
+    return pd.arrays.IntegerArray(values, mask)
+
+
+class SharedFrame:
+    """
+    A DataFrame stored as memory-mapped column files.
+
+    Attributes:
+        directory (str): The directory of the column files.
+
+    Methods:
+        publish(frame, shared_dir): Writes a DataFrame as a shared frame.
+        load(): Returns the DataFrame, with memory-mapped columns.
+        remove(): Deletes the files of the shared frame.
+
+    Example:
+        >>> shared = SharedFrame.publish(df)
+        >>> # In another process:
+        >>> df = SharedFrame(shared.directory).load()
+    """
+
+    def __init__(self, directory):
+        """
+        Initializes the SharedFrame of an existing directory.
+
+        Args:
+            directory (str): The directory of the column files.
+        """
+        self.directory = directory
+
+    @classmethod
+    def publish(cls, frame, shared_dir=DEFAULT_SHARED_DIR):
+        """
+        Writes a DataFrame as a shared frame in a new directory.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            shared_dir (str): The directory where the directory of the shared frame is created.
+
+        Returns:
+            SharedFrame: The shared frame.
+        """
+        os.makedirs(shared_dir, exist_ok=True)
+        directory = tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=shared_dir)
+        try:
+            columns = []
+            for number, (name, column) in enumerate(frame.items()):
+                path = os.path.join(directory, f"column-{number}.npy")
+                dtype = column.dtype
+                if isinstance(dtype, pd.CategoricalDtype):
+                    np.save(path, column.cat.codes.to_numpy(), allow_pickle=False)
+                    columns.append((name, 'categorical', (column.cat.categories, column.cat.ordered)))
+                elif dtype.kind in 'biufcmM' and isinstance(dtype, np.dtype):
+                    np.save(path, column.to_numpy(), allow_pickle=False)
+                    columns.append((name, 'values', None))
+                elif isinstance(column.array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)):
+                    # Nullable integer, float and boolean columns: the values and the mask of missing values
+                    mask = column.isna().to_numpy()
+                    np.save(path, column.to_numpy(dtype=dtype.numpy_dtype, na_value=0), allow_pickle=False)
+                    np.save(os.path.join(directory, f"column-{number}-mask.npy"), mask, allow_pickle=False)
+                    columns.append((name, 'masked', dtype))
+                else:
+                    # Text and other object columns are stored as the codes of their distinct values
+                    codes, uniques = pd.factorize(column)
+                    np.save(path, codes.astype(np.int32 if len(uniques) < 2 ** 31 else np.int64), allow_pickle=False)
+                    columns.append((name, 'categorical', (pd.Index(uniques), False)))
+            index = None if isinstance(frame.index, pd.RangeIndex) and frame.index.start == 0 and frame.index.step == 1 else frame.index
+            with open(os.path.join(directory, METADATA_FILE), 'wb') as file:
+                pickle.dump({'columns': columns, 'index': index, 'rows': len(frame)}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            shutil.rmtree(directory, ignore_errors=True)
+            logger.error(f"Error sharing the DataFrame: {e}")
+            raise
+        logger.info(f"DataFrame of {frame.shape[0]} rows and {frame.shape[1]} columns shared in '{directory}'.")
+        return cls(directory)
+
+    def load(self):
+        """
+        Returns the DataFrame, with its columns mapped from the files of the shared frame.
+
+        Returns:
+            pd.DataFrame: The DataFrame. Its columns are read-only.
+        """
+        with open(os.path.join(self.directory, METADATA_FILE), 'rb') as file:
+            metadata = pickle.load(file)
+        data = {}
+        for number, (name, kind, categories) in enumerate(metadata['columns']):
+            values = np.load(os.path.join(self.directory, f"column-{number}.npy"), mmap_mode='r')
+            if kind == 'categorical':
+                categories, ordered = categories
+                values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(categories, ordered=ordered))
+            elif kind == 'masked':
+                mask = np.load(os.path.join(self.directory, f"column-{number}-mask.npy"), mmap_mode='r')
+                values = _masked_array(values, mask, categories)
+            data[name] = values
+        index = metadata['index'] if metadata['index'] is not None else pd.RangeIndex(metadata['rows'])
+        # copy=False keeps the columns as views of the mappings
+        return pd.DataFrame(data, index=index, columns=[name for name, _, _ in metadata['columns']], copy=False)
+
+    def remove(self):
+        """
+        Deletes the files of the shared frame. Processes that already mapped them keep their
+        data until they unmap it.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
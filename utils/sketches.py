@@ -0,0 +1,577 @@
+"""
+Module: utils.sketches
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides mergeable sketches that summarize very large datasets in one pass with bounded memory and configurable error: the `KLLSketch` class estimates quantiles (medians, percentiles) with a rank error of about `quantile_error`, the `HyperLogLog` class estimates the number of distinct values with a relative error of about `distinct_error`, and the `MisraGries` class finds the most frequent values with a frequency error of at most `frequency_error` times the number of values. All of them are built from vectorized updates over DataFrame chunks and can be merged, so the chunks of a dataset can be summarized independently (e.g. in several worker processes). The `DatasetSketch` class combines them with the moment accumulators of `utils.moments` to produce approximate versions of the `DataFrame.describe` tables.
+
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from utils.moments import MomentAccumulator, numeric_columns
+
+# Default error bounds of the sketches
+DEFAULT_QUANTILE_ERROR = 0.01
+DEFAULT_DISTINCT_ERROR = 0.01
+DEFAULT_FREQUENCY_ERROR = 0.001
+
+# Default quantiles reported by DatasetSketch, as in DataFrame.describe
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+# Seed of the random compactions of the quantile sketches
+DEFAULT_SKETCH_SEED = 42
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Values are kept in a hierarchy of compactors: an item at level h stands for 2^h values.
+    When a level exceeds its capacity, it is sorted and every other item (starting at a
+    random offset) is promoted to the next level, which halves the memory of that level
+    while keeping the rank of every value unbiased. Capacities decrease geometrically
+    towards the lower levels, so the sketch keeps O(k) items.
+
+    Attributes:
+        k (int): The capacity of the top level, which controls the accuracy.
+        count (int): The number of values summarized.
+        minimum (float): The smallest value.
+        maximum (float): The largest value.
+
+    Methods:
+        from_error(error, seed): Creates a sketch with a given normalized rank error.
+        update(values): Adds an array of values to the sketch.
+        merge(other): Adds the values summarized by another sketch.
+        quantiles(probabilities): Returns the estimated quantiles.
+    """
+
+    def __init__(self, k=200, seed=DEFAULT_SKETCH_SEED):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            k (int): The capacity of the top level. The normalized rank error stays below
+                2.5 / k with high probability.
+            seed (int): The seed of the random compactions.
+        """
+        self.k = int(k)
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_error(cls, error=DEFAULT_QUANTILE_ERROR, seed=DEFAULT_SKETCH_SEED):
+        """
+        Creates a sketch whose quantiles have a given normalized rank error.
+
+        Args:
+            error (float): The rank error, as a fraction of the number of values.
+            seed (int): The seed of the random compactions.
+
+        Returns:
+            KLLSketch: The sketch.
+        """
+        return cls(k=max(8, math.ceil(2.5 / float(error))), seed=seed)
+
+    def _capacity(self, level):
+        """
+        Returns the capacity of a level.
+
+        Args:
+            level (int): The level.
+
+        Returns:
+            int: The maximum number of items of the level.
+        """
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self):
+        """
+        Compacts the levels that exceed their capacity, from the lowest one.
+        """
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item stays at its level so the total weight is preserved
+            kept, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+            promoted = items[self._rng.integers(2)::2]
+            self._levels[level] = kept
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            # Adding a level lowers the capacity of the lower levels, so start over
+            level = 0
+
+    def update(self, values):
+        """
+        Adds an array of values to the sketch. Missing values are ignored.
+
+        Args:
+            values (array-like): The values.
+
+        Returns:
+            KLLSketch: This sketch.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another sketch.
+
+        Args:
+            other (KLLSketch): The sketch to merge.
+
+        Returns:
+            KLLSketch: This sketch.
+        """
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.k = max(self.k, other.k)
+        self._compress()
+        return self
+
+    def quantiles(self, probabilities):
+        """
+        Returns the estimated quantiles of the summarized values.
+
+        Args:
+            probabilities (iterable): The probabilities of the quantiles, between 0 and 1.
+
+        Returns:
+            np.ndarray: The quantiles (missing if the sketch is empty).
+        """
+        probabilities = np.asarray(list(probabilities), dtype=np.float64)
+        if self.count == 0:
+            return np.full(len(probabilities), np.nan)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self._levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, probabilities * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        # The extreme quantiles are known exactly
+        result = np.where(probabilities <= 0, self.minimum, result)
+        return np.where(probabilities >= 1, self.maximum, result)
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct count sketch (Flajolet et al., 2007).
+
+    Every value is hashed to 64 bits: the first `precision` bits select a register and the
+    register keeps the largest position of the leftmost 1 bit of the remaining bits. The
+    harmonic mean of the registers estimates the number of distinct values with a relative
+    standard error of 1.04 / sqrt(2^precision), using 2^precision bytes.
+
+    Attributes:
+        precision (int): The number of bits that select a register (between 11 and 18).
+
+    Methods:
+        from_error(error): Creates a sketch with a given relative error.
+        update(values): Adds the values of a Series to the sketch.
+        merge(other): Adds the values summarized by another sketch.
+        estimate(): Returns the estimated number of distinct values.
+    """
+
+    def __init__(self, precision=14):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            precision (int): The number of bits that select a register (between 11 and 18).
+
+        Raises:
+            ValueError: If the precision is out of range.
+        """
+        precision = int(precision)
+        if not 11 <= precision <= 18:
+            raise ValueError(f"The HyperLogLog precision must be between 11 and 18, got {precision}.")
+        self.precision = precision
+        self._registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, error=DEFAULT_DISTINCT_ERROR):
+        """
+        Creates a sketch whose estimate has a given relative standard error.
+
+        Args:
+            error (float): The relative error.
+
+        Returns:
+            HyperLogLog: The sketch.
+        """
+        precision = math.ceil(math.log2((1.04 / float(error)) ** 2))
+        return cls(precision=min(18, max(11, precision)))
+
+    def update(self, values):
+        """
+        Adds the values of a Series to the sketch. Missing values are ignored.
+
+        Args:
+            values (pd.Series): The values.
+
+        Returns:
+            HyperLogLog: This sketch.
+        """
+        values = values.dropna()
+        if values.empty:
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        remaining_bits = 64 - self.precision
+        registers = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        # The remaining bits fit in the mantissa of a double, so frexp gives their exact bit length
+        remainder = (hashes & np.uint64((1 << remaining_bits) - 1)).astype(np.float64)
+        _, bit_length = np.frexp(remainder)
+        ranks = (remaining_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self._registers, registers, ranks)
+        return self
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another sketch.
+
+        Args:
+            other (HyperLogLog): The sketch to merge.
+
+        Returns:
+            HyperLogLog: This sketch.
+
+        Raises:
+            ValueError: If the sketches have different precisions.
+        """
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog sketches with different precisions cannot be merged.")
+        np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    def estimate(self):
+        """
+        Returns the estimated number of distinct values.
+
+        Small cardinalities are estimated by linear counting of the empty registers.
+
+        Returns:
+            int: The estimated number of distinct values.
+        """
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / np.sum(np.ldexp(1.0, -self._registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * size and empty:
+            estimate = size * math.log(size / empty)
+        return int(round(estimate))
+
+
+class MisraGries:
+    """
+    Mergeable heavy hitters sketch (Misra and Gries, 1982).
+
+    The sketch keeps at most `capacity` values with a counter. When it is full, the
+    (capacity + 1)-th largest counter is subtracted from every counter and the values whose
+    counter drops to zero are removed. Every value whose frequency is above
+    count / (capacity + 1) is kept, and every counter underestimates the frequency of its
+    value by at most count / (capacity + 1).
+
+    Attributes:
+        capacity (int): The maximum number of values kept.
+        count (int): The number of values summarized.
+
+    Methods:
+        from_error(error): Creates a sketch with a given frequency error.
+        update(values): Adds the values of a Series to the sketch.
+        merge(other): Adds the values summarized by another sketch.
+        top(n): Returns the most frequent values.
+    """
+
+    def __init__(self, capacity=1000):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            capacity (int): The maximum number of values kept.
+        """
+        self.capacity = int(capacity)
+        self.count = 0
+        self._counters = pd.Series(dtype=np.int64)
+
+    @classmethod
+    def from_error(cls, error=DEFAULT_FREQUENCY_ERROR):
+        """
+        Creates a sketch whose frequencies have a given error.
+
+        Args:
+            error (float): The frequency error, as a fraction of the number of values.
+
+        Returns:
+            MisraGries: The sketch.
+        """
+        return cls(capacity=math.ceil(1 / float(error)))
+
+    def _add_counters(self, counters, count):
+        """
+        Adds counters to the sketch and prunes it to its capacity.
+
+        Args:
+            counters (pd.Series): The counters to add, indexed by value.
+            count (int): The number of values the counters stand for.
+        """
+        self.count += count
+        combined = counters if self._counters.empty else self._counters.add(counters, fill_value=0)
+        if len(combined) > self.capacity:
+            threshold = combined.nlargest(self.capacity + 1).iloc[-1]
+            combined = combined[combined > threshold] - threshold
+        self._counters = combined.astype(np.int64)
+
+    def update(self, values):
+        """
+        Adds the values of a Series to the sketch. Missing values are ignored.
+
+        Args:
+            values (pd.Series): The values.
+
+        Returns:
+            MisraGries: This sketch.
+        """
+        counters = values.value_counts(dropna=True)
+        counters.index = counters.index.astype(object)
+        self._add_counters(counters[counters > 0], int(counters.sum()))
+        return self
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another sketch.
+
+        Args:
+            other (MisraGries): The sketch to merge.
+
+        Returns:
+            MisraGries: This sketch.
+        """
+        self.capacity = max(self.capacity, other.capacity)
+        self._add_counters(other._counters, other.count)
+        return self
+
+    def top(self, n=1):
+        """
+        Returns the most frequent values.
+
+        Args:
+            n (int): The number of values.
+
+        Returns:
+            pd.Series: The estimated frequencies of the most frequent values, indexed by value.
+        """
+        return self._counters.nlargest(n)
+
+
+def _widest_dtype(first, second):
+    """
+    Returns the data type that holds the values of two data types, as `pd.concat` would.
+
+    Chunks optimized one by one may get narrower types than the whole column (e.g. int8 in
+    a chunk and int16 in another), so the summary reports the widest type seen.
+
+    Args:
+        first (str): A data type, as a string.
+        second (str): Another data type, as a string.
+
+    Returns:
+        str: The common data type ('object' if the types have no common numeric type).
+    """
+    if first == second:
+        return first
+    try:
+        return str(np.result_type(np.dtype(first), np.dtype(second)))
+    except TypeError:
+        # Extension types (category, nullable integers, strings) or mixed kinds
+        return 'object'
+
+
+class DatasetSketch:
+    """
+    Mergeable summary of every column of a dataset.
+
+    Numeric columns are summarized with moment accumulators and quantile sketches; every
+    column is summarized with a distinct count sketch, and non-numeric columns with a heavy
+    hitters sketch.
+
+    Attributes:
+        rows (int): The number of rows summarized.
+        columns (list): The names of the columns, in order of appearance.
+        dtypes (dict): The data type of every column, as a string (the widest type of the
+            merged summaries).
+
+    Methods:
+        from_frame(frame, ...): Builds the summary of a DataFrame.
+        merge(other): Adds the rows summarized by another summary.
+        describe(quantiles): Returns approximate versions of the `DataFrame.describe` tables.
+        to_frame(quantiles): Returns the summary as a DataFrame with one row per column.
+    """
+
+    def __init__(self, quantile_error=DEFAULT_QUANTILE_ERROR, distinct_error=DEFAULT_DISTINCT_ERROR,
+                 frequency_error=DEFAULT_FREQUENCY_ERROR, seed=DEFAULT_SKETCH_SEED):
+        """
+        Initializes an empty summary.
+
+        Args:
+            quantile_error (float): The rank error of the quantiles.
+            distinct_error (float): The relative error of the distinct counts.
+            frequency_error (float): The error of the frequencies of the top values, as a
+                fraction of the number of values.
+            seed (int): The seed of the random compactions of the quantile sketches.
+        """
+        self.quantile_error = float(quantile_error)
+        self.distinct_error = float(distinct_error)
+        self.frequency_error = float(frequency_error)
+        self.seed = seed
+        self.rows = 0
+        self.columns = []
+        self.dtypes = {}
+        self.moments = MomentAccumulator()
+        self.counts = {}
+        self.quantile_sketches = {}
+        self.distinct_sketches = {}
+        self.frequency_sketches = {}
+
+    @classmethod
+    def from_frame(cls, frame, quantile_error=DEFAULT_QUANTILE_ERROR, distinct_error=DEFAULT_DISTINCT_ERROR,
+                   frequency_error=DEFAULT_FREQUENCY_ERROR, seed=DEFAULT_SKETCH_SEED):
+        """
+        Builds the summary of a DataFrame.
+
+        Args:
+            frame (pd.DataFrame): The DataFrame.
+            quantile_error (float): The rank error of the quantiles.
+            distinct_error (float): The relative error of the distinct counts.
+            frequency_error (float): The error of the frequencies of the top values.
+            seed (int): The seed of the random compactions of the quantile sketches.
+
+        Returns:
+            DatasetSketch: The summary.
+        """
+        sketch = cls(quantile_error, distinct_error, frequency_error, seed)
+        numeric = set(numeric_columns(frame))
+        sketch.rows = len(frame)
+        sketch.moments = MomentAccumulator.from_frame(frame, [column for column in frame.columns if column in numeric])
+        for column in frame.columns:
+            values = frame[column]
+            sketch.columns.append(column)
+            sketch.dtypes[column] = str(values.dtype)
+            sketch.counts[column] = int(values.count())
+            sketch.distinct_sketches[column] = HyperLogLog.from_error(distinct_error).update(values)
+            if column in numeric:
+                sketch.quantile_sketches[column] = KLLSketch.from_error(quantile_error, seed).update(values.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                sketch.frequency_sketches[column] = MisraGries.from_error(frequency_error).update(values)
+        return sketch
+
+    def merge(self, other):
+        """
+        Adds the rows summarized by another summary.
+
+        Args:
+            other (DatasetSketch): The summary to merge.
+
+        Returns:
+            DatasetSketch: This summary.
+        """
+        self.rows += other.rows
+        self.moments.merge(other.moments)
+        for column in other.columns:
+            if column not in self.dtypes:
+                self.columns.append(column)
+                self.dtypes[column] = other.dtypes[column]
+            else:
+                self.dtypes[column] = _widest_dtype(self.dtypes[column], other.dtypes[column])
+            self.counts[column] = self.counts.get(column, 0) + other.counts[column]
+            for own, others in ((self.distinct_sketches, other.distinct_sketches),
+                                (self.quantile_sketches, other.quantile_sketches),
+                                (self.frequency_sketches, other.frequency_sketches)):
+                if column in others:
+                    own[column] = own[column].merge(others[column]) if column in own else others[column]
+        return self
+
+    def describe(self, quantiles=DEFAULT_QUANTILES):
+        """
+        Returns approximate versions of the `DataFrame.describe` tables.
+
+        Args:
+            quantiles (iterable): The probabilities of the reported quantiles.
+
+        Returns:
+            tuple: The statistics of the numeric columns (count, mean, std, min, quantiles,
+            max) and of the other columns (count, unique, top, freq), with one column per
+            dataset column, as returned by `DataFrame.describe`.
+        """
+        quantiles = list(quantiles)
+        labels = [f"{probability * 100:g}%" for probability in quantiles]
+        moments = self.moments.to_frame().set_index('column')
+        numeric = {}
+        for column in self.columns:
+            if column not in self.quantile_sketches:
+                continue
+            estimates = self.quantile_sketches[column].quantiles(quantiles)
+            numeric[column] = [self.counts[column], moments.at[column, 'mean'], moments.at[column, 'std'], moments.at[column, 'min'], *estimates, moments.at[column, 'max']]
+        other = {}
+        for column in self.columns:
+            if column not in self.frequency_sketches:
+                continue
+            top = self.frequency_sketches[column].top(1)
+            other[column] = [self.counts[column], self.distinct_sketches[column].estimate(),
+                             top.index[0] if len(top) else np.nan, int(top.iloc[0]) if len(top) else np.nan]
+        return (pd.DataFrame(numeric, index=['count', 'mean', 'std', 'min', *labels, 'max']),
+                pd.DataFrame(other, index=['count', 'unique', 'top', 'freq'], dtype=object))
+
+    def to_frame(self, quantiles=DEFAULT_QUANTILES):
+        """
+        Returns the summary as a DataFrame with one row per column.
+
+        Args:
+            quantiles (iterable): The probabilities of the reported quantiles.
+
+        Returns:
+            pd.DataFrame: The column name and data type, the number of values, the
+            approximate number of distinct values, the approximate most frequent value and
+            its frequency (non-numeric columns), and the mean, standard deviation, minimum,
+            approximate quantiles and maximum (numeric columns).
+        """
+        numeric, other = self.describe(quantiles)
+        rows = []
+        for column in self.columns:
+            row = {'column': column, 'dtype': self.dtypes[column], 'count': self.counts[column],
+                   'unique': self.distinct_sketches[column].estimate()}
+            if column in other:
+                row.update({'top': other.at['top', column], 'freq': other.at['freq', column]})
+            if column in numeric:
+                row.update(numeric[column].drop('count').to_dict())
+            rows.append(row)
+        order = ['column', 'dtype', 'count', 'unique', 'top', 'freq', *numeric.index.drop('count')]
+        frame = pd.DataFrame(rows)
+        return frame[[column for column in order if column in frame.columns]]
@@ -9,11 +9,47 @@ Email: lbustio@gmail.com
 
 import os
 
+# Extensions of the supported compression formats and the pandas name of each codec
+COMPRESSION_EXTENSIONS = {
+    'gz': 'gzip',
+    'bz2': 'bz2',
+    'xz': 'xz',
+    'zst': 'zstd',
+}
+
+def get_compression(file_path):
+    """
+    Returns the compression codec of a file path, based on its last extension.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The pandas name of the compression codec ('gzip', 'bz2', 'xz' or 'zstd'), or None if the file is not compressed.
+
+    Raises:
+        ValueError: If `file_path` is not a valid string or is empty.
+
+    Example:
+        >>> get_compression('/path/to/file.csv.gz')
+        'gzip'
+
+        >>> get_compression('/path/to/file.csv')
+        None
+    """
+
+    # Validate that file_path is a non-empty string
+    if not isinstance(file_path, str) or not file_path.strip():
+        raise ValueError("The file path must be a non-empty string.")
+
+    _, file_extension = os.path.splitext(file_path)
+    return COMPRESSION_EXTENSIONS.get(file_extension.strip('.').lower())
+
 def get_file_extension(file_path):
     """
     Extracts the file extension from a file path.
 
-    This function splits the given file path into its base name and extension. It then returns the file extension without the leading dot. If the file path does not have an extension, the function returns an empty string. If the input path is invalid, an appropriate error is raised.
+    This function splits the given file path into its base name and extension. It then returns the file extension without the leading dot. Compound extensions of compressed files are resolved to the extension of the data format, so 'file.csv.gz' returns 'csv'. If the file path does not have an extension, the function returns an empty string. If the input path is invalid, an appropriate error is raised.
 
     Args:
         file_path (str): The path to the file. This can be a relative or absolute path, including the filename.
@@ -27,6 +63,9 @@ def get_file_extension(file_path):
     Example:
         >>> get_file_extension('/path/to/file.txt')
         'txt'
+
+        >>> get_file_extension('/path/to/file.arff.bz2')
+        'arff'
         
         >>> get_file_extension('/path/to/file')
         ''
@@ -37,7 +76,11 @@ def get_file_extension(file_path):
         raise ValueError("The file path must be a non-empty string.")
     
     # Split the file path into root and extension
-    _, file_extension = os.path.splitext(file_path)
+    root, file_extension = os.path.splitext(file_path)
+
+    # Skip the compression suffix of compressed files
+    if file_extension.strip('.').lower() in COMPRESSION_EXTENSIONS:
+        _, file_extension = os.path.splitext(root)
     
     # Return the extension without the leading dot
     return file_extension.strip('.')
@@ -0,0 +1,279 @@
+"""
+Module: utils.wsgi_server
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module serves WSGI applications (such as the Flask server of a Dash app) on a local address with a start and stop lifecycle, using the Werkzeug server that Dash already depends on. `ThreadedServer` runs one server, handling every request in its own thread, in a background thread of the current process; it is used for development. `PreforkServer` is the production server: the listening socket is bound once by the parent process and handed to several worker processes, each of which builds its own application with a picklable factory function and accepts connections from the shared socket, so the requests are spread across processes and CPU-bound callbacks run in parallel instead of contending for the GIL of a single process. The workers are started with the 'spawn' method, so they do not inherit the threads and locks of the parent, and report through a queue when they are ready or why they failed. Both servers bind the socket themselves, so a busy port raises an `OSError` instead of exiting, and accept port 0 to use any free port.
+
+"""
+
+import os
+import time
+import queue
+import socket
+import logging
+import threading
+import multiprocessing
+from core.logging_config import logger
+
+# Loggers whose level the worker processes take from the parent process (Werkzeug logs every request)
+WORKER_LOGGERS = (logger.name, 'werkzeug')
+
+# Default address of the servers
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8050
+
+# Seconds a worker process may take to build its application
+DEFAULT_START_TIMEOUT = 120
+
+# Seconds the workers are given to exit before they are killed
+DEFAULT_STOP_TIMEOUT = 10
+
+
+def bind_socket(host, port):
+    """
+    Creates a listening TCP socket.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on (0 for any free port).
+
+    Returns:
+        socket.socket: The listening socket.
+
+    Raises:
+        OSError: If the address cannot be bound (e.g. the port is in use).
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, int(port)))
+        sock.listen(128)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _serve_worker(sock, app_factory, factory_args, ready, log_levels):
+    """
+    Runs a worker process of a PreforkServer: builds the application and serves it on the
+    shared socket until the process is terminated.
+
+    Args:
+        sock (socket.socket): The listening socket shared by the workers.
+        app_factory (callable): A picklable function returning the WSGI application.
+        factory_args (tuple): The arguments of the factory.
+        ready (multiprocessing.Queue): The queue where the worker reports its start.
+        log_levels (dict): The level of every logger of `WORKER_LOGGERS` in the parent process.
+    """
+    from werkzeug.serving import make_server
+
+    for name, level in log_levels.items():
+        logging.getLogger(name).setLevel(level)
+    try:
+        app = app_factory(*factory_args)
+        host, port = sock.getsockname()[:2]
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    except Exception as e:
+        ready.put((os.getpid(), f"{type(e).__name__}: {e}"))
+        return
+    ready.put((os.getpid(), None))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class ThreadedServer:
+    """
+    A Werkzeug server running in a background thread of the current process.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on.
+        url (str): The URL of the server.
+
+    Methods:
+        start(): Starts serving.
+        stop(): Stops serving and closes the socket.
+        join(timeout): Waits until the server stops.
+    """
+
+    def __init__(self, app, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Initializes the server and binds its socket.
+
+        Args:
+            app (callable): The WSGI application.
+            host (str): The address to listen on.
+            port (int): The port to listen on (0 for any free port).
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        from werkzeug.serving import make_server
+
+        self._socket = bind_socket(host, port)
+        self.host, self.port = self._socket.getsockname()[:2]
+        self.url = f"http://{host}:{self.port}/"
+        self._server = make_server(self.host, self.port, app, threaded=True, fd=self._socket.fileno())
+        self._thread = None
+
+    def start(self):
+        """
+        Starts serving in a background thread. The thread is not a daemon, so the process
+        keeps serving until `stop` is called or the process is interrupted.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name='wsgi-server')
+        self._thread.start()
+        logger.info(f"Server listening on {self.url}")
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._socket.close()
+
+    def join(self, timeout=None):
+        """
+        Waits until the server stops.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class PreforkServer:
+    """
+    A pool of worker processes serving a WSGI application on a shared listening socket.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on.
+        url (str): The URL of the server.
+        workers (int): The number of worker processes.
+
+    Methods:
+        start(timeout): Starts the workers and waits until they are ready.
+        stop(timeout): Terminates the workers and closes the socket.
+        join(timeout): Waits until every worker exits.
+
+    Example:
+        >>> server = PreforkServer(build_app, (config,), port=0, workers=4)
+        >>> server.start()
+        >>> server.stop()
+    """
+
+    def __init__(self, app_factory, factory_args=(), host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None):
+        """
+        Initializes the server and binds its socket.
+
+        Args:
+            app_factory (callable): A module-level function returning the WSGI application,
+                called once in every worker process.
+            factory_args (tuple): The picklable arguments of the factory.
+            host (str): The address to listen on.
+            port (int): The port to listen on (0 for any free port).
+            workers (int, optional): The number of worker processes. Defaults to the number of CPU cores.
+
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        self._app_factory = app_factory
+        self._factory_args = tuple(factory_args)
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self._socket = bind_socket(host, port)
+        self.host, self.port = self._socket.getsockname()[:2]
+        self.url = f"http://{host}:{self.port}/"
+        self._processes = []
+
+    def start(self, timeout=DEFAULT_START_TIMEOUT):
+        """
+        Starts the worker processes and waits until all of them are serving.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait for the workers.
+
+        Raises:
+            RuntimeError: If a worker fails to start, exits or does not start in time. The
+                workers already started are stopped.
+        """
+        context = multiprocessing.get_context('spawn')
+        ready = context.Queue()
+        log_levels = {name: logging.getLogger(name).getEffectiveLevel() for name in WORKER_LOGGERS}
+        for _ in range(self.workers):
+            process = context.Process(
+                target=_serve_worker, name='wsgi-worker',
+                args=(self._socket, self._app_factory, self._factory_args, ready, log_levels)
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + timeout
+        started = 0
+        try:
+            while started < self.workers:
+                try:
+                    pid, error = ready.get(timeout=1)
+                except queue.Empty:
+                    # A worker that dies before reporting (e.g. it cannot import the factory) never will
+                    for process in self._processes:
+                        if process.exitcode is not None:
+                            raise RuntimeError(f"Worker process {process.pid} exited with code {process.exitcode} before starting.")
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"The worker processes did not start in {timeout} seconds.")
+                    continue
+                if error is not None:
+                    raise RuntimeError(f"Worker process {pid} failed to start: {error}")
+                started += 1
+        except Exception as e:
+            logger.error(f"Error starting the server: {e}")
+            self.stop()
+            raise
+        finally:
+            ready.close()
+        logger.info(f"Server listening on {self.url} with {self.workers} worker process(es).")
+
+    def stop(self, timeout=DEFAULT_STOP_TIMEOUT):
+        """
+        Terminates the worker processes, killing those that do not exit in time, and closes
+        the socket.
+
+        Args:
+            timeout (float): The number of seconds the workers are given to exit.
+        """
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        self._processes = []
+        self._socket.close()
+
+    def join(self, timeout=None):
+        """
+        Waits until every worker process exits.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait for each worker.
+        """
+        for process in list(self._processes):
+            process.join(timeout)
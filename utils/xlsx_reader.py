@@ -0,0 +1,224 @@
+"""
+Module: utils.xlsx_reader
+
+Author: Lázaro Bustio Martínez
+Date: 2026-10-17
+Version: 1.0
+Email: lbustio@gmail.com
+
+Description:
+This module provides a streaming reader for XLSX workbooks built on the read-only mode of openpyxl. Instead of building the full cell object graph of a worksheet, the rows are iterated as plain values and accumulated column by column, so memory is proportional to the values being kept and a sheet can also be read in chunks of a fixed number of rows. The functions are defined at module level so they can be executed in worker processes to read several sheets of a workbook concurrently.
+
+"""
+
+import io
+import pandas as pd
+from utils.file_utils import open_data_file
+from utils.strings_utils import get_compression
+from utils.filter_utils import ColumnSelector, apply_filters, DEFAULT_FILTER_CHUNKSIZE
+
+
+def open_workbook(path):
+    """
+    Opens an XLSX workbook in read-only mode, decompressing it first if it is compressed.
+
+    XLSX files are ZIP archives that need random access, so a compressed workbook (e.g.
+    '.xlsx.gz') is decompressed into memory instead of being streamed.
+
+    Args:
+        path (str): The path to the XLSX file.
+
+    Returns:
+        openpyxl.Workbook: The read-only workbook.
+    """
+    from openpyxl import load_workbook
+
+    if get_compression(path):
+        with open_data_file(path, 'rb') as stream:
+            return load_workbook(io.BytesIO(stream.read()), read_only=True, data_only=True)
+    return load_workbook(path, read_only=True, data_only=True)
+
+
+def list_sheet_names(path):
+    """
+    Returns the names of the worksheets of an XLSX workbook, in workbook order.
+
+    Args:
+        path (str): The path to the XLSX file.
+
+    Returns:
+        list: The names of the worksheets.
+    """
+    workbook = open_workbook(path)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def resolve_sheet_names(path, sheet_name):
+    """
+    Resolves a sheet selection into the list of worksheet names it refers to.
+
+    Args:
+        path (str): The path to the XLSX file.
+        sheet_name (int or str): A sheet index, a sheet name, '*' for all the sheets or a
+            comma-separated list of sheet names or indexes.
+
+    Returns:
+        list: The names of the selected worksheets.
+
+    Raises:
+        ValueError: If a selected sheet does not exist in the workbook.
+    """
+    available = list_sheet_names(path)
+    if isinstance(sheet_name, str) and sheet_name.strip() == '*':
+        return available
+
+    selection = sheet_name.split(',') if isinstance(sheet_name, str) else [sheet_name]
+    names = []
+    for item in selection:
+        item = item.strip() if isinstance(item, str) else item
+        if item in available:
+            names.append(item)
+        elif str(item).isdigit() and int(item) < len(available):
+            # Numeric selections that are not sheet names are sheet indexes
+            names.append(available[int(item)])
+        else:
+            raise ValueError(f"Worksheet '{item}' not found. Available worksheets: {', '.join(available)}.")
+    return names
+
+
+def _column_names(header_row, num_columns):
+    """
+    Builds unique column names from the header row of a sheet.
+
+    Empty header cells are named 'Unnamed: <index>' and duplicated names get a '.<n>' suffix,
+    as pandas does.
+
+    Args:
+        header_row (tuple): The values of the header row.
+        num_columns (int): The number of columns of the sheet.
+
+    Returns:
+        list: The column names.
+    """
+    names = []
+    seen = {}
+    for index in range(num_columns):
+        value = header_row[index] if index < len(header_row) else None
+        name = f"Unnamed: {index}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _build_frame(columns, names, start):
+    """
+    Builds a DataFrame from column value lists, letting pandas infer each column type.
+
+    Args:
+        columns (list): The values of each column.
+        names (list): The column names.
+        start (int): The row number of the first row.
+
+    Returns:
+        pd.DataFrame: The DataFrame.
+    """
+    num_rows = len(columns[0]) if columns else 0
+    frame = pd.DataFrame({index: pd.Series(values, dtype=None if values else object) for index, values in enumerate(columns)})
+    frame.columns = names
+    frame.index = pd.RangeIndex(start, start + num_rows)
+    return frame
+
+
+def iter_sheet_chunks(path, sheet_name, header=True, chunksize=None, usecols=None):
+    """
+    Streams a worksheet of an XLSX workbook as DataFrames built column by column.
+
+    Rows where every cell is empty are skipped. Rows shorter than the widest row seen so far
+    are padded with missing values.
+
+    Args:
+        path (str): The path to the XLSX file.
+        sheet_name (str): The name of the worksheet.
+        header (bool): Whether the first row contains the column names.
+        chunksize (int, optional): The maximum number of rows per DataFrame. If None, the
+            whole sheet is yielded as a single DataFrame.
+        usecols (callable, optional): A function that receives a column name (or position,
+            without header) and returns whether the column has to be kept. The cells of the
+            other columns are skipped.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the worksheet.
+    """
+    workbook = open_workbook(path)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header_row = next(rows, ()) if header else ()
+        num_columns = len(header_row)
+        names = _column_names(header_row, num_columns) if header else list(range(num_columns))
+        selected = [index for index in range(num_columns) if usecols is None or usecols(names[index])]
+        columns = {index: [] for index in selected}
+        start = 0
+        num_rows = 0
+
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) > num_columns:
+                # A wider row adds columns that were missing in the previous rows
+                names = _column_names(header_row, len(row)) if header else list(range(len(row)))
+                for index in range(num_columns, len(row)):
+                    if usecols is None or usecols(names[index]):
+                        selected.append(index)
+                        columns[index] = [None] * num_rows
+                num_columns = len(row)
+            for index in selected:
+                columns[index].append(row[index] if index < len(row) else None)
+            num_rows += 1
+
+            if chunksize and num_rows == chunksize:
+                yield _build_frame([columns[index] for index in selected], [names[index] for index in selected], start)
+                start += num_rows
+                num_rows = 0
+                columns = {index: [] for index in selected}
+
+        if num_rows or start == 0:
+            yield _build_frame([columns[index] for index in selected], [names[index] for index in selected], start)
+    finally:
+        workbook.close()
+
+
+def read_sheet(path, sheet_name, header=True, columns=None, where=None):
+    """
+    Reads a whole worksheet of an XLSX workbook into a DataFrame using the streaming reader.
+
+    This function is used as the task of the worker processes that load several sheets
+    concurrently, so the projection and the row predicate are given as plain values.
+
+    Args:
+        path (str): The path to the XLSX file.
+        sheet_name (str): The name of the worksheet.
+        header (bool): Whether the first row contains the column names.
+        columns (list, optional): The columns to keep (None keeps every column).
+        where (str, optional): A row predicate, as a pandas query expression.
+
+    Returns:
+        pd.DataFrame: The content of the worksheet.
+    """
+    usecols = ColumnSelector(columns, where) if columns else None
+    if where:
+        # Filter every parsed chunk so only the matching rows are kept in memory
+        frames = [apply_filters(chunk, columns, where) for chunk in iter_sheet_chunks(path, sheet_name, header, DEFAULT_FILTER_CHUNKSIZE, usecols)]
+        return pd.concat(frames, ignore_index=True)
+
+    chunks = iter_sheet_chunks(path, sheet_name, header=header, usecols=usecols)
+    try:
+        return apply_filters(next(chunks), columns)
+    finally:
+        chunks.close()